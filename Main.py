@@ -1,12 +1,21 @@
 import streamlit as st
 import time
-import numpy as np
-import matplotlib.pyplot as plt
 import os 
+
+from compliance import ui
+from compliance.lazy import lazy_import
+
+# numpy y matplotlib solo se usan en la animación: se cargan al dibujarla
+np = lazy_import("numpy")
+plt = lazy_import("matplotlib.pyplot")
+
 # Configuración de la página con tema oscuro
 st.set_page_config(page_title="Arkham Exchange - Compliance", layout="wide")
 os.environ["STREAMLIT_CONFIG"] = "./.streamlit/config.toml"
 
+# Precargar módulos y datos de las páginas mientras corre la animación
+ui.warm_up()
+
 # Estilos personalizados de Streamlit
 st.markdown(
     """
@@ -0,0 +1,115 @@
+"""Cold start de cada página: tiempo hasta el primer elemento (first paint) y perfil de imports.
+
+Cada página corre en un proceso nuevo con `python -X importtime`, con Google Sheets y Nominatim
+reemplazados por datos locales (benchmarks/fixtures.py).
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --pages "Cost Breakdown" --rows 2000 --profile /tmp/profiles
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["Main", "Cost Breakdown", "Compliance Org Structure", "Compliance Team Tracker", "Compliance Hiring Tracker"]
+
+
+def page_path(page):
+    return ROOT / "Main.py" if page == "Main" else ROOT / "pages" / f"{page}.py"
+
+
+# 🧪 Proceso hijo: correr una página con AppTest y medir el primer elemento enviado al navegador
+def run_child(page, rows, profile_dir):
+    sys.path.insert(0, str(ROOT))
+    started = time.perf_counter()
+
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(ROOT / "benchmarks"))
+    import fixtures
+
+    fixtures.install(rows)
+    first_delta = []
+    enqueue = ScriptRunContext.enqueue
+
+    def timed_enqueue(self, msg):
+        if not first_delta and msg.HasField("delta"):
+            first_delta.append(time.perf_counter())
+        return enqueue(self, msg)
+
+    ScriptRunContext.enqueue = timed_enqueue
+
+    at = AppTest.from_file(str(page_path(page)), default_timeout=120)
+    ready = time.perf_counter()
+
+    if profile_dir:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    at.run()
+    finished = time.perf_counter()
+    if profile_dir:
+        profiler.disable()
+        Path(profile_dir).mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(Path(profile_dir) / f"{page}.prof"))
+
+    print(json.dumps({
+        "page": page,
+        "bootstrap_ms": (ready - started) * 1000,
+        "first_paint_ms": (first_delta[0] - ready) * 1000 if first_delta else None,
+        "full_run_ms": (finished - ready) * 1000,
+        "exceptions": [e.value for e in at.exception],
+    }))
+
+
+# 📊 Imports de primer nivel ordenados por tiempo acumulado (salida de -X importtime)
+def top_imports(stderr, limit=5):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  ") or name.strip().startswith("_"):
+            continue
+        imports.append((int(cumulative) / 1000, name.strip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--rows", type=int, default=200, help="filas sintéticas en la hoja de la organización")
+    parser.add_argument("--profile", help="directorio donde guardar un .prof (cProfile) por página")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.rows, args.profile)
+        return
+
+    print(f"{'page':<28} {'bootstrap':>10} {'first paint':>12} {'full run':>10}  top imports (cumulative ms)")
+    for page in args.pages:
+        command = [sys.executable, "-X", "importtime", __file__, "--child", page, "--rows", str(args.rows)]
+        if args.profile:
+            command += ["--profile", args.profile]
+        proc = subprocess.run(command, capture_output=True, text=True, cwd=ROOT, env={**os.environ, "PYTHONPATH": str(ROOT)})
+        result = next((json.loads(line) for line in proc.stdout.splitlines() if line.startswith("{")), None)
+        if result is None:
+            print(f"{page:<28} failed:\n{proc.stderr[-2000:]}")
+            continue
+
+        first_paint = f"{result['first_paint_ms']:.0f} ms" if result["first_paint_ms"] is not None else "-"
+        imports = ", ".join(f"{name} {ms:.0f}" for ms, name in top_imports(proc.stderr))
+        print(f"{page:<28} {result['bootstrap_ms']:>7.0f} ms {first_paint:>12} {result['full_run_ms']:>7.0f} ms  {imports}")
+        for error in result["exceptions"]:
+            print(f"{'':<28} ⚠️ {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Hoja completa vs solo las columnas que declara cada página: bytes transferidos y tiempo de parseo.
+
+    python benchmarks/column_reads.py --rows 5000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import fixtures
+from compliance import data, org
+from compliance.config import ORG_WORKSHEET
+from compliance.sheets import SheetsClient
+from fake_sheets import FakeSheetsServer, values_from_records
+
+CONSUMERS = {
+    "full sheet": None,
+    "org chart": list(org.ORG_COLUMNS),
+    "hiring": ["Compliance Employee", "Title", "Department", "Direct Report", "Company", "Contract", "Status", "Offer Status"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with FakeSheetsServer({ORG_WORKSHEET: values_from_records(fixtures.org_records(args.rows))}) as server:
+        client = SheetsClient(base_url=server.base_url)
+        data.sheet_header(client, ORG_WORKSHEET)
+        print(f"{'consumer':<12}{'columns':>9}{'KB':>10}{'ms':>9}")
+        for name, columns in CONSUMERS.items():
+            server.bytes_sent = 0
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                df = data.fetch_worksheet(client, ORG_WORKSHEET, columns=columns)
+            elapsed = (time.perf_counter() - started) / args.repeat
+            print(f"{name:<12}{df.shape[1]:>9}{server.bytes_sent / args.repeat / 1024:>10.1f}{elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
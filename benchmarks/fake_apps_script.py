@@ -0,0 +1,66 @@
+"""Imita los avisos que mandan Google a COMPLIANCE_NOTIFY_PORT, para probar sin Apps Script ni Drive.
+
+    python benchmarks/fake_apps_script.py http://127.0.0.1:8765/notify --sheet "Compliance Org Structure & Open"
+    python benchmarks/fake_apps_script.py http://127.0.0.1:8765/notify --drive
+
+El Apps Script real (Extensiones > Apps Script, con un activador "Al editar" instalable) hace lo mismo:
+
+    function onEditNotify(e) {
+      UrlFetchApp.fetch(NOTIFY_URL, {
+        method: "post",
+        contentType: "application/json",
+        payload: JSON.stringify({
+          spreadsheetId: e.source.getId(),
+          sheetName: e.range.getSheet().getName(),
+          token: NOTIFY_TOKEN,
+        }),
+      });
+    }
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compliance.config import NOTIFY_TOKEN, SHEET_ID
+
+
+# Activador onEdit de Apps Script: una hoja concreta
+def edit(url, sheet_name, sheet_id=SHEET_ID, token=NOTIFY_TOKEN):
+    body = json.dumps({"spreadsheetId": sheet_id, "sheetName": sheet_name, "token": token}).encode()
+    request = Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    with urlopen(request, timeout=10) as response:
+        return response.status
+
+
+# Canal de files.watch de Drive: sin cuerpo, todo el archivo cambió
+def drive_change(url, sheet_id=SHEET_ID, token=NOTIFY_TOKEN, state="update"):
+    headers = {
+        "X-Goog-Channel-ID": "compliance-dashboard",
+        "X-Goog-Channel-Token": token,
+        "X-Goog-Resource-State": state,
+        "X-Goog-Resource-URI": f"https://www.googleapis.com/drive/v3/files/{sheet_id}?alt=json",
+    }
+    with urlopen(Request(url, data=b"", headers=headers, method="POST"), timeout=10) as response:
+        return response.status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url")
+    parser.add_argument("--sheet", help="worksheet name (Apps Script onEdit)")
+    parser.add_argument("--drive", action="store_true", help="send a Drive files.watch change instead")
+    parser.add_argument("--sheet-id", default=SHEET_ID)
+    parser.add_argument("--token", default=NOTIFY_TOKEN)
+    args = parser.parse_args()
+    if args.drive:
+        print(drive_change(args.url, args.sheet_id, args.token))
+    else:
+        print(edit(args.url, args.sheet, args.sheet_id, args.token))
+
+
+if __name__ == "__main__":
+    main()
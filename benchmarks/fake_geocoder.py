@@ -0,0 +1,68 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# 🧪 Nominatim local: /search devuelve coordenadas deterministas tras `latency` segundos
+class FakeGeocoder:
+    def __init__(self, latency=0.0, port=0):
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    # Instantes de inicio de cada consulta, para comprobar el límite de 1 por segundo
+    def started_at(self):
+        with self._lock:
+            return [started for started, _ in self.requests]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-geocoder", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query).get("q", [""])[0]
+                with server._lock:
+                    server.requests.append((time.monotonic(), query))
+                if server.latency:
+                    time.sleep(server.latency)
+
+                results = []
+                if url.path == "/search" and query:
+                    seed = sum(map(ord, query))
+                    results = [{"lat": str(-60 + seed % 120), "lon": str(-180 + seed * 7 % 360), "display_name": query}]
+                body = json.dumps(results).encode()
+                self.send_response(200 if url.path == "/search" else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,171 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import fixtures
+
+A1_CELL = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def values_from_records(records):
+    if not records:
+        return []
+    header = list(records[0])
+    return [header] + [["" if record[col] is None else str(record[col]) for col in header] for record in records]
+
+
+def column_index(letters):
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index - 1
+
+
+# "'Hoja'!B2:D" -> (hoja, filas, columnas) sobre la grilla completa
+def parse_range(a1_range):
+    if "!" in a1_range:
+        sheet, cells = a1_range.rsplit("!", 1)
+    else:
+        sheet, cells = a1_range, ""
+    sheet = sheet.strip("'").replace("''", "'")
+    if not cells:
+        return sheet, slice(None), slice(None)
+    start, _, end = cells.partition(":")
+    start_col, start_row = A1_CELL.match(start).groups()
+    end_col, end_row = A1_CELL.match(end or start).groups()
+    rows = slice(int(start_row) - 1 if start_row else None, int(end_row) if end_row else None)
+    cols = slice(column_index(start_col) if start_col else None, column_index(end_col) + 1 if end_col else None)
+    return sheet, rows, cols
+
+
+# 🧪 Servidor local que imita los endpoints de lectura de Sheets v4, con fallas inyectables
+class FakeSheetsServer:
+    def __init__(self, worksheets=None, latency=0.0, port=0):
+        if worksheets is None:
+            worksheets = {name: values_from_records(build()) for name, build in fixtures.WORKSHEETS.items()}
+        self.worksheets = worksheets
+        self.latency = latency
+        self.requests = []
+        self.bytes_sent = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    # Las próximas `count` peticiones responden con `status` (429 = cuota agotada); con `body` se
+    # envía ese cuerpo tal cual (p. ej. un 200 con JSON cortado)
+    def fail(self, count, status=429, retry_after=None, body=None):
+        with self._lock:
+            self._failures.extend([(status, retry_after, body)] * count)
+
+    # Olvidar peticiones registradas y fallas pendientes (un servidor para varias pruebas)
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self._failures.clear()
+            self.bytes_sent = 0
+
+    def set_records(self, sheet_name, records):
+        self.worksheets[sheet_name] = values_from_records(records)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-sheets", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # Como la API: con majorDimension=COLUMNS cada lista es una columna, sin celdas vacías al final
+    def values(self, a1_range, major_dimension="ROWS"):
+        sheet, rows, cols = parse_range(a1_range)
+        grid = self.worksheets.get(sheet)
+        if grid is None:
+            return None
+        values = [row[cols] for row in grid[rows]]
+        if major_dimension == "COLUMNS":
+            values = [list(column) for column in zip(*values)]
+            while values and not values[-1]:
+                values.pop()
+            for column in values:
+                while column and column[-1] == "":
+                    column.pop()
+        return values
+
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, status, payload, headers=None):
+                self.send_body(status, json.dumps(payload).encode(), headers)
+
+            def send_body(self, status, body, headers=None):
+                with server._lock:
+                    server.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with server._lock:
+                    server.requests.append(unquote(url.path))
+                if server.latency:
+                    time.sleep(server.latency)
+
+                failure = server._next_failure()
+                if failure:
+                    status, retry_after, body = failure
+                    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+                    if body is not None:
+                        return self.send_body(status, body)
+                    return self.send_json(status, {"error": {"code": status, "message": "Injected failure"}}, headers)
+
+                match = re.match(r"^/v4/spreadsheets/([^/]+)/values(?::batchGet|/(.+))$", url.path)
+                if not match:
+                    return self.send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+                if match.group(2) is None:
+                    query = parse_qs(url.query)
+                    major_dimension = query.get("majorDimension", ["ROWS"])[0]
+                    value_ranges = []
+                    for a1_range in query.get("ranges", []):
+                        values = server.values(a1_range, major_dimension)
+                        if values is None:
+                            return self.send_json(400, {"error": {"code": 400, "message": f"Unable to parse range: {a1_range}"}})
+                        value_ranges.append({"range": a1_range, "values": values})
+                    return self.send_json(200, {"spreadsheetId": match.group(1), "valueRanges": value_ranges})
+
+                a1_range = unquote(match.group(2))
+                values = server.values(a1_range)
+                if values is None:
+                    return self.send_json(400, {"error": {"code": 400, "message": f"Unable to parse range: {a1_range}"}})
+                return self.send_json(200, {"range": a1_range, "values": values})
+
+        return Handler
@@ -0,0 +1,78 @@
+import random
+
+import pandas as pd
+
+from compliance.config import ORG_WORKSHEET, VENDOR_WORKSHEET
+
+DEPARTMENTS = ["AML", "KYC", "Sanctions", "Risk", "Regulatory"]
+POSITIONS = ["Analyst", "Senior Analyst", "Manager", "Director"]
+STATUSES = ["Active"] * 6 + ["Inactive", "Open Position", "Offer Stage"]
+CONTRACTS = ["Arkham Employee", "Arkham Employee", "Consultants"]
+LOCATIONS = [("USA", "California"), ("USA", "New York"), ("United Kingdom", "London"), ("Spain", "Madrid"), ("Singapore", "Singapore")]
+
+
+# 🧪 Hoja "Compliance Org Structure & Open" sintética, con el mismo formato que devuelve gspread
+def org_records(n=200, seed=7):
+    rnd = random.Random(seed)
+    records = []
+    for i in range(n):
+        country, state = rnd.choice(LOCATIONS)
+        status = rnd.choice(STATUSES)
+        records.append({
+            "Compliance Employee": "" if status == "Open Position" else f"Employee {i}",
+            "Title": f"{rnd.choice(POSITIONS)} {rnd.choice(DEPARTMENTS)}",
+            "Direct Report": f"Employee {(i - 1) // 4}" if i else "",
+            "Department": rnd.choice(DEPARTMENTS),
+            "Status": status,
+            "Offer Status": rnd.choice(["Pending", "Accepted", "Declined"]),
+            "Contract": rnd.choice(CONTRACTS),
+            "Position": rnd.choice(POSITIONS),
+            "Company": rnd.choice(["Arkham", "Arkham EU"]),
+            "Salary": f"${rnd.randint(40, 250) * 1000:,}",
+            "Equity": rnd.choice(["", 0, f"{rnd.randint(0, 60) * 1000:,}"]),
+            "Token": rnd.randint(0, 60) * 1000,
+            "Country": country,
+            "State": state,
+        })
+    return records
+
+
+def vendor_records(n=20, seed=7):
+    rnd = random.Random(seed)
+    records = []
+    for i in range(n):
+        monthly = rnd.randint(1, 50) * 500
+        records.append({
+            "Status": rnd.choice(["Active", "Active", "Inactive"]),
+            "Vendor Name": f"Vendor {i}",
+            "Vendor Contact Name": f"Contact {i}",
+            "Vendor Email": f"vendor{i}@example.com",
+            "Contract Duration": "12 months",
+            "Contract Monthly Price": f"${monthly:,}",
+            "Contract Yearly Price": f"${monthly * 12:,}",
+        })
+    return records
+
+
+WORKSHEETS = {ORG_WORKSHEET: org_records, VENDOR_WORKSHEET: vendor_records}
+
+
+def worksheet_frame(sheet_name, n=None, columns=None):
+    records = WORKSHEETS[sheet_name]() if n is None else WORKSHEETS[sheet_name](n)
+    df = pd.DataFrame(records)
+    if columns is not None:
+        wanted = {col.lower() for col in columns}
+        df = df[[col for col in df.columns if col.lower() in wanted]]
+    return df
+
+
+# 📌 Reemplazar Google Sheets y Nominatim por datos locales (solo para benchmarks)
+def install(n=200):
+    from compliance import data, geo
+
+    data.get_client = lambda info=None: None
+    data.fetch_worksheet = lambda client, sheet_name, sheet_id=None, columns=None: worksheet_frame(sheet_name, n if sheet_name == ORG_WORKSHEET else None, columns)
+    geo.lookup = lambda country, state, geolocator=None: (40.0 + len(state) % 10, -3.0 - len(country) % 10)
+    # Ubicaciones ya cacheadas: el benchmark no espera el límite de 1 consulta por segundo
+    for country, state in LOCATIONS:
+        geo.remember(country, state, geo.lookup(country, state))
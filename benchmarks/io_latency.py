@@ -0,0 +1,76 @@
+"""Latencia de E/S de una carga de página: hojas y geocodificación en serie vs en paralelo.
+
+Usa el Sheets falso (benchmarks/fake_sheets.py) y un Nominatim falso (benchmarks/fake_geocoder.py)
+con latencia simulada, así que no toca la red.
+
+    python benchmarks/io_latency.py
+    python benchmarks/io_latency.py --sheet-latency 0.8 --geocode-latency 1.5 --locations 6
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from compliance import aio, data, geo
+from compliance.config import NOMINATIM_MIN_INTERVAL, ORG_WORKSHEET, VENDOR_WORKSHEET
+from compliance.sheets import SheetsClient
+from fake_geocoder import FakeGeocoder
+from fake_sheets import FakeSheetsServer
+
+SHEETS = [ORG_WORKSHEET, VENDOR_WORKSHEET]
+
+
+def locations(n):
+    return [("Country %d" % i, "State %d" % i) for i in range(n)]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def sequential(client, geolocator, places):
+    for sheet_name in SHEETS:
+        data.fetch_worksheet(client, sheet_name)
+    for i, (country, state) in enumerate(places):
+        if i:
+            # Igual que geopy RateLimiter: esperar entre el fin de una consulta y el inicio de la siguiente
+            time.sleep(NOMINATIM_MIN_INTERVAL)
+        geo.lookup(country, state, geolocator)
+
+
+def concurrent(client, geolocator, places):
+    aio.run(aio.fetch_worksheets(client, SHEETS))
+    aio.run(aio.geocode_many(places, lookup=lambda country, state: geo.lookup(country, state, geolocator)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheet-latency", type=float, default=0.5)
+    parser.add_argument("--geocode-latency", type=float, default=1.0)
+    parser.add_argument("--locations", type=int, default=5)
+    args = parser.parse_args()
+
+    places = locations(args.locations)
+    with FakeSheetsServer(latency=args.sheet_latency) as sheets, FakeGeocoder(latency=args.geocode_latency) as nominatim:
+        client = SheetsClient(base_url=sheets.base_url)
+        geolocator = geo.geocoders.Nominatim(user_agent=geo.USER_AGENT, domain=nominatim.base_url.split("://")[1], scheme="http", timeout=30)
+
+        serial = timed(lambda: sequential(client, geolocator, places))
+        nominatim.requests.clear()
+        overlapped = timed(lambda: concurrent(client, geolocator, places))
+        starts = nominatim.started_at()
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+
+    print(f"{'mode':<12}{'seconds':>10}")
+    print(f"{'sequential':<12}{serial:>10.2f}")
+    print(f"{'concurrent':<12}{overlapped:>10.2f}")
+    print(f"speed-up {serial / overlapped:.1f}x · min gap between Nominatim requests {min(gaps, default=0):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Carga con sesiones simultáneas: latencia de rerun (p50/p95/p99), throughput, CPU y RSS pico.
+
+Cada sesión simulada recorre las páginas con AppTest y, en cada una, repite interacciones típicas
+(multiselects de departamento, selectbox de país, presupuesto, orden y página de tablas, búsqueda).
+Cada sesión corre en su propio proceso: AppTest usa singletons del runtime de Streamlit y varias
+instancias en hilos de un mismo proceso se pisan entre sí (errores falsos). Los procesos comparten
+snapshots y derivados con un cache file:// temporal, como réplicas con un volumen compartido
+(--cache-url para usar otro, p. ej. redis://). Google Sheets y Nominatim se reemplazan por datos
+locales (benchmarks/fixtures.py).
+
+    python benchmarks/load_test.py --sessions 20 --duration 60
+    python benchmarks/load_test.py --sessions 40 --rows 5000 --think 1 --max-p95 500
+    python benchmarks/load_test.py --pages Main --sessions 2 --visits 1
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["Main", "Cost Breakdown", "Compliance Org Structure", "Compliance Team Tracker", "Compliance Hiring Tracker", "Data Health"]
+# La animación de Main.py duerme más de 15 s por visita: se mide aparte con --pages Main
+DEFAULT_PAGES = PAGES[1:]
+PERCENTILES = [50, 95, 99]
+
+
+def page_path(page):
+    return ROOT / "Main.py" if page == "Main" else ROOT / "pages" / f"{page}.py"
+
+
+def widget(at, kind, label=None, key=None):
+    for element in at.get(kind):
+        if (label is None or element.label == label) and (key is None or element.key == key):
+            return element
+    return None
+
+
+def some(rnd, options):
+    options = list(options)
+    return rnd.sample(options, rnd.randint(1, len(options)))
+
+
+# Cambiar el valor de un widget; False si no está en la página o está deshabilitado
+def pick(at, kind, label=None, key=None, value=None):
+    element = widget(at, kind, label, key)
+    if element is None or element.proto.disabled:
+        return False
+    element.set_value(value(element))
+    return True
+
+
+# 🖱️ Interacciones por página: (nombre, función(at, rnd) -> False si el widget no está en la página)
+INTERACTIONS = {
+    "Main": [],
+    "Cost Breakdown": [
+        ("departments", lambda at, rnd: pick(at, "multiselect", "Select Department(s)", value=lambda w: some(rnd, w.options))),
+        ("states", lambda at, rnd: pick(at, "multiselect", "Select State(s)", value=lambda w: some(rnd, w.options))),
+        ("positions", lambda at, rnd: pick(at, "multiselect", "Select Position", value=lambda w: some(rnd, w.options))),
+        ("budget", lambda at, rnd: pick(at, "number_input", "Enter the Estimated Annual Budget ($)", value=lambda w: rnd.randint(1, 20) * 500000)),
+        ("sort", lambda at, rnd: pick(at, "selectbox", key="employee_details_sort", value=lambda w: rnd.choice(w.options))),
+        ("search", lambda at, rnd: pick(at, "text_input", key="cost_search_query", value=lambda w: f"employe {rnd.randint(0, 99)}")),
+    ],
+    "Compliance Org Structure": [
+        ("department", lambda at, rnd: pick(at, "selectbox", "Select Department:", value=lambda w: rnd.choice(w.options))),
+        ("search", lambda at, rnd: pick(at, "text_input", key="org_search_query", value=lambda w: f"employe {rnd.randint(0, 99)}")),
+    ],
+    "Compliance Team Tracker": [
+        ("country", lambda at, rnd: pick(at, "selectbox", "Select a Country", value=lambda w: rnd.choice(w.options))),
+        ("departments", lambda at, rnd: pick(at, "multiselect", "Select Department(s)", value=lambda w: some(rnd, w.options))),
+        ("budget", lambda at, rnd: pick(at, "number_input", "Total Budget", value=lambda w: rnd.randint(1, 20) * 500000)),
+        ("sort", lambda at, rnd: pick(at, "selectbox", key="team_details_sort", value=lambda w: rnd.choice(w.options))),
+    ],
+    "Compliance Hiring Tracker": [
+        ("sort", lambda at, rnd: pick(at, "selectbox", key="offer_stage_sort", value=lambda w: rnd.choice(w.options))),
+        ("page", lambda at, rnd: pick(at, "number_input", key="active_employees_page", value=lambda w: rnd.randint(1, int(w.proto.max) if w.proto.has_max else 1))),
+    ],
+    "Data Health": [
+        ("severity", lambda at, rnd: pick(at, "multiselect", "Severity", value=lambda w: some(rnd, w.options))),
+    ],
+}
+
+
+# 👥 Una sesión: visita páginas en orden rotado y en cada una hace `actions` interacciones al azar
+class Session:
+    def __init__(self, number, pages, actions, think, timeout, stop_at, visits, results):
+        self.rnd = random.Random(number)
+        self.pages = pages[number % len(pages):] + pages[:number % len(pages)]
+        self.actions = actions
+        self.think = think
+        self.timeout = timeout
+        self.stop_at = stop_at
+        self.visits = visits
+        self.results = results
+
+    def done(self, visit):
+        return time.perf_counter() >= self.stop_at or (self.visits and visit >= self.visits)
+
+    def rerun(self, page, action, at):
+        started = time.perf_counter()
+        try:
+            at.run(timeout=self.timeout)
+            ok = not at.exception
+        except Exception:
+            ok = False
+        self.results.append((page, action, time.perf_counter() - started, ok))
+        if self.think:
+            time.sleep(self.rnd.uniform(0.5, 1.5) * self.think)
+
+    def run(self):
+        from streamlit.testing.v1 import AppTest
+
+        visit = 0
+        while not self.done(visit):
+            page = self.pages[visit % len(self.pages)]
+            at = AppTest.from_file(str(page_path(page)), default_timeout=self.timeout)
+            self.rerun(page, "load", at)
+            interactions = INTERACTIONS[page]
+            for _ in range(self.actions if interactions else 0):
+                if time.perf_counter() >= self.stop_at:
+                    break
+                name, interact = self.rnd.choice(interactions)
+                try:
+                    changed = interact(at, self.rnd)
+                except Exception as e:
+                    # Un widget que no acepta el valor: cuenta como error y la sesión sigue
+                    print(f"{page} · {name}: {type(e).__name__}: {e}", file=sys.stderr)
+                    self.results.append((page, name, 0.0, False))
+                    continue
+                if changed:
+                    self.rerun(page, name, at)
+            visit += 1
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+# 🧪 Proceso hijo: una sesión
+def run_child(args):
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "benchmarks"))
+    import fixtures
+    from compliance import jobs
+
+    fixtures.install(args.rows)
+    results = []
+    cpu_started, started = time.process_time(), time.perf_counter()
+    stop_at = started + args.duration if args.duration else float("inf")
+    Session(args.session, args.pages, args.actions, args.think, args.timeout, stop_at, args.visits, results).run()
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    # Al cerrar los pools, RUSAGE_CHILDREN incluye el pico de los procesos de trabajo
+    jobs.shutdown()
+    print(json.dumps({
+        "session": args.session,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "peak_rss_mb": peak_rss_mb(),
+        "workers_peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "results": results,
+    }))
+
+
+def percentiles(latencies):
+    values = np.percentile(np.asarray(latencies) * 1000, PERCENTILES) if latencies else [float("nan")] * len(PERCENTILES)
+    return dict(zip(PERCENTILES, values))
+
+
+def report(sessions, max_p95=None):
+    results = [row for session in sessions for row in session["results"]]
+    wall = max(session["wall_s"] for session in sessions)
+
+    print(f"\n{'session':<9}{'reruns':>8}{'wall s':>9}{'reruns/s':>10}{'CPU s':>8}{'CPU %':>7}{'RSS MB':>9}{'workers MB':>12}")
+    for session in sessions:
+        count = len(session["results"])
+        print(f"{session['session']:<9}{count:>8}{session['wall_s']:>9.1f}{count / session['wall_s']:>10.1f}{session['cpu_s']:>8.1f}"
+              f"{session['cpu_s'] / session['wall_s'] * 100:>7.0f}{session['peak_rss_mb']:>9.0f}{session['workers_peak_rss_mb']:>12.0f}")
+
+    groups = {}
+    for page, action, latency, ok in results:
+        groups.setdefault((page, action), []).append((latency, ok))
+    print(f"\n{'page':<28}{'action':<13}{'n':>6}{'errors':>8}" + "".join(f"{'p%d ms' % p:>10}" for p in PERCENTILES) + f"{'max ms':>10}")
+    for (page, action), rows in sorted(groups.items()):
+        latencies = [latency for latency, _ in rows]
+        stats = percentiles(latencies)
+        errors = sum(not ok for _, ok in rows)
+        print(f"{page:<28}{action:<13}{len(rows):>6}{errors:>8}" + "".join(f"{stats[p]:>10.0f}" for p in PERCENTILES) + f"{max(latencies) * 1000:>10.0f}")
+
+    reruns = [latency for page, action, latency, ok in results if action != "load"]
+    overall = percentiles(reruns)
+    errors = sum(not ok for *_, ok in results)
+    print(f"\nwidget reruns: {len(reruns)} · " + " · ".join(f"p{p} {overall[p]:.0f} ms" for p in PERCENTILES)
+          + f" · throughput {len(results) / wall:.1f} reruns/s · errors {errors}")
+    if max_p95 is not None and not overall[95] <= max_p95:
+        print(f"❌ p95 {overall[95]:.0f} ms is above --max-p95 {max_p95:.0f} ms")
+        return 1
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="sesiones simultáneas (un proceso cada una)")
+    parser.add_argument("--pages", nargs="+", default=DEFAULT_PAGES, choices=PAGES)
+    parser.add_argument("--duration", type=float, default=30, help="segundos de carga (0 = usar --visits)")
+    parser.add_argument("--visits", type=int, default=0, help="páginas que visita cada sesión (0 = sin límite)")
+    parser.add_argument("--actions", type=int, default=5, help="interacciones por visita")
+    parser.add_argument("--think", type=float, default=0.0, help="pausa media entre interacciones (s)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="segundos para arrancar todas las sesiones")
+    parser.add_argument("--cache-url", help="cache compartido entre sesiones (por defecto file:// en un directorio temporal)")
+    parser.add_argument("--rows", type=int, default=500, help="filas sintéticas en la hoja de la organización")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--max-p95", type=float, help="falla (exit 1) si el p95 de los reruns supera estos ms")
+    parser.add_argument("--json", help="guardar los resultados crudos en este archivo")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--session", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if not args.duration and not args.visits:
+        parser.error("--duration 0 needs --visits")
+
+    if args.child:
+        run_child(args)
+        return
+
+    print(f"{args.sessions} sessions (one process each) · pages: {', '.join(args.pages)}")
+    with tempfile.TemporaryDirectory(prefix="compliance-load-") as cache_dir:
+        env = {**os.environ, "PYTHONPATH": str(ROOT), "COMPLIANCE_CACHE_URL": args.cache_url or f"file://{cache_dir}"}
+        command = [sys.executable, __file__, "--child", *sys.argv[1:]]
+        procs = []
+        for i in range(args.sessions):
+            # stderr a un archivo: con una tubería, un hijo que escribe mucho se bloquearía hasta que lo leamos
+            log = tempfile.TemporaryFile("w+")
+            procs.append((subprocess.Popen(command + ["--session", str(i)], stdout=subprocess.PIPE, stderr=log, text=True, cwd=ROOT, env=env), log))
+            # Las sesiones no llegan todas en el mismo milisegundo
+            time.sleep(args.ramp / max(1, args.sessions))
+        sessions = []
+        for proc, log in procs:
+            stdout, _ = proc.communicate()
+            result = next((json.loads(line) for line in stdout.splitlines() if line.startswith("{")), None)
+            log.seek(0)
+            stderr = log.read()
+            log.close()
+            if result is None:
+                print(f"session failed:\n{stderr[-2000:]}")
+                sys.exit(1)
+            sessions.append(result)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(sessions))
+    sys.exit(report(sessions, args.max_p95))
+
+
+if __name__ == "__main__":
+    main()
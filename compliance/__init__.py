@@ -0,0 +1,17 @@
+# 📦 Lógica del dashboard de Compliance, sin dependencias de Streamlit.
+# Las páginas en pages/ solo dibujan; aquí viven la carga, limpieza, agregados,
+# el organigrama y los escenarios, para poder reutilizarlos o correrlos en un pool de procesos.
+from compliance import cleaning, data, jobs, metrics, org
+from compliance.config import ORG_WORKSHEET, SCOPES, SHEET_ID, VENDOR_WORKSHEET
+
+__all__ = [
+    "cleaning",
+    "data",
+    "jobs",
+    "metrics",
+    "org",
+    "ORG_WORKSHEET",
+    "SCOPES",
+    "SHEET_ID",
+    "VENDOR_WORKSHEET",
+]
@@ -0,0 +1,135 @@
+import asyncio
+import math
+import threading
+import time
+
+from compliance import data, geo, shared
+from compliance.config import NOMINATIM_MIN_INTERVAL, SHEET_ID
+from compliance.singleflight import SingleFlight
+
+
+# ▶️ Ejecutar una corrutina desde código síncrono (el hilo del script de Streamlit).
+# Si el hilo ya tiene un loop corriendo, se usa un hilo aparte para no bloquearlo.
+def run(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, name="compliance-aio")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+# Llamar a una función bloqueante con varios argumentos a la vez (un hilo por llamada). Con
+# return_exceptions las llamadas que fallan devuelven su excepción en vez de cortar las demás
+async def gather_calls(fn, args_list, return_exceptions=False):
+    return await asyncio.gather(*(asyncio.to_thread(fn, *args) for args in args_list), return_exceptions=return_exceptions)
+
+
+# 📂 Todas las hojas de una página en paralelo: la latencia es la de la hoja más lenta.
+# `sheet_names` puede ser una lista o un dict {nombre: columnas}
+async def fetch_worksheets(client, sheet_names, sheet_id=SHEET_ID):
+    sheets = sheet_names if isinstance(sheet_names, dict) else dict.fromkeys(sheet_names)
+    frames = await asyncio.gather(*(data.load_worksheet_async(client, name, sheet_id, columns) for name, columns in sheets.items()))
+    return dict(zip(sheets, frames))
+
+
+# ⏱️ Turnos para una API externa (Nominatim: 1 consulta por segundo). Cada consulta reserva un turno en
+# el store con `add` (solo si nadie lo tomó): el límite vale para todas las sesiones del proceso y, con un
+# cache compartido (file:// o redis://), para todas las réplicas. Los turnos duran min_interval / slots
+# y una reserva solo vale si no hay otra a menos de min_interval: la primera consulta casi no espera.
+class SharedRateLimiter:
+    def __init__(self, name, min_interval, backend=None, clock=time.time, slots=10):
+        self.name = name
+        self.min_interval = min_interval
+        self.slots = slots
+        self._backend = backend
+        self._clock = clock
+
+    def _key(self, slot):
+        return f"ratelimit:{self.name}:{slot}"
+
+    def _taken(self, backend, slot):
+        return [other for other in range(slot - self.slots + 1, slot + self.slots) if other != slot and backend.get(self._key(other))]
+
+    # Segundos a esperar hasta el turno reservado
+    def reserve(self):
+        backend = self._backend or shared.store().backend
+        now = self._clock()
+        width = self.min_interval / self.slots
+        slot = math.ceil(now / width)
+        while True:
+            taken = self._taken(backend, slot)
+            if taken:
+                slot = max(taken) + self.slots
+                continue
+            delay = slot * width - now
+            if backend.add(self._key(slot), b"1", ttl=delay + self.min_interval):
+                # Otra réplica pudo reservar un turno vecino al mismo tiempo: el que lo ve, cede
+                if not self._taken(backend, slot):
+                    return delay
+                backend.delete(self._key(slot))
+            slot += 1
+
+    async def wait(self):
+        delay = await asyncio.to_thread(self.reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+nominatim_limiter = SharedRateLimiter("nominatim", NOMINATIM_MIN_INTERVAL)
+# Una sola consulta en curso por ubicación en el proceso, aunque la pidan varias sesiones a la vez
+geocode_flights = SingleFlight()
+
+
+def _default_lookup():
+    geolocator = geo.geocoder()
+
+    def lookup(country, state):
+        return geo.lookup(country, state, geolocator)
+
+    return lookup
+
+
+async def _geocode(country, state, lookup, limiter):
+    # Otra sesión pudo resolverla mientras esperábamos el turno de la anterior
+    coords = geo.cached(country, state)
+    if coords is not None:
+        return coords
+    await limiter.wait()
+    try:
+        coords = await asyncio.to_thread(lookup, country, state)
+    except Exception:
+        # Sin conexión o error del servicio: se reintenta en la próxima ejecución
+        return None, None
+    geo.remember(country, state, coords)
+    return coords
+
+
+# 🌍 Geocodificar varias ubicaciones: las cacheadas salen al instante y las demás se solapan,
+# arrancando como máximo una consulta por turno del limitador compartido
+async def geocode_many(locations, lookup=None, limiter=None):
+    lookup = lookup or _default_lookup()
+    limiter = limiter or nominatim_limiter
+
+    async def resolve(country, state):
+        coords = geo.cached(country, state)
+        if coords is not None:
+            return coords
+        return await geocode_flights.do_async((country, state), _geocode, country, state, lookup, limiter)
+
+    locations = list(dict.fromkeys(tuple(location) for location in locations))
+    results = await asyncio.gather(*(resolve(country, state) for country, state in locations))
+    return dict(zip(locations, results))
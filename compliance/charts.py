@@ -0,0 +1,26 @@
+from compliance.lazy import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+colors = lazy_import("plotly.colors")
+
+
+# 📦 Box plot dibujado desde estadísticas ya calculadas: una caja por grupo, sin enviar filas
+def box_figure(stats, outliers, by, value, title):
+    palette = colors.qualitative.Plotly
+    outliers_by_group = dict(tuple(outliers.groupby(by)[value]))
+    fig = go.Figure()
+    for i, row in enumerate(stats.to_dict("records")):
+        group = row[by]
+        color = palette[i % len(palette)]
+        fig.add_trace(go.Box(
+            name=str(group), x=[group], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]], mean=[row["mean"]],
+            lowerfence=[row["lowerfence"]], upperfence=[row["upperfence"]], marker_color=color, legendgroup=str(group),
+        ))
+        points = outliers_by_group.get(group)
+        if points is not None:
+            fig.add_trace(go.Scatter(
+                x=[group] * len(points), y=points, mode="markers", marker_color=color,
+                legendgroup=str(group), showlegend=False, name=str(group),
+            ))
+    fig.update_layout(title=title, template="plotly_white", xaxis_title=by, yaxis_title=value, legend_title_text=by)
+    return fig
@@ -0,0 +1,67 @@
+import pandas as pd
+
+MONEY_COLUMNS = ["Salary", "Equity", "Token"]
+VENDOR_PRICE_COLUMNS = ["Contract Monthly Price", "Contract Yearly Price"]
+NULL_VALUES = ["", " ", "N/A", "NULL", "None", "-", "--"]
+
+
+# 📊 Convertir una columna de texto monetario ("$1,000") a número
+def to_numeric(series, fill=0):
+    values = series.astype(str).str.strip().str.replace(r"[$,]", "", regex=True)
+    values = pd.to_numeric(values.where(~values.isin(NULL_VALUES)), errors="coerce")
+    return values.fillna(fill) if fill is not None else values
+
+
+def clean_numeric_columns(df, columns, fill=0):
+    df = df.copy()
+    for col in columns:
+        if col in df.columns:
+            df[col] = to_numeric(df[col], fill=fill)
+    return df
+
+
+def status_is(df, *statuses, column="Status"):
+    return df[column].astype(str).str.strip().str.lower().isin(statuses)
+
+
+# 👥 Hoja de empleados lista para los cálculos de costos
+def prepare_org(df):
+    df = clean_numeric_columns(df, MONEY_COLUMNS)
+    for col in MONEY_COLUMNS:
+        if col not in df.columns:
+            df[col] = 0.0
+    df["Total Cost"] = (df["Salary"] + df["Equity"] + df["Token"]).astype(float)
+    return df.fillna(0)
+
+
+def active_employees(df_org):
+    df_active = df_org[status_is(df_org, "active")].copy()
+    df_active["Total Salary per Month"] = df_active["Salary"] / 12
+    if "Position" in df_active.columns:
+        df_active["Position"] = df_active["Position"].astype(str).str.strip()
+    return df_active
+
+
+def prepare_vendors(df):
+    df = clean_numeric_columns(df, VENDOR_PRICE_COLUMNS)
+    for col in VENDOR_PRICE_COLUMNS + ["Status"]:
+        if col not in df.columns:
+            df[col] = 0.0 if col != "Status" else ""
+    return df
+
+
+# 🌍 Empleados activos para el Team Tracker (los montos inválidos quedan como NaN)
+def prepare_team(df_org):
+    df_active = df_org[status_is(df_org, "active")].copy()
+    return clean_numeric_columns(df_active, MONEY_COLUMNS, fill=None)
+
+
+# 📋 Hoja para el Hiring Tracker: columnas en minúscula y estados normalizados
+def prepare_hiring(df):
+    df = df.copy()
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    if "status" not in df.columns:
+        df["status"] = "offer stage"
+    if "offer status" not in df.columns:
+        df["offer status"] = "Pending"
+    return df
@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+# 📌 Configuración compartida de Google Sheets
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.readonly",
+]
+SHEET_ID = "1R3EMYJt7he4CklRTRWtC6iqPzACg_eWyHdV6BaTzTms"
+
+ORG_WORKSHEET = "Compliance Org Structure & Open"
+VENDOR_WORKSHEET = "Vendor Management"
+
+# 🏢 Registro de entidades/regiones (JSON); si no existe se usa solo SHEET_ID
+SOURCES_FILE = os.environ.get("COMPLIANCE_SOURCES", "sources.json")
+
+# 📌 Tiempo de vida de los datos cacheados (segundos)
+DATA_TTL = 600
+GEOCODE_TTL = 86400
+
+# 🗄️ Cache compartido entre réplicas: memory:// (por proceso), file:///volumen/compartido o redis://host:6379/0
+CACHE_URL = os.environ.get("COMPLIANCE_CACHE_URL", "memory://")
+SNAPSHOT_RETENTION = int(os.environ.get("COMPLIANCE_SNAPSHOT_RETENTION", 7 * 86400))
+# Agregados derivados (se recalculan si faltan) y tope de claves del backend memory://
+DERIVED_TTL = int(os.environ.get("COMPLIANCE_DERIVED_TTL", 3600))
+MEMORY_CACHE_ENTRIES = int(os.environ.get("COMPLIANCE_MEMORY_CACHE_ENTRIES", 1024))
+
+# 📤 Reportes exportados en segundo plano: carpeta y cuánto tiempo se guardan (segundos)
+EXPORT_DIR = os.environ.get("COMPLIANCE_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "compliance-exports"))
+EXPORT_RETENTION = int(os.environ.get("COMPLIANCE_EXPORT_RETENTION", 86400))
+
+# 📬 Avisos de cambio (Apps Script / watch de Drive): COMPLIANCE_NOTIFY_PORT=0 los desactiva
+NOTIFY_HOST = os.environ.get("COMPLIANCE_NOTIFY_HOST", "127.0.0.1")
+NOTIFY_PORT = int(os.environ.get("COMPLIANCE_NOTIFY_PORT", 0))
+NOTIFY_TOKEN = os.environ.get("COMPLIANCE_NOTIFY_TOKEN", "")
+NOTIFY_DEBOUNCE = 2.0
+
+# 📡 API de Google Sheets (COMPLIANCE_SHEETS_API apunta a un servidor local falso en pruebas)
+GOOGLE_SHEETS_API = "https://sheets.googleapis.com"
+SHEETS_API = os.environ.get("COMPLIANCE_SHEETS_API", GOOGLE_SHEETS_API)
+READ_QUOTA_PER_MINUTE = int(os.environ.get("COMPLIANCE_READ_QUOTA", 60))
+
+# 🌍 Nominatim (COMPLIANCE_NOMINATIM_URL apunta a un geocodificador local en pruebas)
+NOMINATIM_URL = os.environ.get("COMPLIANCE_NOMINATIM_URL", "https://nominatim.openstreetmap.org")
+NOMINATIM_MIN_INTERVAL = 1.0
@@ -0,0 +1,157 @@
+from compliance import shared
+from compliance.config import GOOGLE_SHEETS_API, SCOPES, SHEET_ID, SHEETS_API
+from compliance.lazy import lazy_import
+from compliance.sheets import SheetsClient
+from compliance.singleflight import SingleFlight
+
+service_account = lazy_import("google.oauth2.service_account")
+google_requests = lazy_import("google.auth.transport.requests")
+
+worksheet_flights = SingleFlight()
+
+# (sheet_id, sheet_name, columns) leídos en este proceso, para saber qué refrescar ante un aviso de cambio
+loaded = set()
+
+# 🧾 Fila de encabezados de cada hoja, resuelta una vez y reutilizada por las lecturas por columnas
+headers = {}
+# Columnas pedidas que ya se confirmaron ausentes en el encabezado vigente (opcionales, como "offer
+# status"): no se vuelve a leer el encabezado por ellas en cada refresco
+absent = {}
+
+
+# 📌 Credenciales a partir de un dict (Streamlit Secrets) o de un archivo local
+def get_credentials(info=None, path="credentials.json"):
+    if info:
+        return service_account.Credentials.from_service_account_info(dict(info), scopes=SCOPES)
+    return service_account.Credentials.from_service_account_file(path, scopes=SCOPES)
+
+
+def get_client(info=None, base_url=SHEETS_API):
+    if base_url != GOOGLE_SHEETS_API:
+        # Servidor local (falso) de Sheets: sin credenciales
+        return SheetsClient(base_url=base_url)
+    return SheetsClient(session=google_requests.AuthorizedSession(get_credentials(info)), base_url=base_url)
+
+
+def sheet_header(client, sheet_name, sheet_id=SHEET_ID, refresh=False):
+    key = (sheet_id, sheet_name)
+    if refresh or key not in headers:
+        headers[key] = [str(col).strip() for col in client.get_header(sheet_id, sheet_name)]
+        absent[key] = set()
+    return headers[key]
+
+
+# Posiciones de las columnas pedidas en el encabezado (sin distinguir mayúsculas ni espacios)
+def column_indexes(header, columns):
+    positions = {}
+    for index, name in enumerate(header):
+        positions.setdefault(name.lower(), index)
+    wanted = {str(col).strip().lower() for col in columns}
+    return sorted(positions[name] for name in wanted if name in positions), wanted - set(positions)
+
+
+def _fetch_columns(client, sheet_name, sheet_id, columns, refresh=False):
+    header = sheet_header(client, sheet_name, sheet_id, refresh)
+    indexes, missing = column_indexes(header, columns)
+    known = absent.setdefault((sheet_id, sheet_name), set())
+    if missing - known and not refresh:
+        # Puede que la hoja haya cambiado desde que se leyó el encabezado
+        return _fetch_columns(client, sheet_name, sheet_id, columns, refresh=True)
+    known |= missing
+    df = client.get_columns(sheet_id, sheet_name, indexes)
+    df.columns = [str(col).strip() for col in df.columns]
+    if list(df.columns) != [header[i] for i in indexes] and not refresh:
+        # Columnas movidas: el encabezado cacheado ya no sirve
+        return _fetch_columns(client, sheet_name, sheet_id, columns, refresh=True)
+    return df
+
+
+# 📂 Descargar una hoja como DataFrame con columnas normalizadas. Con `columns` solo se piden
+# esas columnas (rangos A1 por columna), en el orden en que aparecen en la hoja
+def fetch_worksheet(client, sheet_name, sheet_id=SHEET_ID, columns=None):
+    if columns is not None:
+        return _fetch_columns(client, sheet_name, sheet_id, columns)
+    df = client.get_records(sheet_id, sheet_name)
+    df.columns = [str(col).strip() for col in df.columns]
+    return df
+
+
+def _columns(columns):
+    return tuple(columns) if columns is not None else None
+
+
+# Clave de la hoja (y juego de columnas) en el store compartido
+def snapshot_key(sheet_name, sheet_id=SHEET_ID, columns=None):
+    return f"{sheet_id}:{sheet_name}:{'|'.join(columns) if columns is not None else '*'}"
+
+
+def _refresh(client, sheet_name, sheet_id, columns):
+    return shared.store().refresh(snapshot_key(sheet_name, sheet_id, columns), lambda: fetch_worksheet(client, sheet_name, sheet_id, columns))
+
+
+# 🛬 Versión vigente de la hoja en el store compartido. Si venció, una sola descarga en curso por
+# proceso (single flight) y, entre réplicas, solo la que toma el candado llama a la API
+def worksheet_version(client, sheet_name, sheet_id=SHEET_ID, columns=None):
+    columns = _columns(columns)
+    loaded.add((sheet_id, sheet_name, columns))
+    key = snapshot_key(sheet_name, sheet_id, columns)
+    meta = shared.store().fresh(key) or worksheet_flights.do(key, _refresh, client, sheet_name, sheet_id, columns)
+    return meta["version"]
+
+
+async def worksheet_version_async(client, sheet_name, sheet_id=SHEET_ID, columns=None):
+    columns = _columns(columns)
+    loaded.add((sheet_id, sheet_name, columns))
+    key = snapshot_key(sheet_name, sheet_id, columns)
+    meta = shared.store().fresh(key) or await worksheet_flights.do_async(key, _refresh, client, sheet_name, sheet_id, columns)
+    return meta["version"]
+
+
+def load_snapshot(sheet_name, version, sheet_id=SHEET_ID, columns=None):
+    return shared.store().load(snapshot_key(sheet_name, sheet_id, _columns(columns)), version)
+
+
+# La versión vigente ya no está en el store (desalojada): vencer el puntero para que se descargue de nuevo
+def snapshot_evicted(sheet_name, version, sheet_id=SHEET_ID, columns=None):
+    shared.store().evicted(snapshot_key(sheet_name, sheet_id, _columns(columns)), version)
+
+
+def load_worksheet(client, sheet_name, sheet_id=SHEET_ID, columns=None):
+    version = worksheet_version(client, sheet_name, sheet_id, columns)
+    try:
+        return load_snapshot(sheet_name, version, sheet_id, columns)
+    except KeyError:
+        snapshot_evicted(sheet_name, version, sheet_id, columns)
+        return load_snapshot(sheet_name, worksheet_version(client, sheet_name, sheet_id, columns), sheet_id, columns)
+
+
+async def load_worksheet_async(client, sheet_name, sheet_id=SHEET_ID, columns=None):
+    version = await worksheet_version_async(client, sheet_name, sheet_id, columns)
+    try:
+        return load_snapshot(sheet_name, version, sheet_id, columns)
+    except KeyError:
+        snapshot_evicted(sheet_name, version, sheet_id, columns)
+        version = await worksheet_version_async(client, sheet_name, sheet_id, columns)
+        return load_snapshot(sheet_name, version, sheet_id, columns)
+
+
+# 🔄 Aviso de cambio: vencer y volver a descargar las hojas afectadas (sheet_name None = todas las del
+# archivo). Devuelve los nombres de las hojas cuya versión cambió.
+def refresh_changed(client, sheet_id=SHEET_ID, sheet_name=None):
+    changed = set()
+    for loaded_id, loaded_name, columns in list(loaded):
+        if loaded_id != sheet_id or sheet_name not in (None, loaded_name):
+            continue
+        key = snapshot_key(loaded_name, loaded_id, columns)
+        before = shared.store().current(key)
+        # La hoja cambió: el encabezado (y las columnas ausentes) se vuelven a leer
+        headers.pop((loaded_id, loaded_name), None)
+        shared.store().invalidate(key)
+        if worksheet_version(client, loaded_name, loaded_id, columns) != (before or {}).get("version"):
+            changed.add(loaded_name)
+    return changed
+
+
+# (DataFrame, timestamp) de la última descarga exitosa de cualquier réplica, o None
+def last_good_snapshot(sheet_name, sheet_id=SHEET_ID, columns=None):
+    return shared.store().latest(snapshot_key(sheet_name, sheet_id, _columns(columns)))
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+WHISKER = 1.5
+RANGE_QUANTILES = 6
+BOX_COLUMNS = ["q1", "median", "q3", "count", "mean", "lowerfence", "upperfence"]
+
+
+# 📦 Estadísticas de caja por grupo (cuartiles, bigotes de Tukey, media) y los puntos atípicos
+def box_stats(df, by, value, whisker=WHISKER):
+    data = df[[by, value]].dropna()
+    # Sin filas (p. ej. todos los filtros vacíos) no hay cuartiles: cajas y atípicos vacíos
+    if data.empty:
+        return pd.DataFrame(columns=[by, *BOX_COLUMNS]), data.reset_index(drop=True)
+    grouped = data.groupby(by, sort=True)[value]
+
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ["q1", "median", "q3"]
+    stats["count"] = grouped.size()
+    stats["mean"] = grouped.mean()
+
+    iqr = stats["q3"] - stats["q1"]
+    low = data[by].map(stats["q1"] - whisker * iqr)
+    high = data[by].map(stats["q3"] + whisker * iqr)
+    inside = data[value].between(low, high)
+
+    # Los bigotes llegan hasta el valor más extremo que queda dentro de las cercas
+    fenced = data[inside].groupby(by, sort=True)[value]
+    stats["lowerfence"] = fenced.min()
+    stats["upperfence"] = fenced.max()
+
+    return stats.reset_index(), data[~inside].reset_index(drop=True)
+
+
+# 📊 Cortes por cuantiles de los montos positivos; los ceros (sin equity/token) quedan en el primer rango
+def quantile_edges(series, q=RANGE_QUANTILES):
+    values = pd.to_numeric(series, errors="coerce").dropna().to_numpy()
+    positive = values[values > 0]
+    if not len(positive):
+        return np.array([0.0])
+    edges = np.quantile(positive, np.linspace(0, 1, q + 1))
+    if (values <= 0).any():
+        edges = np.concatenate([[min(values.min(), 0.0)], edges])
+    return np.unique(edges)
+
+
+def short_amount(value):
+    for size, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= size:
+            return f"{value / size:.3g}{suffix}"
+    return f"{value:.3g}"
+
+
+def range_labels(edges):
+    if len(edges) == 1:
+        return [short_amount(edges[0])]
+    return [f"{short_amount(low)}-{short_amount(high)}" for low, high in zip(edges[:-1], edges[1:])]
+
+
+# Conteo por rango con bordes ya calculados (el último rango incluye el máximo)
+def histogram(series, edges):
+    values = pd.to_numeric(series, errors="coerce").dropna().to_numpy()
+    if len(edges) == 1:
+        counts = [int((values == edges[0]).sum())]
+    else:
+        counts = np.histogram(values, bins=edges)[0]
+    return pd.DataFrame({"Range": range_labels(edges), "Employee Count": counts})
+
+
+def group_totals(df, by, value):
+    return df.groupby(by, as_index=False, sort=True)[value].sum()
+
+
+# 💵 Todos los resúmenes de la página de costos en una sola llamada (tamaño proporcional a los grupos)
+def cost_distributions(df_filtered, equity_edges, token_edges):
+    cost_box, cost_outliers = box_stats(df_filtered, "Position", "Total Cost")
+    salary_box, salary_outliers = box_stats(df_filtered, "Department", "Salary")
+    return {
+        "cost_by_department": group_totals(df_filtered, "Department", "Total Cost"),
+        "cost_by_position": group_totals(df_filtered, "Position", "Total Cost"),
+        "cost_box": cost_box,
+        "cost_outliers": cost_outliers,
+        "salary_box": salary_box,
+        "salary_outliers": salary_outliers,
+        "equity_ranges": histogram(df_filtered["Equity"], equity_edges),
+        "token_ranges": histogram(df_filtered["Token"], token_edges),
+        "token_equity_by_department": group_totals(df_filtered, "Department", ["Token", "Equity"]),
+    }
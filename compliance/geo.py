@@ -0,0 +1,152 @@
+import json
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from compliance import shared
+from compliance.config import GEOCODE_TTL, NOMINATIM_URL
+from compliance.lazy import lazy_import
+
+geocoders = lazy_import("geopy.geocoders")
+
+USER_AGENT = "employee_geocoder"
+
+
+def geocoder():
+    url = urlparse(NOMINATIM_URL)
+    return geocoders.Nominatim(user_agent=USER_AGENT, domain=url.netloc, scheme=url.scheme)
+
+
+# Una consulta a Nominatim, sin límite de frecuencia: se llama desde aio.geocode_many, que respeta 1 por segundo
+def lookup(country, state, geolocator=None):
+    location = (geolocator or geocoder()).geocode(f"{state}, {country}")
+    if location:
+        return location.latitude, location.longitude
+    return None, None
+
+
+# 🗄️ Coordenadas ya resueltas por (country, state) en el cache compartido, con vencimiento de GEOCODE_TTL
+def _geocode_key(country, state):
+    return f"geocode:{country}|{state}"
+
+
+def cached(country, state):
+    raw = shared.store().backend.get(_geocode_key(country, state))
+    return tuple(json.loads(raw)) if raw else None
+
+
+def remember(country, state, coords, ttl=GEOCODE_TTL):
+    shared.store().backend.set(_geocode_key(country, state), json.dumps(list(coords)).encode(), ttl=ttl)
+
+
+def unique_locations(df):
+    return df[["Country", "State"]].drop_duplicates()
+
+
+# Unir coordenadas ya resueltas ({(country, state): (lat, lon)}) y descartar las filas sin ubicación
+def attach_coordinates(df, coords):
+    locs = unique_locations(df).copy()
+    points = [coords.get((country, state), (None, None)) for country, state in zip(locs["Country"], locs["State"])]
+    locs["lat"] = [lat for lat, _ in points]
+    locs["lon"] = [lon for _, lon in points]
+    df = df.merge(locs, on=["Country", "State"], how="left")
+    return df.dropna(subset=["lat", "lon"])
+
+
+# -------------------------
+# 🗺️ Agregación del mapa por celdas, en varias resoluciones
+# -------------------------
+MAX_ZOOM = 12
+# Celdas de ~64 px: cada tile de 256 px del mapa se divide en 4 x 4
+CELLS_PER_TILE = 4
+MAX_LATITUDE = 85.05112878
+COST_COLUMNS = ["Salary", "Equity", "Token"]
+CLUSTER_COLUMNS = ["Zoom", "lat", "lon", "Headcount", "Cost", "Locations", "Label"]
+# Las partes conservan las columnas por las que filtra la página
+PART_KEYS = ["Country", "State", "Department"]
+PART_COLUMNS = ["Zoom", "Cell", *PART_KEYS, "Label", "lat", "lon", "Headcount", "Cost"]
+# Nivel de detalle del mapa -> zoom (None = el que encuadra los puntos)
+MAP_DETAIL = {"Auto": None, "World": 1, "Continent": 3, "Country": 5, "Region": 7, "City": 10}
+MAP_SIZE = (900, 600)
+# Las coordenadas son de estados, no de direcciones: el encuadre automático no acerca más que esto
+AUTO_MAX_ZOOM = 7
+
+
+# Coordenadas Web Mercator normalizadas a [0, 1) (las mismas que usan los tiles del mapa)
+def mercator(lat, lon):
+    lat = np.radians(np.clip(np.asarray(lat, dtype=float), -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(lon, dtype=float) + 180) / 360
+    y = 0.5 - np.log(np.tan(np.pi / 4 + lat / 2)) / (2 * np.pi)
+    return np.clip(x, 0, 1 - 1e-12), np.clip(y, 0, 1 - 1e-12)
+
+
+# 📍 Partes de las celdas de todas las resoluciones (zoom 0..max_zoom): dotación y costo por celda,
+# ubicación y departamento. Se calcula una vez por snapshot sin filtrar; cada filtro elige sus partes
+# (mismas columnas que metrics.filter_team) y cluster_cells las suma por celda.
+def clusters(df, max_zoom=MAX_ZOOM):
+    points = df.dropna(subset=["lat", "lon"])
+    cost = sum(points[col].fillna(0) for col in COST_COLUMNS if col in points.columns)
+    # Primero por ubicación exacta (la geocodificación es por estado): pocas filas para las demás resoluciones
+    places = (
+        pd.DataFrame({**{col: points[col] for col in PART_KEYS}, "lat": points["lat"], "lon": points["lon"], "Cost": cost})
+        .groupby([*PART_KEYS, "lat", "lon"], as_index=False, dropna=False)
+        .agg(Headcount=("Cost", "size"), Cost=("Cost", "sum"))
+    )
+    if places.empty:
+        return pd.DataFrame(columns=PART_COLUMNS)
+
+    places["Label"] = places["State"].astype(str) + ", " + places["Country"].astype(str)
+    x, y = mercator(places["lat"], places["lon"])
+    levels = []
+    for zoom in range(max_zoom + 1):
+        cells = 2 ** zoom * CELLS_PER_TILE
+        levels.append(places.assign(Zoom=zoom, Cell=(np.floor(y * cells) * cells + np.floor(x * cells)).astype(np.int64)))
+    return pd.concat(levels, ignore_index=True)[PART_COLUMNS]
+
+
+# 🗺️ Celdas del mapa a partir de las partes ya filtradas: dotación, costo y centro ponderado por celda
+def cluster_cells(parts, zoom=None):
+    if zoom is not None:
+        parts = parts[parts["Zoom"] == zoom]
+    if parts.empty:
+        return pd.DataFrame(columns=CLUSTER_COLUMNS)
+
+    # Cada ubicación dentro de su celda, sumando sus departamentos; la de más personas nombra la celda
+    places = (
+        parts.groupby(["Zoom", "Cell", "Label", "lat", "lon"], as_index=False)[["Headcount", "Cost"]].sum()
+        .sort_values("Headcount", ascending=False, kind="stable")
+    )
+    places = places.assign(_lat=places["lat"] * places["Headcount"], _lon=places["lon"] * places["Headcount"])
+    grouped = places.groupby(["Zoom", "Cell"], sort=False).agg(
+        Headcount=("Headcount", "sum"), Cost=("Cost", "sum"), Locations=("Label", "size"),
+        Label=("Label", "first"), _lat=("_lat", "sum"), _lon=("_lon", "sum"),
+    )
+    return pd.DataFrame({
+        "Zoom": grouped.index.get_level_values("Zoom"),
+        "lat": grouped["_lat"] / grouped["Headcount"],
+        "lon": grouped["_lon"] / grouped["Headcount"],
+        "Headcount": grouped["Headcount"],
+        "Cost": grouped["Cost"],
+        "Locations": grouped["Locations"],
+        "Label": np.where(grouped["Locations"] > 1, grouped["Label"] + " +" + (grouped["Locations"] - 1).astype(str) + " more", grouped["Label"]),
+    }).reset_index(drop=True)
+
+
+# 🔍 Zoom que encuadra todos los puntos en un mapa de `size` píxeles
+def fit_zoom(df, size=MAP_SIZE, max_zoom=AUTO_MAX_ZOOM):
+    points = df.dropna(subset=["lat", "lon"])
+    if points.empty:
+        return 1
+    x, y = mercator(points["lat"], points["lon"])
+    span_x, span_y = max(x.max() - x.min(), 1e-9), max(y.max() - y.min(), 1e-9)
+    zoom = np.log2(min(size[0] / (256 * span_x), size[1] / (256 * span_y)))
+    return int(np.clip(np.floor(zoom) - 1, 1, max_zoom))
+
+
+# Centro del mapa: promedio de las celdas ponderado por dotación
+def center(cells):
+    if cells.empty:
+        return {"lat": 20.0, "lon": 0.0}
+    weights = cells["Headcount"]
+    return {"lat": float((cells["lat"] * weights).sum() / weights.sum()), "lon": float((cells["lon"] * weights).sum() / weights.sum())}
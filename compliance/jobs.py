@@ -0,0 +1,168 @@
+import contextlib
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 📌 Número de procesos para trabajos pesados (0 = ejecutar en el mismo hilo)
+MAX_WORKERS = int(os.environ.get("COMPLIANCE_WORKERS", min(4, os.cpu_count() or 1)))
+JOB_TIMEOUT = float(os.environ.get("COMPLIANCE_JOB_TIMEOUT", 120))
+# 📤 Exportaciones: pool propio (no compiten con los reruns interactivos) y cola acotada
+EXPORT_WORKERS = int(os.environ.get("COMPLIANCE_EXPORT_WORKERS", 1))
+EXPORT_QUEUE = int(os.environ.get("COMPLIANCE_EXPORT_QUEUE", 8))
+
+_lock = threading.Lock()
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+# Streamlit reemplaza __main__ por el script de la página: un proceso "spawn" lo volvería a ejecutar.
+# Mientras se lanzan procesos (dentro de submit) dejamos un __main__ vacío.
+@contextlib.contextmanager
+def _empty_main():
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+# ⚙️ Pool de procesos creado al primer uso. Si un proceso muere (OOM, kill) el executor queda roto
+# para siempre (BrokenProcessPool): se descarta, se crea otro y el trabajo se reintenta una vez.
+# Con max_pending, background() rechaza trabajos (QueueFull) cuando ya hay tantos en curso o en cola.
+class Pool:
+    def __init__(self, max_workers, name="compliance-jobs", max_pending=None):
+        self.max_workers = max_workers
+        self.name = name
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = None
+        self._threads = None
+        self._lock = threading.Lock()
+
+    # El servidor de Streamlit es multihilo: usamos "spawn" para no heredar locks con fork
+    def executor(self):
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _thread_executor(self):
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+            return self._threads
+
+    def _submit(self, executor, fn, *args, **kwargs):
+        with _lock, _empty_main():
+            return executor.submit(fn, *args, **kwargs)
+
+    def reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn, *args, **kwargs):
+        executor = self.executor()
+        if executor is None:
+            raise RuntimeError(f"Process pool disabled ({self.name})")
+        return self._submit(executor, fn, *args, **kwargs)
+
+    # Ejecutar una función pura en el pool y esperar el resultado; sin pool (o roto dos veces) corre en línea
+    def run(self, fn, *args, timeout=JOB_TIMEOUT, **kwargs):
+        for _ in range(2):
+            executor = self.executor()
+            if executor is None:
+                break
+            try:
+                return self._submit(executor, fn, *args, **kwargs).result(timeout=timeout)
+            except BrokenProcessPool:
+                self.reset(executor)
+        return fn(*args, **kwargs)
+
+    # 🧵 Trabajo largo sin esperar el resultado (Future): en el pool de procesos o, si está
+    # desactivado o roto dos veces, en un hilo aparte para no bloquear el rerun de la sesión
+    def background(self, fn, *args, **kwargs):
+        with self._lock:
+            if self.max_pending is not None and self.pending >= self.max_pending:
+                raise QueueFull(f"{self.name}: {self.pending} jobs already queued")
+            self.pending += 1
+        outer = Future()
+        outer.set_running_or_notify_cancel()
+        outer.add_done_callback(self._finished)
+        try:
+            self._background(outer, fn, args, kwargs, retries=1)
+        except BaseException as e:
+            outer.set_exception(e)
+            raise
+        return outer
+
+    def _finished(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    def _background(self, outer, fn, args, kwargs, retries):
+        executor = self.executor() if retries >= 0 else None
+        try:
+            if executor is None:
+                inner = self._thread_executor().submit(fn, *args, **kwargs)
+            else:
+                inner = self._submit(executor, fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self.reset(executor)
+            return self._background(outer, fn, args, kwargs, retries - 1)
+
+        def done(inner):
+            error = inner.exception()
+            if executor is not None and isinstance(error, BrokenProcessPool):
+                self.reset(executor)
+                self._background(outer, fn, args, kwargs, retries - 1)
+            elif error is not None:
+                outer.set_exception(error)
+            else:
+                outer.set_result(inner.result())
+
+        inner.add_done_callback(done)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            threads, self._threads = self._threads, None
+        for pool in (executor, threads):
+            if pool is not None:
+                pool.shutdown(wait=wait)
+
+
+# 📌 Pool de los trabajos interactivos (cost_snapshot, organigrama...) y pool de las exportaciones
+_pool = Pool(MAX_WORKERS)
+exports = Pool(EXPORT_WORKERS, "compliance-exports", max_pending=EXPORT_QUEUE)
+
+
+def get_executor():
+    return _pool.executor()
+
+
+def submit(fn, *args, **kwargs):
+    return _pool.submit(fn, *args, **kwargs)
+
+
+def run(fn, *args, timeout=JOB_TIMEOUT, **kwargs):
+    return _pool.run(fn, *args, timeout=timeout, **kwargs)
+
+
+def background(fn, *args, **kwargs):
+    return _pool.background(fn, *args, **kwargs)
+
+
+def shutdown(wait=True):
+    _pool.shutdown(wait)
+    exports.shutdown(wait)
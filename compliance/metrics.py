@@ -0,0 +1,197 @@
+import pandas as pd
+
+from compliance.cleaning import active_employees, prepare_org, prepare_vendors, status_is
+
+EMPLOYEE = "Arkham Employee"
+CONSULTANTS = "Consultants"
+
+
+# -------------------------
+# Cost Breakdown
+# -------------------------
+# 📦 Snapshot listo para la página de costos: (df_org, df_vendors, df_active)
+def cost_snapshot(df_org, df_vendors):
+    df_org = prepare_org(df_org)
+    return df_org, prepare_vendors(df_vendors), active_employees(df_org)
+
+
+def filter_active(df_active, departments=None, states=None, positions=None):
+    mask = pd.Series(True, index=df_active.index)
+    if departments is not None:
+        mask &= df_active["Department"].isin(departments)
+    if states is not None:
+        mask &= df_active["State"].isin(states)
+    if positions is not None:
+        mask &= df_active["Position"].isin(positions)
+    return df_active[mask]
+
+
+def cost_kpis(df_org, df_vendors):
+    df_full_time = df_org[(df_org["Contract"] == EMPLOYEE) & status_is(df_org, "active")]
+    df_consultant = df_org[df_org["Contract"].astype(str).str.lower() == CONSULTANTS.lower()]
+    vendors = vendor_kpis(df_vendors)
+
+    full_time_salary = df_full_time["Salary"].sum()
+    consultant_salary = df_consultant["Salary"].sum()
+    operation_yearly = full_time_salary + consultant_salary + vendors["yearly"]
+
+    return {
+        "full_time_salary": full_time_salary,
+        "full_time_monthly_salary": full_time_salary / 12,
+        "full_time_headcount": df_full_time.shape[0],
+        "full_time_equity": df_full_time["Equity"].sum(),
+        "full_time_token": df_full_time["Token"].sum(),
+        "full_time_avg_salary": df_full_time["Salary"].mean(),
+        "full_time_avg_equity": df_full_time["Equity"].mean(),
+        "full_time_avg_token": df_full_time["Token"].mean(),
+        "consultant_salary": consultant_salary,
+        "consultant_monthly": consultant_salary / 12,
+        "consultant_headcount": df_consultant.shape[0],
+        "vendor_yearly": vendors["yearly"],
+        "vendor_monthly": vendors["monthly"],
+        "operation_yearly": operation_yearly,
+        "operation_monthly": operation_yearly / 12,
+    }
+
+
+# KPIs de una entidad a partir de las hojas crudas (para consolidar varias entidades)
+def snapshot_kpis(df_org, df_vendors):
+    df_org, df_vendors, _ = cost_snapshot(df_org, df_vendors)
+    return cost_kpis(df_org, df_vendors)
+
+
+# 🌐 KPIs consolidados de varias entidades a partir de los KPIs de cada una: las sumas se suman y los
+# promedios y montos mensuales se recalculan, sin volver a juntar las filas
+def consolidate_kpis(kpis_list):
+    total = {key: sum(kpis[key] for kpis in kpis_list) for key in (
+        "full_time_salary", "full_time_headcount", "full_time_equity", "full_time_token",
+        "consultant_salary", "consultant_headcount", "vendor_yearly", "vendor_monthly", "operation_yearly",
+    )}
+    headcount = total["full_time_headcount"]
+    return {
+        **total,
+        "full_time_monthly_salary": total["full_time_salary"] / 12,
+        "full_time_avg_salary": total["full_time_salary"] / headcount if headcount else float("nan"),
+        "full_time_avg_equity": total["full_time_equity"] / headcount if headcount else float("nan"),
+        "full_time_avg_token": total["full_time_token"] / headcount if headcount else float("nan"),
+        "consultant_monthly": total["consultant_salary"] / 12,
+        "operation_monthly": total["operation_yearly"] / 12,
+    }
+
+
+def vendor_kpis(df_vendors):
+    df_active_vendors = df_vendors[status_is(df_vendors, "active")]
+    return {
+        "yearly": df_active_vendors["Contract Yearly Price"].sum(),
+        "monthly": df_active_vendors["Contract Monthly Price"].sum(),
+        "count": df_active_vendors.shape[0],
+    }
+
+
+def active_vendors(df_vendors):
+    return df_vendors[status_is(df_vendors, "active")]
+
+
+# 💰 Escenarios de presupuesto con posiciones abiertas y ofertas
+def budget_scenarios(df_org, filtered_headcount, budget):
+    salary_by_status = df_org.groupby(df_org["Status"].astype(str).str.strip().str.lower())["Salary"].sum()
+    active = salary_by_status.get("active", 0)
+    open_positions = salary_by_status.get("open position", 0)
+    offer_stage = salary_by_status.get("offer stage", 0)
+    open_count = int(status_is(df_org, "open position").sum())
+
+    return {
+        "open_count": open_count,
+        "anticipated_employees": filtered_headcount + open_count,
+        "open_salary": open_positions,
+        "open_monthly": open_positions / 12,
+        "active_salary": active,
+        "actual_plus_open": active + open_positions,
+        "actual_plus_open_monthly": (active + open_positions) / 12,
+        "total_with_hires": active + open_positions + offer_stage,
+        "budget": budget,
+    }
+
+
+def sum_by(df, by, columns):
+    return df.groupby(by, as_index=False)[columns].sum()
+
+
+def count_by(df, by, name="Employee Count"):
+    return df.groupby(by).size().reset_index(name=name)
+
+
+# -------------------------
+# Team Tracker
+# -------------------------
+def filter_team(df_active, country="All", state="All", departments=None):
+    filtered_df = df_active
+    if country != "All":
+        filtered_df = filtered_df[filtered_df["Country"] == country]
+    if state != "All":
+        filtered_df = filtered_df[filtered_df["State"] == state]
+    if departments:
+        filtered_df = filtered_df[filtered_df["Department"].isin(departments)]
+    return filtered_df
+
+
+def team_kris(df_active, budget):
+    internal = df_active[df_active["Contract"] == EMPLOYEE]
+    consultants = df_active[df_active["Contract"] == CONSULTANTS]
+    total_pay = df_active["Salary"].sum()
+    return {
+        "internal_salary": internal["Salary"].sum(),
+        "consultant_pay": consultants["Salary"].sum(),
+        "total_pay": total_pay,
+        "total_equity": df_active["Equity"].sum(),
+        "total_token": df_active["Token"].sum(),
+        "internal_employees": internal.shape[0],
+        "consultants": consultants.shape[0],
+        "team_size": df_active.shape[0],
+        "budget": budget,
+        "remaining_budget": budget - total_pay,
+    }
+
+
+def employee_lists(df_org, df_active):
+    return {
+        "active": df_active[status_is(df_active, "active") & df_active["Contract"].str.contains(EMPLOYEE, na=False)],
+        "inactive": df_org[status_is(df_org, "inactive")],
+        "consultants": df_active[status_is(df_active, "active") & df_active["Contract"].str.contains(CONSULTANTS, na=False)],
+    }
+
+
+# -------------------------
+# Hiring Tracker
+# -------------------------
+def status_column(df):
+    columns = [col for col in df.columns if "status" in col]
+    return columns[0] if columns else None
+
+
+def split_hiring(df, status_col):
+    df = df.copy()
+    df[status_col] = df[status_col].astype(str).str.strip().str.lower()
+    open_positions = df[df[status_col].isin(["open position", "multiple position"])]
+    return {
+        "df": df,
+        "offer_stage": df[df[status_col] == "offer stage"].copy(),
+        "open_positions": open_positions.dropna(axis=1, how="all"),
+        "active": df[df[status_col] == "active"].copy(),
+    }
+
+
+def value_counts(series, label):
+    counts = series.value_counts().reset_index()
+    counts.columns = [label, "Count"]
+    return counts
+
+
+def company_by_department(df):
+    if "company" not in df.columns or "department" not in df.columns:
+        return None
+    valid = df[
+        df["company"].notna() & df["department"].notna()
+        & (df["company"].astype(str).str.strip() != "") & (df["department"].astype(str).str.strip() != "")
+    ]
+    return valid.groupby(["company", "department"]).size().reset_index(name="Count")
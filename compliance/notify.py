@@ -0,0 +1,118 @@
+import hmac
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from compliance.config import NOTIFY_DEBOUNCE, NOTIFY_HOST, NOTIFY_PORT, NOTIFY_TOKEN, SHEET_ID
+
+DRIVE_FILE = re.compile(r"/files/([^/?]+)")
+
+
+# (sheet_id, sheet_name) de una notificación. Apps Script manda JSON {"spreadsheetId", "sheetName"};
+# un watch de Drive manda solo encabezados X-Goog-* (todo el archivo cambió: sheet_name = None)
+def parse_notification(headers, body):
+    state = headers.get("X-Goog-Resource-State")
+    if state is not None:
+        if state == "sync":
+            # Mensaje inicial al crear el canal, no es un cambio
+            return None
+        match = DRIVE_FILE.search(headers.get("X-Goog-Resource-URI", ""))
+        return (match.group(1) if match else SHEET_ID), None
+    payload = json.loads(body or b"{}")
+    if not isinstance(payload, dict):
+        raise ValueError("Notification body must be a JSON object")
+    return payload.get("spreadsheetId") or SHEET_ID, payload.get("sheetName")
+
+
+def _token(headers, body):
+    token = headers.get("X-Goog-Channel-Token")
+    if token is None and body:
+        try:
+            token = json.loads(body).get("token")
+        except (ValueError, AttributeError):
+            token = None
+    return token or ""
+
+
+# 📬 Receptor de avisos de cambio: responde 202 enseguida y llama a on_change(sheet_id, sheet_name)
+# en otro hilo. Varios avisos de la misma hoja dentro de `debounce` segundos se agrupan en uno.
+class ChangeReceiver:
+    def __init__(self, on_change, host=NOTIFY_HOST, port=NOTIFY_PORT, token=NOTIFY_TOKEN, debounce=NOTIFY_DEBOUNCE):
+        self.on_change = on_change
+        self.token = token
+        self.debounce = debounce
+        self.received = 0
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/notify"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="compliance-notify", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def schedule(self, sheet_id, sheet_name):
+        key = (sheet_id, sheet_name)
+        with self._lock:
+            self.received += 1
+            previous = self._timers.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+            timer = threading.Timer(self.debounce, self._fire, args=key)
+            timer.daemon = True
+            self._timers[key] = timer
+            timer.start()
+
+    def _fire(self, sheet_id, sheet_name):
+        with self._lock:
+            self._timers.pop((sheet_id, sheet_name), None)
+        self.on_change(sheet_id, sheet_name)
+
+    def _handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                if self.path.split("?")[0] != "/notify":
+                    return self.reply(404)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if receiver.token and not hmac.compare_digest(_token(self.headers, body).encode(), receiver.token.encode()):
+                    return self.reply(403)
+                try:
+                    change = parse_notification(self.headers, body)
+                except ValueError:
+                    return self.reply(400)
+                if change is not None:
+                    receiver.schedule(*change)
+                self.reply(202)
+
+        return Handler
@@ -0,0 +1,117 @@
+from compliance.lazy import lazy_import
+
+graphviz = lazy_import("graphviz")
+
+ORG_COLUMNS = {
+    "Compliance Employee": "Employee",
+    "Title": "Title",
+    "Direct Report": "DirectReport",
+    "Department": "Department",
+    "Status": "Status",
+}
+HEAD_OF_COMPLIANCE = "Adam Westwood-Booth"
+# Títulos que el organigrama muestra aunque la hoja diga otra cosa (quality los reporta)
+TITLE_OVERRIDES = {HEAD_OF_COMPLIANCE: "Head of Compliance"}
+
+# 🎨 Colores para modo oscuro
+ACTIVE_COLOR = "#004488"
+OPEN_COLOR = "#666666"
+TEXT_COLOR_ACTIVE = "white"
+TEXT_COLOR_OPEN = "black"
+EDGE_COLOR = "white"
+
+
+# 📊 Limpieza de la hoja para el organigrama
+def prepare_org_chart(df):
+    df = df[list(ORG_COLUMNS)].fillna("").rename(columns=ORG_COLUMNS)
+    for col in df.columns:
+        df[col] = df[col].astype(str).str.strip()
+
+    df["Employee"] = df["Employee"].replace("", "Open Position")
+    df["DirectReport"] = df["DirectReport"].replace("", "Open Position")
+    df["Title"] = df["Title"].replace("", "Unknown Position")
+    df["Status"] = df["Status"].replace("", "Active")
+
+    # Títulos fijos (Adam Westwood-Booth siempre es Head of Compliance)
+    df["Title"] = df["Employee"].map(TITLE_OVERRIDES).fillna(df["Title"])
+
+    # 🛑 Eliminar empleados inactivos
+    return df[df["Status"].str.lower() != "inactive"]
+
+
+def departments(df):
+    return sorted(df["Department"].dropna().unique().tolist())
+
+
+def filter_department(df, department):
+    if department == "All Departments":
+        return df
+    return df[df["Department"] == department]
+
+
+# 🔎 Personas elegidas y todos los que reportan a ellas (directa o indirectamente), nivel por nivel
+def subtree(df, people):
+    selected = df["Employee"].isin(people)
+    managers = set(people)
+    while managers:
+        reports = df["DirectReport"].isin(managers) & ~selected
+        selected |= reports
+        managers = set(df.loc[reports, "Employee"]) - {"Open Position"}
+    return df[selected]
+
+
+# 🎨 Organigrama como grafo de Graphviz
+def generate_org_chart(data):
+    dot = graphviz.Digraph(format="png")
+    dot.attr(size="20,12", rankdir="TB", nodesep="0.5", ranksep="1.0", splines="true", concentrate="true", bgcolor="black")
+
+    # Primer título de cada empleado, para etiquetar a los jefes sin buscar en el DataFrame en cada fila
+    titles = data.drop_duplicates("Employee").set_index("Employee")["Title"].to_dict()
+
+    added_nodes = set()
+    levels = {}
+
+    for employee, title, direct_report in zip(data["Employee"], data["Title"], data["DirectReport"]):
+        title = TITLE_OVERRIDES.get(employee, title)
+
+        if employee == "Open Position":
+            label = f"Open Position\n{title}"
+            node_color, font_color = OPEN_COLOR, TEXT_COLOR_OPEN
+        else:
+            label = f"{employee}\n{title}"
+            node_color, font_color = ACTIVE_COLOR, TEXT_COLOR_ACTIVE
+
+        if employee not in added_nodes:
+            dot.node(employee, label=label, shape="box", style="filled", fillcolor=node_color, fontcolor=font_color, fontsize="14", width="2", height="1")
+            added_nodes.add(employee)
+
+        if direct_report and direct_report != "Open Position":
+            if direct_report not in added_nodes:
+                direct_report_label = f"{direct_report}\n{titles.get(direct_report, 'Unknown Position')}"
+                dot.node(direct_report, label=direct_report_label, shape="box", style="filled", fillcolor=ACTIVE_COLOR, fontcolor=TEXT_COLOR_ACTIVE, fontsize="14", width="2", height="1")
+                added_nodes.add(direct_report)
+
+            dot.edge(direct_report, employee, arrowhead="vee", color=EDGE_COLOR, penwidth="2")
+
+            # Organizar nodos en niveles
+            if direct_report not in levels:
+                levels[direct_report] = 0
+            levels[employee] = levels[direct_report] + 1
+
+    # 📌 Alinear nodos por niveles
+    level_groups = {}
+    for node, level in levels.items():
+        level_groups.setdefault(level, []).append(node)
+
+    for level_nodes in level_groups.values():
+        dot.attr(rank="same")
+        for node in level_nodes:
+            dot.node(node)
+
+    return dot
+
+
+# Fuente DOT del organigrama (texto serializable, apto para el pool de procesos)
+def org_chart_source(data):
+    return generate_org_chart(data).source
+
@@ -0,0 +1,26 @@
+from compliance import org
+
+# 📋 Hojas que lee cada página, por rol ("org", "vendor") con sus columnas (None = hoja completa).
+# Las páginas cargan estas mismas listas y ui.warm_up las precarga al arrancar: el snapshot se guarda
+# por hoja + columnas, así que la primera visita ya encuentra sus datos.
+COST_BREAKDOWN = {
+    "org": ["Compliance Employee", "Title", "Direct Report", "Department", "Position", "Contract", "Status", "State", "Salary", "Equity", "Token"],
+    "vendor": ["Status", "Vendor Name", "Vendor Contact Name", "Vendor Email", "Contract Duration", "Contract Monthly Price", "Contract Yearly Price"],
+}
+# Columnas de las tablas de contratación y de activos ("company" y "offer status" son opcionales)
+HIRING_TRACKER = {"org": ["compliance employee", "title", "department", "direct report", "company", "status", "offer status", "contract"]}
+ORG_STRUCTURE = {"org": list(org.ORG_COLUMNS)}
+TEAM_TRACKER = {"org": ["Compliance Employee", "Title", "Department", "Position", "Direct Report", "Contract", "Status", "Country", "State", "Salary", "Equity", "Token"]}
+# Data Health y Reports validan y exportan las hojas completas
+FULL_SHEETS = {"org": None, "vendor": None}
+
+PAGE_SHEETS = [COST_BREAKDOWN, HIRING_TRACKER, ORG_STRUCTURE, TEAM_TRACKER, FULL_SHEETS]
+
+
+# (rol, columnas) distintos de todas las páginas, en el orden de PAGE_SHEETS
+def sheet_columns():
+    requests = {}
+    for sheets in PAGE_SHEETS:
+        for role, columns in sheets.items():
+            requests.setdefault((role, tuple(columns) if columns is not None else None), None)
+    return list(requests)
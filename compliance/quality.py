@@ -0,0 +1,225 @@
+import difflib
+
+import numpy as np
+import pandas as pd
+
+from compliance.cleaning import MONEY_COLUMNS, NULL_VALUES, VENDOR_PRICE_COLUMNS, status_is
+from compliance.distributions import WHISKER
+from compliance.metrics import CONSULTANTS, EMPLOYEE
+from compliance.org import HEAD_OF_COMPLIANCE, TITLE_OVERRIDES
+
+# 🩺 Valores que entienden las páginas; el resto queda fuera de algún filtro o KPI
+ORG_STATUSES = ["Active", "Inactive", "Open Position", "Multiple Position", "Offer Stage"]
+VENDOR_STATUSES = ["Active", "Inactive"]
+CONTRACTS = [EMPLOYEE, CONSULTANTS]
+
+FINDING_COLUMNS = ["Severity", "Rule", "Row", "Record", "Column", "Value", "Message"]
+SEVERITIES = ["error", "warning", "info"]
+MIN_OUTLIER_GROUP = 4
+
+
+def empty_findings():
+    return pd.DataFrame(columns=FINDING_COLUMNS)
+
+
+def _text(series):
+    return series.fillna("").astype(str).str.strip()
+
+
+def _blank(series):
+    return series.isna() | _text(series).isin(NULL_VALUES)
+
+
+# Filas marcadas por `mask` como hallazgos; `message` puede ser un texto o una Serie por fila.
+# Row es la fila en Google Sheets (la 1 es el encabezado).
+def _findings(df, mask, rule, severity, column, message, record_column):
+    rows = df[mask]
+    if rows.empty:
+        return empty_findings()
+    messages = message[mask] if isinstance(message, pd.Series) else message
+    return pd.DataFrame({
+        "Severity": severity,
+        "Rule": rule,
+        "Row": np.flatnonzero(mask.to_numpy()) + 2,
+        "Record": _text(rows[record_column]).to_numpy() if record_column in df.columns else "",
+        "Column": column,
+        "Value": _text(rows[column]).to_numpy() if column in df.columns else "",
+        "Message": np.asarray(messages) if isinstance(messages, pd.Series) else messages,
+    })
+
+
+def duplicates(column):
+    def check(df):
+        names = _text(df[column]).str.lower()
+        mask = (names != "") & names.duplicated(keep=False)
+        return _findings(df, mask, "Duplicate record", "error", column, f"'{column}' appears more than once", column)
+    return [column], check
+
+
+def money_values(columns, record_column):
+    def check(df):
+        frames = []
+        for column in columns:
+            if column not in df.columns:
+                continue
+            values = _text(df[column]).str.replace(r"[$,]", "", regex=True)
+            parsed = pd.to_numeric(values, errors="coerce")
+            mask = ~_blank(df[column]) & parsed.isna()
+            frames.append(_findings(df, mask, "Non-numeric amount", "error", column, "Not a number: counted as 0 in cost totals", record_column))
+        return pd.concat(frames, ignore_index=True) if frames else empty_findings()
+    return [], check
+
+
+# Sugerencia para variantes de escritura ("Actve" -> "Active")
+def _suggestions(values, known):
+    lowered = {value.lower(): value for value in known}
+    suggestions = {}
+    for value in values.unique():
+        match = difflib.get_close_matches(value.lower(), list(lowered), n=1, cutoff=0.75)
+        suggestions[value] = f" (did you mean '{lowered[match[0]]}'?)" if match else ""
+    return values.map(suggestions)
+
+
+def known_values(column, known, record_column, rule):
+    def check(df):
+        values = _text(df[column])
+        blank = values == ""
+        unknown = ~blank & ~values.str.lower().isin([value.lower() for value in known])
+        message = "Unknown value, left out of filters and KPIs" + _suggestions(values.where(unknown, ""), known)
+        return pd.concat([
+            _findings(df, unknown, rule, "warning", column, message, record_column),
+            _findings(df, blank, rule, "warning", column, f"Blank {column}", record_column),
+        ], ignore_index=True)
+    return [column], check
+
+
+# Contrato: las métricas comparan "Arkham Employee" exacto, así que otra capitalización no cuenta como full-time
+def contracts(df):
+    values = _text(df["Contract"])
+    active = status_is(df, "active") if "Status" in df.columns else pd.Series(True, index=df.index)
+    exact = values.isin(CONTRACTS)
+    variant = ~exact & values.str.lower().isin([value.lower() for value in CONTRACTS])
+    unknown = ~exact & ~variant & (values != "")
+    return pd.concat([
+        _findings(df, variant, "Unknown contract", "warning", "Contract", f"Spelling differs from '{EMPLOYEE}' / '{CONSULTANTS}': not counted in headcount KPIs", "Compliance Employee"),
+        _findings(df, unknown, "Unknown contract", "warning", "Contract", "Unknown contract type, left out of headcount KPIs", "Compliance Employee"),
+        _findings(df, active & (values == ""), "Unknown contract", "warning", "Contract", "Active employee without contract type", "Compliance Employee"),
+    ], ignore_index=True)
+
+
+def unknown_managers(df):
+    names = _text(df["Compliance Employee"]).str.lower()
+    managers = _text(df["Direct Report"])
+    mask = (managers != "") & ~managers.str.lower().isin(names[names != ""])
+    return _findings(df, mask, "Unknown manager", "warning", "Direct Report", "Manager is not an employee in the sheet", "Compliance Employee")
+
+
+def missing_managers(df):
+    names = _text(df["Compliance Employee"])
+    mask = (names != "") & (_text(df["Direct Report"]) == "") & (names.str.lower() != HEAD_OF_COMPLIANCE.lower())
+    if "Status" in df.columns:
+        mask &= ~status_is(df, "inactive")
+    return _findings(df, mask, "Missing manager", "warning", "Direct Report", "Blank Direct Report: shown under 'Open Position' in the org chart", "Compliance Employee")
+
+
+# 🔁 Ciclos de reporte (A -> B -> A) con saltos de punteros: tras 2^k >= n saltos cada empleado cae
+# dentro del ciclo al que lleva su cadena, o en el tope de la organización
+def reporting_cycles(df):
+    names = _text(df["Compliance Employee"])
+    lowered = names.str.lower()
+    valid = (lowered != "").to_numpy()
+    n = len(df)
+
+    first = ~lowered.duplicated() & (lowered != "")
+    position = pd.Series(np.flatnonzero(first.to_numpy()), index=lowered[first].to_numpy())
+    parent = _text(df["Direct Report"]).str.lower().map(position).fillna(n).astype(int).to_numpy()
+    parent = np.append(np.where(valid, parent, n), n)
+
+    landing = parent
+    for _ in range(int(np.ceil(np.log2(n + 1))) + 1):
+        landing = landing[landing]
+
+    cycles, seen = [], set()
+    for start in np.unique(landing[landing != n]):
+        if start in seen:
+            continue
+        cycle, node = [start], parent[start]
+        while node != start:
+            cycle.append(node)
+            node = parent[node]
+        seen.update(cycle)
+        cycles.append(cycle)
+
+    mask = pd.Series(False, index=df.index)
+    message = pd.Series("", index=df.index)
+    for cycle in cycles:
+        path = " → ".join(names.iloc[i] for i in cycle + cycle[:1])
+        mask.iloc[cycle] = True
+        message.iloc[cycle] = f"Reporting cycle: {path}"
+    return _findings(df, mask, "Reporting cycle", "error", "Direct Report", message, "Compliance Employee")
+
+
+# 📈 Salarios fuera de las cercas de Tukey de su Position (solo empleados activos, grupos de 4 o más)
+def salary_outliers(df):
+    salary = pd.to_numeric(_text(df["Salary"]).str.replace(r"[$,]", "", regex=True), errors="coerce")
+    position = _text(df["Position"])
+    eligible = salary.gt(0) & (position != "")
+    if "Status" in df.columns:
+        eligible &= status_is(df, "active")
+    grouped = salary.where(eligible).groupby(position)
+    q1, q3, count = grouped.transform("quantile", 0.25), grouped.transform("quantile", 0.75), grouped.transform("count")
+    low, high = q1 - WHISKER * (q3 - q1), q3 + WHISKER * (q3 - q1)
+    mask = eligible & count.ge(MIN_OUTLIER_GROUP) & ~salary.between(low, high)
+    message = "Outside the usual range for this Position ($" + low.map("{:,.0f}".format) + " – $" + high.map("{:,.0f}".format) + ")"
+    return _findings(df, mask, "Salary outlier", "info", "Salary", message, "Compliance Employee")
+
+
+def title_overrides(df):
+    names = _text(df["Compliance Employee"])
+    expected = names.map(TITLE_OVERRIDES)
+    mask = expected.notna() & (_text(df["Title"]) != expected.fillna(""))
+    message = "Shown as '" + expected.fillna("") + "' in the org chart"
+    return _findings(df, mask, "Title override", "info", "Title", message, "Compliance Employee")
+
+
+# 📋 Reglas por hoja: (columnas necesarias, función). Las que no tienen sus columnas se omiten,
+# así cada página valida solo lo que descarga
+RULESETS = {
+    "org": [
+        duplicates("Compliance Employee"),
+        (["Compliance Employee", "Direct Report"], unknown_managers),
+        (["Compliance Employee", "Direct Report"], missing_managers),
+        (["Compliance Employee", "Direct Report"], reporting_cycles),
+        money_values(MONEY_COLUMNS, "Compliance Employee"),
+        known_values("Status", ORG_STATUSES, "Compliance Employee", "Unknown status"),
+        (["Contract"], contracts),
+        (["Salary", "Position"], salary_outliers),
+        (["Compliance Employee", "Title"], title_overrides),
+    ],
+    "vendor": [
+        duplicates("Vendor Name"),
+        money_values(VENDOR_PRICE_COLUMNS, "Vendor Name"),
+        known_values("Status", VENDOR_STATUSES, "Vendor Name", "Unknown status"),
+    ],
+}
+
+
+# 🩺 Todos los hallazgos de un snapshot, de más a menos graves
+def validate(df, ruleset="org"):
+    df = df.reset_index(drop=True)
+    frames = [check(df) for columns, check in RULESETS[ruleset] if all(col in df.columns for col in columns)]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_findings()
+    findings = pd.concat(frames, ignore_index=True)
+    order = findings["Severity"].map({severity: i for i, severity in enumerate(SEVERITIES)})
+    return findings.assign(_order=order).sort_values(["_order", "Rule", "Row"], kind="stable").drop(columns="_order").reset_index(drop=True)
+
+
+def summary(findings):
+    return findings.groupby(["Severity", "Rule"], sort=False).size().reset_index(name="Count")
+
+
+def severity_counts(findings):
+    counts = findings["Severity"].value_counts()
+    return {severity: int(counts.get(severity, 0)) for severity in SEVERITIES}
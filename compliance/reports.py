@@ -0,0 +1,254 @@
+import csv
+import io
+import os
+import threading
+import time
+import uuid
+import zipfile
+from pathlib import Path
+
+from compliance import jobs
+from compliance.cleaning import prepare_hiring, status_is
+from compliance.config import EXPORT_DIR, EXPORT_RETENTION
+from compliance.lazy import lazy_import
+from compliance.metrics import CONSULTANTS, EMPLOYEE, cost_kpis, cost_snapshot, split_hiring
+
+xlsxwriter = lazy_import("xlsxwriter")
+matplotlib = lazy_import("matplotlib")
+backend_pdf = lazy_import("matplotlib.backends.backend_pdf")
+figure = lazy_import("matplotlib.figure")
+
+# 📊 KPIs del pack mensual, con las mismas etiquetas que Cost Breakdown
+KPI_LABELS = {
+    "full_time_salary": "Total Salary (Yearly)",
+    "full_time_monthly_salary": "Total Salary (Monthly)",
+    "full_time_headcount": "Full-Time Head Count",
+    "full_time_avg_salary": "Average Salary",
+    "full_time_equity": "Total Equity Allocated",
+    "full_time_token": "Total Token Allocated",
+    "consultant_salary": "Consultant Cost (Yearly)",
+    "consultant_monthly": "Total Consultant Cost (Monthly)",
+    "consultant_headcount": "Consultant Head Count",
+    "vendor_yearly": "Total Vendor Cost (Yearly)",
+    "vendor_monthly": "Total Vendor Cost (Monthly)",
+    "operation_yearly": "Compliance Operations Cost (Yearly)",
+    "operation_monthly": "Compliance Operations Cost (Monthly)",
+}
+VENDOR_COLUMNS = ["Vendor Name", "Status", "Vendor Contact Name", "Vendor Email", "Contract Duration", "Contract Monthly Price", "Contract Yearly Price"]
+HIRING_COLUMNS = ["compliance employee", "title", "department", "direct report", "status", "offer status"]
+ROLLUP_COLUMNS = ["Department", "Active", "Full-Time", "Consultants", "Open Positions", "Offer Stage", "Salary", "Equity", "Token", "Total Cost"]
+
+# 📤 Formatos: extensión del archivo y tipo MIME para la descarga (CSV = un .csv por hoja en un .zip)
+FORMATS = {
+    "xlsx": ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "zip", "application/zip"),
+    "pdf": ("PDF", "pdf", "application/pdf"),
+}
+CHUNK_ROWS = 1000
+PDF_ROWS_PER_PAGE = 40
+PDF_MAX_COLUMN_WIDTH = 28
+PDF_PAGE_SIZE = (11.69, 8.27)  # A4 apaisado, en pulgadas
+PDF_RC = {"pdf.use14corefonts": True, "font.family": "sans-serif", "font.sans-serif": ["Helvetica"], "font.monospace": ["Courier"], "font.weight": "medium"}
+
+
+# Una hoja del reporte: columnas y una función que devuelve las filas de a una (no se arma la tabla
+# de salida completa; cada escritor las va volcando al archivo)
+class ReportSheet:
+    def __init__(self, name, columns, rows):
+        self.name = name
+        self.columns = columns
+        self._rows = rows
+
+    def rows(self):
+        return self._rows()
+
+
+def _frame_rows(df, columns):
+    def rows():
+        for start in range(0, len(df), CHUNK_ROWS):
+            yield from df.iloc[start:start + CHUNK_ROWS][columns].itertuples(index=False, name=None)
+    return rows
+
+
+def _frame_sheet(name, df, columns, headers=None):
+    columns = [col for col in columns if col in df.columns]
+    return ReportSheet(name, headers or columns, _frame_rows(df, columns))
+
+
+# 🏢 Totales por departamento: dotación por contrato y estado, y costos de los activos
+def org_rollup(df_org):
+    department = df_org["Department"].astype(str).str.strip().replace("", "Unassigned")
+    active = status_is(df_org, "active")
+    contract = df_org["Contract"].astype(str).str.strip().str.lower()
+    flags = df_org.assign(
+        Department=department,
+        **{
+            "Active": active,
+            "Full-Time": active & (contract == EMPLOYEE.lower()),
+            "Consultants": active & (contract == CONSULTANTS.lower()),
+            "Open Positions": status_is(df_org, "open position", "multiple position"),
+            "Offer Stage": status_is(df_org, "offer stage"),
+        },
+    )
+    for col in ["Salary", "Equity", "Token", "Total Cost"]:
+        flags[col] = flags[col].where(active, 0)
+    rollup = flags.groupby("Department", as_index=False)[ROLLUP_COLUMNS[1:]].sum()
+    return rollup.sort_values("Total Cost", ascending=False, kind="stable")
+
+
+# 📋 Hojas del pack a partir de las hojas crudas del snapshot
+def report_sheets(df_org, df_vendors):
+    df_org, df_vendors, _ = cost_snapshot(df_org, df_vendors)
+    kpis = cost_kpis(df_org, df_vendors)
+    hiring = split_hiring(prepare_hiring(df_org), "status")
+    pipeline = hiring["df"][hiring["df"]["status"].isin(["offer stage", "open position", "multiple position"])]
+    pipeline = pipeline.assign(status=pipeline["status"].str.title())
+    hiring_columns = [col for col in HIRING_COLUMNS if col in pipeline.columns]
+    return [
+        ReportSheet("KPIs", ["Metric", "Value"], lambda: ((label, kpis[key]) for key, label in KPI_LABELS.items())),
+        _frame_sheet("Vendors", df_vendors, VENDOR_COLUMNS),
+        _frame_sheet("Hiring Pipeline", pipeline, hiring_columns, [col.title() for col in hiring_columns]),
+        _frame_sheet("Org Rollup", org_rollup(df_org), ROLLUP_COLUMNS),
+    ]
+
+
+def _plain(value):
+    # numpy -> tipos de Python; NaN queda vacío
+    value = value.item() if hasattr(value, "item") else value
+    return "" if isinstance(value, float) and value != value else value
+
+
+def _text(value):
+    value = _plain(value)
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+# 📗 Excel en modo constant_memory: cada fila se escribe al disco apenas se completa
+def write_xlsx(path, sheets, title):
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    workbook.set_properties({"title": title})
+    header = workbook.add_format({"bold": True, "bg_color": "#004488", "font_color": "white"})
+    money = workbook.add_format({"num_format": "#,##0.00"})
+    try:
+        for sheet in sheets:
+            worksheet = workbook.add_worksheet(sheet.name[:31])
+            worksheet.set_column(0, len(sheet.columns) - 1, 20)
+            worksheet.write_row(0, 0, sheet.columns, header)
+            for row_number, row in enumerate(sheet.rows(), start=1):
+                for col, value in enumerate(row):
+                    value = _plain(value)
+                    worksheet.write(row_number, col, value, money if isinstance(value, float) else None)
+    finally:
+        workbook.close()
+
+
+# 🗜️ Un CSV por hoja dentro de un .zip, escrito por partes
+def write_csv(path, sheets, title):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for sheet in sheets:
+            with archive.open(f"{sheet.name}.csv", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(sheet.columns)
+                for row in sheet.rows():
+                    writer.writerow([_plain(value) for value in row])
+
+
+# Filas de texto monoespaciado con columnas alineadas (más rápido que una tabla de matplotlib)
+def _text_table(columns, chunk, max_width=PDF_MAX_COLUMN_WIDTH):
+    widths = [min(max_width, max(len(str(col)), *(len(row[i]) for row in chunk))) for i, col in enumerate(columns)]
+    line = lambda cells: "  ".join(cell[:width].ljust(width) for cell, width in zip(cells, widths))
+    header = line([str(col) for col in columns])
+    return [header, "-" * len(header)] + [line(row) for row in chunk]
+
+
+# 📕 PDF con una tabla por página: cada página se dibuja, se guarda y se descarta.
+# Fuentes base del PDF (Helvetica/Courier): no se incrustan glifos, lo que más tarda en cada página
+def write_pdf(path, sheets, title):
+    with matplotlib.rc_context(PDF_RC), backend_pdf.PdfPages(path, metadata={"Title": title}) as pdf:
+        for sheet in sheets:
+            rows, page = iter(sheet.rows()), 1
+            while True:
+                chunk = [[_text(value) for value in row] for _, row in zip(range(PDF_ROWS_PER_PAGE), rows)]
+                if not chunk and page > 1:
+                    break
+                fig = figure.Figure(figsize=PDF_PAGE_SIZE)
+                fig.text(0.04, 0.95, f"{title} · {sheet.name}" + (f" ({page})" if page > 1 else ""), fontsize=12, weight="bold")
+                lines = _text_table(sheet.columns, chunk) if chunk else ["No rows"]
+                fig.text(0.04, 0.91, "\n".join(lines), fontsize=6.5, family="monospace", va="top", linespacing=1.6)
+                pdf.savefig(fig)
+                page += 1
+                if len(chunk) < PDF_ROWS_PER_PAGE:
+                    break
+
+
+WRITERS = {"xlsx": write_xlsx, "csv": write_csv, "pdf": write_pdf}
+
+
+# 📤 Generar el pack en `path` (corre en el pool de procesos). Se escribe en un temporal y se
+# renombra al final: un archivo con el nombre definitivo siempre está completo.
+def export(path, fmt, df_org, df_vendors, title="Compliance Report"):
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        WRITERS[fmt](tmp, report_sheets(df_org, df_vendors), title)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path.stat().st_size
+
+
+# 🗂️ Exportaciones del proceso: cada una corre en segundo plano, en el pool de exportaciones (cola
+# acotada: submit lanza jobs.QueueFull si está llena), y deja su archivo en EXPORT_DIR
+class ExportJobs:
+    def __init__(self, root=EXPORT_DIR, retention=EXPORT_RETENTION, pool=None, clock=time.time):
+        self.root = Path(root)
+        self.retention = retention
+        self.pool = pool if pool is not None else jobs.exports
+        self._clock = clock
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fmt, df_org, df_vendors, name="compliance-report", title="Compliance Report"):
+        self.prune()
+        self.root.mkdir(parents=True, exist_ok=True)
+        job_id = uuid.uuid4().hex[:12]
+        extension, mime = FORMATS[fmt][1:]
+        path = self.root / f"{job_id}-{name}.{extension}"
+        future = self.pool.background(export, str(path), fmt, df_org, df_vendors, title)
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id, "format": fmt, "path": path, "file_name": f"{name}.{extension}", "mime": mime,
+                "created": self._clock(), "future": future,
+            }
+        return job_id
+
+    # {"state": "running" | "done" | "failed" | "expired", ...} o None si ya no existe el registro
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        future = job["future"]
+        if not future.done():
+            return {**job, "state": "running", "elapsed": self._clock() - job["created"]}
+        error = future.exception()
+        if error is not None:
+            return {**job, "state": "failed", "error": error}
+        if not job["path"].exists():
+            # Borrado por la retención (de este proceso o de otra réplica con la misma carpeta)
+            return {**job, "state": "expired"}
+        return {**job, "state": "done", "size": future.result()}
+
+    # Borra archivos y registros vencidos
+    def prune(self):
+        cutoff = self._clock() - self.retention
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job["created"] < cutoff and job["future"].done()]
+            for job_id in expired:
+                self._jobs.pop(job_id)["path"].unlink(missing_ok=True)
+        if self.root.exists():
+            for path in self.root.iterdir():
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# 🔎 Columnas que entran en el índice, por rol de hoja
+SEARCH_FIELDS = {
+    "org": ["Compliance Employee", "Title", "Direct Report", "Department"],
+    "vendor": ["Vendor Name"],
+}
+# Campos que nombran a una persona (el resultado salta a su subárbol)
+PERSON_FIELDS = ["Compliance Employee", "Direct Report"]
+MATCH_COLUMNS = ["Sheet", "Field", "Value", "Rows", "Score"]
+MIN_SCORE = 0.2
+DEFAULT_LIMIT = 10
+
+
+# Minúsculas, sin acentos ni espacios repetidos ("José  Pérez" -> "jose perez")
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+# Trigramas con un espacio a cada lado, así el inicio y el final de cada palabra pesan más
+def trigrams(text):
+    padded = f" {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# 🗂️ Índice invertido trigrama -> valores. Cada valor distinto de (hoja, campo) es un documento que
+# recuerda en qué filas aparece; se arma una vez por snapshot y las búsquedas solo suman postings.
+class TrigramIndex:
+    def __init__(self, documents, postings):
+        self.documents = documents
+        self.postings = postings
+        self._sizes = documents["Trigrams"].to_numpy()
+        self._normalized = documents["Normalized"].to_numpy()
+
+    def __len__(self):
+        return len(self.documents)
+
+    # Coincidencias ordenadas por similitud (Jaccard de trigramas, con bonus si el texto contiene la
+    # búsqueda o empieza por ella)
+    def search(self, query, limit=DEFAULT_LIMIT, min_score=MIN_SCORE):
+        needle = normalize(query)
+        grams = [gram for gram in trigrams(query) if gram in self.postings]
+        if not needle or not grams:
+            return pd.DataFrame(columns=MATCH_COLUMNS)
+
+        hits = np.bincount(np.concatenate([self.postings[gram] for gram in grams]), minlength=len(self))
+        candidates = np.flatnonzero(hits)
+        shared = hits[candidates]
+        scores = shared / (len(trigrams(query)) + self._sizes[candidates] - shared)
+
+        # El bonus solo se calcula para los mejores candidatos, no para todo el índice
+        best = np.argsort(-scores, kind="stable")[:limit * 5]
+        top = candidates[best]
+        bonus = np.array([0.5 if value.startswith(needle) else 0.3 if needle in value else 0.0 for value in self._normalized[top]])
+        final = np.minimum(scores[best] + bonus, 1.0)
+
+        keep = final >= min_score
+        order = np.argsort(-final[keep], kind="stable")[:limit]
+        matches = self.documents.iloc[top[keep][order]][["Sheet", "Field", "Value", "Rows"]]
+        return matches.assign(Score=final[keep][order].round(3)).reset_index(drop=True)
+
+
+# 📚 Índice de varias hojas: frames = {rol: DataFrame}; se indexan los campos de SEARCH_FIELDS presentes
+def build_index(frames):
+    documents = []
+    for sheet, df in frames.items():
+        people = set()
+        for field in SEARCH_FIELDS.get(sheet, []):
+            if field not in df.columns:
+                continue
+            values = df[field].fillna("").astype(str).str.strip().reset_index(drop=True)
+            values = values[values != ""]
+            for value, rows in values.groupby(values, sort=False).groups.items():
+                normalized = normalize(value)
+                # Un manager que también es empleado ya está indexado (y lleva al mismo subárbol)
+                if field == "Direct Report" and normalized in people:
+                    continue
+                if field == "Compliance Employee":
+                    people.add(normalized)
+                documents.append((sheet, field, value, tuple(int(row) for row in rows), normalized))
+
+    documents = pd.DataFrame(documents, columns=["Sheet", "Field", "Value", "Rows", "Normalized"])
+    postings = defaultdict(list)
+    sizes = []
+    for doc, value in enumerate(documents["Value"]):
+        grams = trigrams(value)
+        sizes.append(len(grams))
+        for gram in grams:
+            postings[gram].append(doc)
+    documents["Trigrams"] = np.array(sizes, dtype=np.int32)
+    return TrigramIndex(documents, {gram: np.array(docs, dtype=np.int32) for gram, docs in postings.items()})
+
+
+# 👤 Personas a las que apunta una coincidencia: el propio nombre si es un empleado o manager, o los
+# empleados de esas filas si es un título o departamento
+def match_people(match, df_org):
+    if match["Sheet"] != "org":
+        return []
+    if match["Field"] in PERSON_FIELDS:
+        return [match["Value"]]
+    names = df_org["Compliance Employee"].iloc[list(match["Rows"])].fillna("").astype(str).str.strip()
+    return list(dict.fromkeys(name for name in names if name))
+
+
+# Filas de la coincidencia en las mismas hojas (o versiones limpias que conservan el orden de filas)
+def match_rows(match, frames):
+    return frames[match["Sheet"]].iloc[list(match["Rows"])]
+
+
+def describe(match):
+    count = len(match["Rows"])
+    rows = f" · {count} rows" if count > 1 else ""
+    return f"{match['Value']} · {match['Field']}{rows}"
@@ -0,0 +1,345 @@
+import collections
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlparse
+
+from compliance.config import CACHE_URL, DATA_TTL, DERIVED_TTL, MEMORY_CACHE_ENTRIES, SNAPSHOT_RETENTION
+from compliance.lazy import lazy_import
+
+redis = lazy_import("redis")
+
+
+# 🗄️ Backends de cache con la misma interfaz mínima: get / set / add (solo si no existe) / delete /
+# expire. Los valores son bytes; `ttl` en segundos (None = sin vencimiento).
+# Cada `sweep_every` segundos una escritura borra lo vencido, aunque nadie vuelva a leer esas claves.
+SWEEP_EVERY = 60.0
+
+
+# En memoria del proceso, con tope de claves: al pasarlo se descartan las menos usadas (LRU)
+class MemoryBackend:
+    def __init__(self, clock=time.time, max_entries=MEMORY_CACHE_ENTRIES, sweep_every=SWEEP_EVERY):
+        self._clock = clock
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + sweep_every
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def _expired(self, item, now):
+        return item[1] is not None and now >= item[1]
+
+    def _live(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if self._expired(item, self._clock()):
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item
+
+    def _put(self, key, value, ttl):
+        now = self._clock()
+        self._items[key] = (value, now + ttl if ttl else None)
+        self._items.move_to_end(key)
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_every
+            for expired in [key for key, item in self._items.items() if self._expired(item, now)]:
+                del self._items[expired]
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            item = self._live(key)
+            return item[0] if item else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._put(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            if self._live(key):
+                return False
+            self._put(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def expire(self, key, ttl):
+        with self._lock:
+            item = self._live(key)
+            if item is not None:
+                self._items[key] = (item[0], self._clock() + ttl)
+
+
+# 📁 Un archivo por clave en un volumen compartido: escrituras atómicas (rename) y lecturas con mmap.
+# Cada archivo empieza con el vencimiento (float de 8 bytes, 0 = nunca). El barrido también borra los
+# temporales que dejó una escritura interrumpida (proceso caído entre write y rename).
+class FileBackend:
+    HEADER = struct.Struct(">d")
+    TMP_MAX_AGE = 300.0
+
+    def __init__(self, root, clock=time.time, sweep_every=SWEEP_EVERY):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self.sweep_every = sweep_every
+        self._next_sweep = clock() + sweep_every
+        self._sweep_lock = threading.Lock()
+
+    def _path(self, key):
+        return self.root / hashlib.sha256(key.encode()).hexdigest()
+
+    def _encode(self, value, ttl):
+        return self.HEADER.pack(self._clock() + ttl if ttl else 0.0) + value
+
+    def _expired(self, expires_at):
+        return expires_at and self._clock() >= expires_at
+
+    def _read_header(self, path):
+        with open(path, "rb") as f:
+            return self.HEADER.unpack(f.read(self.HEADER.size))[0]
+
+    def sweep(self):
+        now = self._clock()
+        for path in self.root.iterdir():
+            try:
+                if path.name.endswith(".tmp"):
+                    if now - path.stat().st_mtime >= self.TMP_MAX_AGE:
+                        path.unlink(missing_ok=True)
+                elif self._expired(self._read_header(path)):
+                    path.unlink(missing_ok=True)
+            except (FileNotFoundError, struct.error):
+                # Borrado por otra réplica, o recién creado con add() y todavía vacío
+                continue
+
+    def _maybe_sweep(self):
+        with self._sweep_lock:
+            if self._clock() < self._next_sweep:
+                return
+            self._next_sweep = self._clock() + self.sweep_every
+        self.sweep()
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                (expires_at,) = self.HEADER.unpack_from(mm)
+                if self._expired(expires_at):
+                    return None
+                return mm[self.HEADER.size:]
+        except (FileNotFoundError, ValueError, struct.error):
+            # ValueError: archivo vacío (mmap de 0 bytes) mientras otro proceso lo crea
+            return None
+
+    def set(self, key, value, ttl=None):
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(self._encode(value, ttl))
+        os.replace(tmp, path)
+        self._maybe_sweep()
+
+    def add(self, key, value, ttl=None):
+        path = self._path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    expires_at = self._read_header(path)
+                except (FileNotFoundError, struct.error):
+                    continue
+                if not self._expired(expires_at):
+                    return False
+                # Vencido (p. ej. la réplica que lo tomó se cayó): liberarlo y reintentar
+                path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._encode(value, ttl))
+            self._maybe_sweep()
+            return True
+        return False
+
+    def delete(self, key):
+        self._path(key).unlink(missing_ok=True)
+
+    # Reescribe solo el encabezado (el contenido no se copia)
+    def expire(self, key, ttl):
+        try:
+            with open(self._path(key), "r+b") as f:
+                f.write(self.HEADER.pack(self._clock() + ttl))
+        except FileNotFoundError:
+            pass
+
+
+# 🔴 Redis (o compatible: Valkey, KeyDB...) compartido por todas las réplicas
+class RedisBackend:
+    def __init__(self, url, prefix="compliance:"):
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(self.prefix + key, value, nx=True, px=int(ttl * 1000) if ttl else None))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def expire(self, key, ttl):
+        self.client.pexpire(self.prefix + key, int(ttl * 1000))
+
+
+# memory:// (por proceso), file:///ruta/compartida o redis://host:6379/0
+def backend_from_url(url):
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend()
+    if parsed.scheme == "file":
+        return FileBackend(parsed.path)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+
+def digest(*args):
+    return hashlib.sha256(pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()[:16]
+
+
+# 📸 Snapshots versionados de cada hoja. El puntero `current:<clave>` dice qué versión sirven todas las
+# réplicas; la versión es el hash del contenido, así una descarga sin cambios no genera copia nueva.
+class SnapshotStore:
+    def __init__(self, backend, ttl=DATA_TTL, retention=SNAPSHOT_RETENTION, derived_ttl=DERIVED_TTL, lock_timeout=60.0,
+                 poll=0.2, clock=time.time, sleep=time.sleep):
+        self.backend = backend
+        self.ttl = ttl
+        self.retention = retention
+        self.derived_ttl = derived_ttl
+        self.lock_timeout = lock_timeout
+        self.poll = poll
+        self._clock = clock
+        self._sleep = sleep
+
+    # {"version": ..., "fetched_at": ...} o None
+    def current(self, key):
+        raw = self.backend.get(f"current:{key}")
+        return json.loads(raw) if raw else None
+
+    def fresh(self, key):
+        meta = self.current(key)
+        if meta and self._clock() - meta["fetched_at"] < self.ttl:
+            return meta
+        return None
+
+    # KeyError si el backend ya no tiene esa versión (desalojada por Redis, tope de entradas...)
+    def load(self, key, version):
+        raw = self.backend.get(f"snapshot:{key}:{version}")
+        if raw is None:
+            raise KeyError(f"Snapshot {version} of {key} is no longer available")
+        return pickle.loads(raw)
+
+    # La versión anterior queda solo un TTL más, para las sesiones que ya la estaban leyendo
+    def publish(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        meta = {"version": hashlib.sha256(payload).hexdigest()[:16], "fetched_at": self._clock()}
+        previous = self.current(key)
+        self.backend.set(f"snapshot:{key}:{meta['version']}", payload, ttl=self.retention)
+        self.backend.set(f"current:{key}", json.dumps(meta).encode())
+        if previous and previous["version"] != meta["version"]:
+            self.backend.expire(f"snapshot:{key}:{previous['version']}", self.ttl)
+        return meta
+
+    # Versión vigente; si venció, una sola réplica descarga (candado compartido) y las demás esperan
+    def refresh(self, key, fetch):
+        lock, token = f"lock:{key}", uuid.uuid4().hex.encode()
+        while True:
+            meta = self.fresh(key)
+            if meta:
+                return meta
+            if self.backend.add(lock, token, ttl=self.lock_timeout):
+                try:
+                    # Otra réplica pudo publicar justo antes de que tomáramos el candado
+                    return self.fresh(key) or self.publish(key, fetch())
+                finally:
+                    if self.backend.get(lock) == token:
+                        self.backend.delete(lock)
+            while self.backend.get(lock) and not self.fresh(key):
+                self._sleep(self.poll)
+
+    # Marca la versión vigente como vencida: la próxima lectura descarga de nuevo (la copia sigue
+    # disponible para el modo degradado)
+    def invalidate(self, key):
+        meta = self.current(key)
+        if meta is not None:
+            self.backend.set(f"current:{key}", json.dumps({**meta, "fetched_at": 0}).encode())
+
+    # La versión vigente ya no está en el backend: es un fallo de cache, la próxima lectura descarga de
+    # nuevo (si el puntero no cambió mientras tanto)
+    def evicted(self, key, version):
+        meta = self.current(key)
+        if meta is not None and meta["version"] == version:
+            self.invalidate(key)
+
+    # (valor, fetched_at) de la última versión publicada aunque esté vencida, o None
+    def latest(self, key):
+        meta = self.current(key)
+        if meta is None:
+            return None
+        try:
+            return self.load(key, meta["version"]), meta["fetched_at"]
+        except KeyError:
+            return None
+
+    # 🧮 Agregados derivados de un snapshot, compartidos por clave de contenido de sus argumentos
+    def derived(self, name, fn, *args):
+        key = f"derived:{name}:{digest(*args)}"
+        raw = self.backend.get(key)
+        if raw is not None:
+            return pickle.loads(raw)
+        value = fn(*args)
+        self.backend.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl=self.derived_ttl)
+        return value
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# Store del proceso, creado al primer uso a partir de COMPLIANCE_CACHE_URL
+def store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore(backend_from_url(CACHE_URL))
+        return _store
+
+
+def use(backend, **kwargs):
+    global _store
+    with _store_lock:
+        _store = SnapshotStore(backend, **kwargs)
+        return _store
+
+
+def derived(name, fn, *args):
+    return store().derived(name, fn, *args)
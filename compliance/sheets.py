@@ -0,0 +1,241 @@
+import collections
+import random
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+
+from compliance.config import READ_QUOTA_PER_MINUTE, SHEETS_API
+from compliance.lazy import lazy_import
+
+requests = lazy_import("requests")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SheetsError(Exception):
+    pass
+
+
+class CircuitOpenError(SheetsError):
+    pass
+
+
+# ⏱️ Cuota de lecturas por minuto (ventana deslizante): espera antes de pasarse en vez de recibir un 429
+class ReadQuota:
+    def __init__(self, per_minute=READ_QUOTA_PER_MINUTE, window=60.0, clock=time.monotonic, sleep=time.sleep):
+        self.per_minute = per_minute
+        self.window = window
+        self._clock = clock
+        self._sleep = sleep
+        self._calls = collections.deque()
+        self._lock = threading.Lock()
+
+    def used(self):
+        with self._lock:
+            self._expire(self._clock())
+            return len(self._calls)
+
+    def _expire(self, now):
+        while self._calls and now - self._calls[0] >= self.window:
+            self._calls.popleft()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._expire(now)
+                if len(self._calls) < self.per_minute:
+                    self._calls.append(now)
+                    return
+                wait = self.window - (now - self._calls[0])
+            self._sleep(wait)
+
+
+# 🔌 Circuit breaker: tras varias fallas seguidas (errores de red, 429 o 5xx) deja de llamar a la API
+# hasta que pase reset_timeout
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self._clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    # Medio abierto: deja pasar una sola llamada de prueba
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+            self._trial = False
+
+
+# Igual que gspread.utils.numericise: "2,000" -> 2000, "3.1" -> 3.1, el resto queda como texto
+def numericise(value):
+    if not isinstance(value, str) or "_" in value:
+        return value
+    cleaned = value.replace(",", "")
+    for cast in (int, float):
+        try:
+            return cast(cleaned)
+        except ValueError:
+            pass
+    return value
+
+
+def to_frame(values):
+    if not values:
+        return pd.DataFrame()
+    header = [str(col) for col in values[0]]
+    width = len(header)
+    rows = [[numericise(cell) for cell in row[:width]] + [""] * (width - len(row)) for row in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+
+# Columnas leídas con majorDimension=COLUMNS (cada una con su encabezado) -> DataFrame
+def columns_to_frame(columns):
+    if not columns:
+        return pd.DataFrame()
+    length = max(len(column) for column in columns) - 1
+    data = {}
+    for column in columns:
+        cells = [numericise(cell) for cell in column[1:]]
+        data[str(column[0]) if column else ""] = cells + [""] * (length - len(cells))
+    return pd.DataFrame(data)
+
+
+# 0 -> "A", 27 -> "AB"
+def column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return letters
+
+
+# Índices de columna -> rangos A1 contiguos: [0, 1, 2, 5] -> ["A:C", "F:F"]
+def column_ranges(indexes):
+    runs = []
+    for index in sorted(set(indexes)):
+        if runs and index == runs[-1][1] + 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return [f"{column_letter(start)}:{column_letter(end)}" for start, end in runs]
+
+
+def a1_sheet(sheet_name, cells=None):
+    sheet = "'" + sheet_name.replace("'", "''") + "'"
+    return f"{sheet}!{cells}" if cells else sheet
+
+
+# 📡 Cliente REST de Sheets v4 con cuota, reintentos con backoff exponencial + jitter y circuit breaker
+class SheetsClient:
+    def __init__(self, session=None, base_url=SHEETS_API, quota=None, breaker=None,
+                 max_retries=4, backoff=0.5, max_backoff=32.0, timeout=30.0, sleep=time.sleep):
+        self.session = session if session is not None else requests.Session()
+        self.base_url = base_url.rstrip("/")
+        self.quota = quota if quota is not None else ReadQuota()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._sleep = sleep
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        # Full jitter: espera aleatoria entre 0 y el tope exponencial
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def request(self, path, params=None):
+        if not self.breaker.allow():
+            raise CircuitOpenError("Google Sheets circuit breaker is open; skipping request")
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            self.quota.acquire()
+            response = None
+            try:
+                response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = SheetsError(f"Google Sheets request failed: {e}")
+            else:
+                if response.status_code < 400:
+                    # Solo cuenta como éxito una respuesta completa: un cuerpo cortado se reintenta
+                    try:
+                        result = response.json()
+                    except ValueError as e:
+                        error = SheetsError(f"Google Sheets returned an invalid response: {e}")
+                    else:
+                        self.breaker.record_success()
+                        return result
+                else:
+                    error = SheetsError(f"Google Sheets API error {response.status_code}: {response.text[:200]}")
+                    if response.status_code not in RETRY_STATUSES:
+                        # Otro 4xx (hoja inexistente, sin acceso): la API respondió, así que no cuenta
+                        # para el breaker, que es uno por proceso y compartido entre entidades
+                        self.breaker.record_success()
+                        raise error
+            if attempt < self.max_retries:
+                self._sleep(self._delay(attempt, response))
+
+        self.breaker.record_failure()
+        raise error
+
+    def get_values(self, sheet_id, a1_range):
+        result = self.request(f"/v4/spreadsheets/{sheet_id}/values/{quote(a1_range, safe='')}")
+        return result.get("values", [])
+
+    # Misma forma que gspread get_all_records(): primera fila como encabezado
+    def get_records(self, sheet_id, sheet_name):
+        return to_frame(self.get_values(sheet_id, a1_sheet(sheet_name)))
+
+    def get_header(self, sheet_id, sheet_name):
+        values = self.get_values(sheet_id, a1_sheet(sheet_name, "1:1"))
+        return [str(col) for col in values[0]] if values else []
+
+    # Solo las columnas pedidas (por índice), en una única llamada batchGet
+    def get_columns(self, sheet_id, sheet_name, indexes):
+        if not indexes:
+            return pd.DataFrame()
+        ranges = [a1_sheet(sheet_name, cells) for cells in column_ranges(indexes)]
+        result = self.request(f"/v4/spreadsheets/{sheet_id}/values:batchGet", params={"ranges": ranges, "majorDimension": "COLUMNS"})
+        return columns_to_frame([column for value_range in result.get("valueRanges", []) for column in value_range.get("values", [])])
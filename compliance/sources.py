@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from compliance.config import ORG_WORKSHEET, SHEET_ID, SOURCES_FILE, VENDOR_WORKSHEET
+
+
+# 🏢 Una entidad/región: su Google Sheet y los nombres de sus hojas
+class Source:
+    FIELDS = ("key", "name", "region", "sheet_id", "org_worksheet", "vendor_worksheet")
+
+    def __init__(self, key, name=None, region=None, sheet_id=SHEET_ID, org_worksheet=ORG_WORKSHEET, vendor_worksheet=VENDOR_WORKSHEET):
+        self.key = key
+        self.name = name or key
+        self.region = region
+        self.sheet_id = sheet_id
+        self.org_worksheet = org_worksheet
+        self.vendor_worksheet = vendor_worksheet
+
+    @property
+    def label(self):
+        return f"{self.name} ({self.region})" if self.region else self.name
+
+    # Hoja de cada rol: {"org": ..., "vendor": ...}
+    @property
+    def worksheets(self):
+        return {"org": self.org_worksheet, "vendor": self.vendor_worksheet}
+
+    def __repr__(self):
+        return f"Source({self.key!r}, sheet_id={self.sheet_id!r})"
+
+
+DEFAULT_SOURCE = Source("default", "Compliance")
+
+
+def parse_sources(config):
+    sources = {}
+    for entry in config.get("sources", []):
+        unknown = set(entry) - set(Source.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown source fields: {', '.join(sorted(unknown))}")
+        if "key" not in entry:
+            raise ValueError("Every source needs a 'key'")
+        if entry["key"] in sources:
+            raise ValueError(f"Duplicate source key: {entry['key']}")
+        sources[entry["key"]] = Source(**entry)
+    return sources
+
+
+# 📋 Registro de fuentes desde COMPLIANCE_SOURCES (JSON, ver sources.example.json).
+# Sin archivo: una sola entidad con SHEET_ID y las hojas de siempre.
+def load_sources(path=SOURCES_FILE):
+    path = Path(path)
+    if not path.exists():
+        return {DEFAULT_SOURCE.key: DEFAULT_SOURCE}
+    sources = parse_sources(json.loads(path.read_text()))
+    if not sources:
+        raise ValueError(f"No sources defined in {path}")
+    return sources
@@ -0,0 +1,47 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 25
+
+
+def project(df, columns=None):
+    if columns is None:
+        return list(df.columns)
+    return [col for col in columns if col in df.columns]
+
+
+# Posiciones de las filas ordenadas por una sola columna (vacíos al final)
+def sort_order(keys, ascending=True):
+    keys = pd.Series(keys.to_numpy(), index=np.arange(len(keys)))
+    try:
+        ordered = keys.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        # Columnas con tipos mezclados (texto y números) se ordenan como texto
+        ordered = keys.astype(str).sort_values(ascending=ascending, kind="stable")
+    return ordered.index.to_numpy()
+
+
+# 📄 Una página de filas ordenadas en el servidor: solo viaja al navegador lo que se ve
+def page_of(df, columns=None, sort_by=None, ascending=True, page=1, page_size=DEFAULT_PAGE_SIZE):
+    columns = project(df, columns)
+    total_rows = len(df)
+    total_pages = max(1, math.ceil(total_rows / page_size))
+    page = min(max(1, int(page)), total_pages)
+    start = (page - 1) * page_size
+
+    if sort_by in df.columns:
+        order = sort_order(df[sort_by], ascending)
+        rows = df.iloc[order[start:start + page_size]][columns]
+    else:
+        rows = df.iloc[start:start + page_size][columns]
+
+    return {
+        "rows": rows,
+        "page": page,
+        "total_pages": total_pages,
+        "total_rows": total_rows,
+        "first_row": start + 1 if total_rows else 0,
+        "last_row": min(start + page_size, total_rows),
+    }
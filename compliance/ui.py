@@ -0,0 +1,323 @@
+import importlib
+import logging
+import math
+import threading
+import time
+
+import streamlit as st
+from streamlit.errors import StreamlitSecretNotFoundError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from compliance import aio, data, notify, pages, quality, reports, search, shared, sources, tables
+from compliance.config import DATA_TTL, NOTIFY_HOST, NOTIFY_PORT, SHEET_ID
+
+logger = logging.getLogger(__name__)
+
+# 📦 Único módulo de compliance/ que depende de Streamlit: caches compartidos entre páginas
+WARM_UP_MODULES = ["pandas", "plotly.express", "requests", "google.auth.transport.requests", "google.oauth2.service_account", "graphviz"]
+# 👀 Sesiones abiertas que leyeron cada hoja ((sheet_id, nombre)), para pedirles un rerun cuando cambie
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def credentials_info():
+    try:
+        return st.secrets.get("google_credentials")
+    except StreamlitSecretNotFoundError:
+        return None
+
+
+# 📌 Cliente de Google Sheets, creado al primer uso y compartido por todas las sesiones
+@st.cache_resource(show_spinner=False)
+def get_client():
+    return data.get_client(credentials_info())
+
+
+# 📋 Entidades configuradas, leídas una vez por proceso
+@st.cache_resource(show_spinner=False)
+def registry():
+    return sources.load_sources()
+
+
+# 🏢 Entidad elegida en el sidebar (sin selector si hay una sola)
+def source():
+    entities = registry()
+    if len(entities) == 1:
+        return next(iter(entities.values()))
+    key = st.sidebar.selectbox("Entity", list(entities), format_func=lambda key: entities[key].label, key="entity")
+    return entities[key]
+
+
+# 📸 Copia local de una versión del snapshot compartido: se deserializa una vez por proceso
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_snapshot(sheet_name, columns, version, sheet_id=SHEET_ID):
+    return data.load_snapshot(sheet_name, version, sheet_id, columns)
+
+
+# 📂 Hoja por nombre y columnas, en la versión que sirven todas las réplicas (una lectura del puntero
+# por rerun); los errores no se cachean, cada página decide cómo mostrarlos. Si el store ya no tiene
+# la versión vigente, se descarga de nuevo
+def load_worksheet(sheet_name, columns=None, sheet_id=SHEET_ID):
+    version = data.worksheet_version(get_client(), sheet_name, sheet_id, columns)
+    try:
+        return load_snapshot(sheet_name, columns, version, sheet_id)
+    except KeyError:
+        data.snapshot_evicted(sheet_name, version, sheet_id, columns)
+        return load_snapshot(sheet_name, columns, data.worksheet_version(get_client(), sheet_name, sheet_id, columns), sheet_id)
+
+
+def age_text(seconds):
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "less than a minute"
+    if minutes < 120:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60} min"
+
+
+# 🟡 Modo degradado: si Google Sheets falla (429, breaker abierto...) se sirve la última copia buena.
+# `columns` limita la descarga a las columnas que usa la página (None = hoja completa)
+def worksheet(sheet_name, columns=None, sheet_id=SHEET_ID):
+    columns = tuple(columns) if columns is not None else None
+    watch(sheet_name, sheet_id)
+    try:
+        return load_worksheet(sheet_name, columns, sheet_id)
+    except Exception as e:
+        snapshot = data.last_good_snapshot(sheet_name, sheet_id, columns)
+        if snapshot is None:
+            raise
+        df, fetched_at = snapshot
+        st.warning(f"⚠️ Google Sheets is unavailable ({e}). Showing '{sheet_name}' as of {age_text(time.time() - fetched_at)} ago.")
+        return df
+
+
+# Cargar [(nombre, columnas, sheet_id), ...] a la vez, una hoja por hilo: la página espera solo a la
+# más lenta. Cada hilo lleva el contexto de la sesión para que el cache y los avisos funcionen igual que en serie.
+def _load_concurrently(requests, return_exceptions=False):
+    ctx = get_script_run_ctx()
+
+    def load(sheet_name, columns, sheet_id):
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            return worksheet(sheet_name, columns, sheet_id)
+        finally:
+            add_script_run_ctx(thread, None)
+
+    return aio.run(aio.gather_calls(load, requests, return_exceptions))
+
+
+# 📂 Varias hojas de un mismo archivo a la vez ({nombre: columnas})
+def worksheets(sheets, sheet_id=SHEET_ID):
+    return _load_concurrently([(name, columns, sheet_id) for name, columns in sheets.items()])
+
+
+# 🏢 Las mismas hojas de varias entidades a la vez: roles {"org": columnas, ...} -> ({entidad: {rol: df}}, {entidad: error}).
+# Cada entidad tiene sus propios snapshots (clave por sheet_id y hoja), no se mezclan entre sí; una entidad
+# que falla (sin permiso, hoja mal configurada) queda en los errores y no corta la carga de las demás.
+def source_worksheets(entities, roles):
+    requests = [(entity.worksheets[role], columns, entity.sheet_id) for entity in entities for role, columns in roles.items()]
+    results = iter(_load_concurrently(requests, return_exceptions=True))
+    sheets, errors = {}, {}
+    for entity in entities:
+        frames = {role: next(results) for role in roles}
+        error = next((frame for frame in frames.values() if isinstance(frame, Exception)), None)
+        if error is None:
+            sheets[entity.key] = frames
+        else:
+            errors[entity.key] = error
+    return sheets, errors
+
+
+# Sesiones con el navegador conectado, o None si no hay runtime (AppTest, scripts)
+def active_sessions():
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return None
+    try:
+        return {info.session.id for info in Runtime.instance()._session_mgr.list_active_sessions()}
+    except AttributeError:
+        return None
+
+
+# Anotar la sesión como lectora de la hoja. Al sumar una sesión nueva se olvidan las que ya se cerraron,
+# así _watchers no crece con cada pestaña abierta desde que arrancó el proceso
+def watch(sheet_name, sheet_id=SHEET_ID):
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    key = (sheet_id, sheet_name)
+    with _watchers_lock:
+        if ctx.session_id in _watchers.get(key, ()):
+            return
+    active = active_sessions()
+    with _watchers_lock:
+        if active is not None:
+            active.add(ctx.session_id)
+            for watched in list(_watchers):
+                _watchers[watched] &= active
+                if not _watchers[watched]:
+                    del _watchers[watched]
+        _watchers.setdefault(key, set()).add(ctx.session_id)
+
+
+# 🔁 Pedir un rerun a sesiones abiertas, igual que hace Streamlit cuando cambia el código de la página.
+# Usa la API interna del runtime: si no está disponible, la sesión verá los datos nuevos al interactuar.
+# Devuelve las sesiones que siguen abiertas.
+def rerun_sessions(session_ids):
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return set(session_ids)
+    runtime = Runtime.instance()
+    active = set()
+    for session_id in session_ids:
+        try:
+            info = runtime._session_mgr.get_active_session_info(session_id)
+            if info is None:
+                continue
+            session = info.session
+            runtime._get_async_objs().eventloop.call_soon_threadsafe(session.request_rerun, session._client_state)
+        except (AttributeError, RuntimeError):
+            return set(session_ids)
+        active.add(session_id)
+    return active
+
+
+def _on_sheet_change(sheet_id, sheet_name):
+    try:
+        changed = data.refresh_changed(get_client(), sheet_id, sheet_name)
+    except Exception:
+        # Google Sheets no respondió: la versión quedó vencida y se vuelve a pedir en el próximo rerun
+        return
+    keys = [(sheet_id, name) for name in changed]
+    with _watchers_lock:
+        sessions = set().union(*(_watchers.get(key, set()) for key in keys))
+    active = rerun_sessions(sessions)
+    with _watchers_lock:
+        for key in keys:
+            _watchers[key] = _watchers.get(key, set()) - (sessions - active)
+
+
+# 📬 Receptor de avisos de cambio (Apps Script / watch de Drive), uno por proceso si COMPLIANCE_NOTIFY_PORT está definido.
+# Si el puerto está ocupado (otra réplica en el mismo host) se sigue sin avisos: los datos se refrescan por TTL
+@st.cache_resource(show_spinner=False)
+def change_receiver():
+    if not NOTIFY_PORT:
+        return None
+    try:
+        return notify.ChangeReceiver(_on_sheet_change, host=NOTIFY_HOST, port=NOTIFY_PORT).start()
+    except OSError as e:
+        logger.warning("Change notifications disabled: cannot listen on %s:%s (%s)", NOTIFY_HOST, NOTIFY_PORT, e)
+        return None
+
+
+def _warm_up(modules, sheets):
+    for name in modules:
+        importlib.import_module(name)
+    # Las mismas hojas y columnas que piden las páginas (pages.PAGE_SHEETS): mismo snapshot y mismo cache
+    for sheet_id, sheet_name, columns in sheets:
+        try:
+            load_worksheet(sheet_name, columns, sheet_id)
+        except Exception:
+            # La página mostrará el error cuando lo pida
+            pass
+
+
+# 🔥 Precargar módulos pesados y los datos de todas las páginas y entidades en segundo plano y arrancar
+# el receptor de avisos, una sola vez por proceso
+@st.cache_resource(show_spinner=False)
+def warm_up(modules=tuple(WARM_UP_MODULES)):
+    change_receiver()
+    sheets = [(entity.sheet_id, entity.worksheets[role], columns) for entity in registry().values() for role, columns in pages.sheet_columns()]
+    thread = threading.Thread(target=_warm_up, args=(modules, sheets), name="compliance-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# 📄 Tabla paginada: proyecta columnas, ordena y pagina en el servidor y envía una sola página
+def paginated_table(df, key, columns=None, page_size=tables.DEFAULT_PAGE_SIZE):
+    columns = tables.project(df, columns)
+    total_pages = max(1, math.ceil(len(df) / page_size))
+
+    # Si los filtros redujeron las filas, volver a una página válida antes de dibujar el widget
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > total_pages:
+        st.session_state[page_key] = total_pages
+
+    sort_col, order_col, page_col = st.columns([3, 2, 2])
+    sort_by = sort_col.selectbox("Sort by", ["—"] + columns, key=f"{key}_sort")
+    order = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order")
+    page = page_col.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1, key=page_key)
+
+    result = tables.page_of(df, columns, None if sort_by == "—" else sort_by, order == "Ascending", page, page_size)
+    st.dataframe(result["rows"], hide_index=True, use_container_width=True)
+    st.caption(f"Rows {result['first_row']:,}–{result['last_row']:,} of {result['total_rows']:,} · Page {result['page']} of {result['total_pages']}")
+
+
+# 🩺 Hallazgos de calidad de un snapshot: se validan una vez por versión (compartido entre réplicas)
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def findings(entity, df, ruleset="org"):
+    return shared.derived(f"{entity}:quality:{ruleset}", quality.validate, df, ruleset)
+
+
+SEVERITY_ICONS = {"error": "🔴", "warning": "🟠", "info": "🔵"}
+
+
+# 🩺 Panel plegable con el estado de los datos de la hoja que muestra la página
+def data_health(entity, df, key, ruleset="org"):
+    result = findings(entity, df, ruleset)
+    counts = quality.severity_counts(result)
+    icon = "✅" if not len(result) else SEVERITY_ICONS[next(severity for severity in quality.SEVERITIES if counts[severity])]
+    label = f"{icon} Data health · {counts['error']} errors, {counts['warning']} warnings, {counts['info']} notes"
+    with st.expander(label, expanded=False):
+        if result.empty:
+            st.caption("No issues found in this sheet.")
+            return result
+        st.dataframe(quality.summary(result), hide_index=True, use_container_width=True)
+        paginated_table(result, f"{key}_findings", quality.FINDING_COLUMNS)
+        st.caption("Row is the row number in Google Sheets. Fix the sheet and the panel updates with the next snapshot.")
+    return result
+
+
+# 🔎 Índice de búsqueda de las hojas de una página ({rol: df}), armado una vez por snapshot.
+# cache_resource: las búsquedas leen el mismo índice sin copiarlo en cada rerun
+@st.cache_resource(ttl=DATA_TTL, max_entries=16, show_spinner=False)
+def search_index(entity, frames):
+    return shared.derived(f"{entity}:search_index", search.build_index, frames)
+
+
+# 🔎 Buscador del sidebar: devuelve la coincidencia elegida (fila de search.MATCH_COLUMNS) o None
+def search_box(entity, frames, key):
+    query_key = f"{key}_query"
+    # Búsqueda enviada desde otra página con jump()
+    if f"{key}_jump" in st.session_state:
+        st.session_state[query_key] = st.session_state.pop(f"{key}_jump")
+
+    query = st.sidebar.text_input("🔎 Search", key=query_key, placeholder="Name, title, manager, department or vendor")
+    if not query.strip():
+        return None
+    matches = search_index(entity, frames).search(query)
+    if matches.empty:
+        st.sidebar.caption("No matches.")
+        return None
+    # Con una búsqueda nueva se vuelve a elegir la mejor coincidencia
+    if st.session_state.get(f"{key}_searched") != query:
+        st.session_state[f"{key}_searched"] = query
+        st.session_state[f"{key}_match"] = 0
+    labels = [search.describe(match) for _, match in matches.iterrows()]
+    choice = st.sidebar.radio("Matches", range(len(matches)), format_func=labels.__getitem__, key=f"{key}_match")
+    return matches.iloc[choice or 0]
+
+
+# ↪️ Abrir otra página con una búsqueda ya escrita en su search_box
+def jump(page, key, query):
+    st.session_state[f"{key}_jump"] = query
+    st.switch_page(page)
+
+
+# 📤 Exportaciones en segundo plano del proceso (compartidas por todas las sesiones)
+@st.cache_resource(show_spinner=False)
+def export_jobs():
+    return reports.ExportJobs()
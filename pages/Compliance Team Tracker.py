@@ -1,12 +1,13 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import gspread
-from google.oauth2.service_account import Credentials
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-import numpy as np
+
+from compliance import aio, cleaning, geo, metrics, pages, shared, ui
+from compliance.config import DATA_TTL
+from compliance.lazy import lazy_import
+
+px = lazy_import("plotly.express")
+
+MAP_COLUMNS = ["Country", "State", "Department", "lat", "lon", "Salary", "Equity", "Token"]
+TEAM_COLUMNS = pages.TEAM_TRACKER["org"]
 
 # -------------------------
 # Página y CSS
@@ -51,53 +52,26 @@ st.markdown('<p class="title">Compliance Team Trackers</p>', unsafe_allow_html=T
 # -------------------------
 # Cargar Datos de Google Sheets
 # -------------------------
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly", "https://www.googleapis.com/auth/drive.readonly"]
-SHEET_ID = "1R3EMYJt7he4CklRTRWtC6iqPzACg_eWyHdV6BaTzTms"
+ui.warm_up()
+source = ui.source()
+try:
+    df_org = ui.worksheet(source.org_worksheet, TEAM_COLUMNS, source.sheet_id)
+except Exception as e:
+    st.error(f"⚠️ Error al cargar datos desde Google Sheets: {e}")
+    st.stop()
 
-@st.cache_data(ttl=600)
-def load_data():
-    # 📌 Cargar credenciales desde Streamlit Secrets o archivo local
-    if "google_credentials" in st.secrets:
-        creds = Credentials.from_service_account_info(st.secrets["google_credentials"], scopes=SCOPES)
-    else:
-        creds = Credentials.from_service_account_file("credentials.json", scopes=SCOPES)
-
-    client = gspread.authorize(creds)
-    worksheet = client.open_by_key(SHEET_ID).worksheet("Compliance Org Structure & Open")
-    df = pd.DataFrame(worksheet.get_all_records())
-    df.columns = df.columns.str.strip()
-    return df
-
-df_org = load_data()
-df_active = df_org[df_org['Status'].str.lower() == 'active'].copy()
+ui.data_health(source.key, df_org, "team")
 
 # -------------------------
 # Limpieza de Datos Numéricos
 # -------------------------
-for col in ['Salary', 'Equity', 'Token']:
-    df_active[col] = df_active[col].replace('[\$,]', '', regex=True)
-    df_active[col] = pd.to_numeric(df_active[col], errors='coerce')
+df_active = cleaning.prepare_team(df_org)
 
 # -------------------------
 # Geocodificación Dinámica (Country, State)
 # -------------------------
-@st.cache_data(ttl=86400, show_spinner=False)
-def get_coords_from_geopy(country, state):
-    geolocator = Nominatim(user_agent="employee_geocoder")
-    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-    query = f"{state}, {country}"
-    location = geocode(query)
-    if location:
-        return location.latitude, location.longitude
-    else:
-        return None, None
-
-unique_locs = df_active[['Country', 'State']].drop_duplicates().copy()
-unique_locs["coords"] = unique_locs.apply(lambda row: get_coords_from_geopy(row["Country"], row["State"]), axis=1)
-unique_locs["lat"] = unique_locs["coords"].apply(lambda x: x[0])
-unique_locs["lon"] = unique_locs["coords"].apply(lambda x: x[1])
-df_active = df_active.merge(unique_locs[["Country", "State", "lat", "lon"]], on=["Country", "State"], how="left")
-df_active = df_active.dropna(subset=["lat", "lon"])
+coords = aio.run(aio.geocode_many(geo.unique_locations(df_active).itertuples(index=False)))
+df_active = geo.attach_coordinates(df_active, coords)
 
 if "budget_queue" not in st.session_state or not st.session_state["budget_queue"]:
     st.session_state["budget_queue"] = [5000000]  # Inicializa con un valor por defecto si está vacío
@@ -127,13 +101,7 @@ with st.sidebar.expander("🏢 Department & Position Filters", expanded=False):
 # -------------------------
 # Filtrar Datos según la Selección
 # -------------------------
-filtered_df = df_active.copy()
-if selected_country != "All":
-    filtered_df = filtered_df[filtered_df["Country"] == selected_country]
-if selected_state != "All":
-    filtered_df = filtered_df[filtered_df["State"] == selected_state]
-if selected_department:
-    filtered_df = filtered_df[filtered_df["Department"].isin(selected_department)]
+filtered_df = metrics.filter_team(df_active, selected_country, selected_state, selected_department)
 
 
 
@@ -146,51 +114,55 @@ if len(st.session_state["budget_queue"]) == 0 or st.session_state["budget_queue"
 # -------------------------
 
 current_budget = st.session_state["budget_queue"][-1]
-internal_salary = df_active[df_active['Contract'] == 'Arkham Employee']['Salary'].sum()
-consultant_pay = df_active[df_active['Contract'] == 'Consultants']['Salary'].sum()
-total_pay = df_active['Salary'].sum()
-total_equity = df_active['Equity'].sum()
-total_token = df_active['Token'].sum()
-
-total_internal_employees = df_active[df_active['Contract'] == 'Arkham Employee'].shape[0]
-total_consultants = df_active[df_active['Contract'] == 'Consultants'].shape[0]
-total_compliance_team = df_active.shape[0]
-remaining_budget = current_budget - total_pay
+kris = metrics.team_kris(df_active, current_budget)
 
 # -------------------------
 # Mostrar Indicadores Clave (KRIs)
 # -------------------------
 col1, col2, col3, col4, col5 = st.columns(5)
-col1.metric("Total Internal Salary", f"${internal_salary:,.2f}")
-col2.metric("Total Consultant Pay", f"${consultant_pay:,.2f}")
-col3.metric("Total Pay", f"${total_pay:,.2f}")
-col4.metric("Total Equity", f"${total_equity:,.2f}")
-col5.metric("Total Token", f"${total_token:,.2f}")
+col1.metric("Total Internal Salary", f"${kris['internal_salary']:,.2f}")
+col2.metric("Total Consultant Pay", f"${kris['consultant_pay']:,.2f}")
+col3.metric("Total Pay", f"${kris['total_pay']:,.2f}")
+col4.metric("Total Equity", f"${kris['total_equity']:,.2f}")
+col5.metric("Total Token", f"${kris['total_token']:,.2f}")
 
 col6, col7, col8, col9, col10 = st.columns(5)
-col6.metric("Total Budget", f"${current_budget:,.2f}")
-col7.metric("Remaining Budget", f"${remaining_budget:,.2f}")
-col8.metric("Total Internal Employees", f"{total_internal_employees}")
-col9.metric("Total Consultants", f"{total_consultants}")
-col10.metric("Total Compliance Team", f"{total_compliance_team}")
+col6.metric("Total Budget", f"${kris['budget']:,.2f}")
+col7.metric("Remaining Budget", f"${kris['remaining_budget']:,.2f}")
+col8.metric("Total Internal Employees", f"{kris['internal_employees']}")
+col9.metric("Total Consultants", f"{kris['consultants']}")
+col10.metric("Total Compliance Team", f"{kris['team_size']}")
 
 
 # -------------------------
 # Gráficas y Mapas
 # -------------------------
+# 📍 Agregación del mapa en todas las resoluciones, una vez por snapshot sin filtrar (compartida entre réplicas)
+@st.cache_data(ttl=DATA_TTL)
+def map_clusters(df_location):
+    return shared.derived("geo_clusters", geo.clusters, df_location)
+
+
 st.markdown("### Employees by Department")
-df_dept = df_active.groupby("Department").size().reset_index(name="Employee Count")
+df_dept = metrics.count_by(df_active, "Department")
 fig_dept = px.bar(df_dept, x="Department", y="Employee Count", text="Employee Count", color="Department", template="plotly_white")
 st.plotly_chart(fig_dept, use_container_width=True)
 
 st.markdown("### Employees by Country")
-df_country = df_active.groupby("Country").size().reset_index(name="Employee Count")
+df_country = metrics.count_by(df_active, "Country")
 fig_country = px.bar(df_country, x="Country", y="Employee Count", text="Employee Count", color="Country", template="plotly_white")
 st.plotly_chart(fig_country, use_container_width=True)
 
 st.markdown("### Employee Locations (Filtered)")
-df_location = filtered_df.groupby(['Country', 'State', 'lat', 'lon']).agg({'Compliance Employee': 'count'}).reset_index().rename(columns={'Compliance Employee': 'Employee Count'})
-fig_map = px.scatter_mapbox(df_location, lat="lat", lon="lon", size="Employee Count", zoom=3, height=600)
+# 🗺️ Los filtros eligen partes de las celdas precalculadas y el mapa suma solo las de su zoom.
+# Plotly no avisa al servidor cuando el usuario hace zoom, así que el nivel se elige aquí
+map_detail = st.select_slider("Map detail", options=list(geo.MAP_DETAIL), value="Auto")
+zoom = geo.MAP_DETAIL[map_detail] or geo.fit_zoom(filtered_df)
+parts = metrics.filter_team(map_clusters(df_active[MAP_COLUMNS]), selected_country, selected_state, selected_department)
+cells = geo.cluster_cells(parts, zoom)
+fig_map = px.scatter_mapbox(cells, lat="lat", lon="lon", size="Headcount", color="Cost", hover_name="Label",
+                            hover_data={"Headcount": True, "Cost": ":$,.0f", "Locations": True, "lat": False, "lon": False},
+                            zoom=zoom, center=geo.center(cells), height=geo.MAP_SIZE[1], size_max=40, color_continuous_scale="Viridis")
 fig_map.update_layout(mapbox_style="carto-darkmatter", margin={"r": 0, "t": 50, "l": 0, "b": 0})
 st.plotly_chart(fig_map, use_container_width=True)
 
@@ -198,14 +170,13 @@ st.plotly_chart(fig_map, use_container_width=True)
 # Tabla de Detalles con Filtro
 # -------------------------
 st.markdown("### Employee Details (Filtered)")
-st.dataframe(filtered_df, use_container_width=True)
+ui.paginated_table(filtered_df, "team_details", TEAM_COLUMNS)
 
 
 # -------------------------
 # Gráfico: Total Equity Granted por Departamento
 # -------------------------
-df_equity_department = filtered_df[['Department', 'Equity']].dropna()
-df_equity_department = df_equity_department.groupby('Department', as_index=False)['Equity'].sum()
+df_equity_department = metrics.sum_by(filtered_df[['Department', 'Equity']].dropna(), 'Department', 'Equity')
 
 fig_equity_department = px.bar(
     df_equity_department,
@@ -223,7 +194,7 @@ st.markdown("### Total Equity Granted per Department")
 st.plotly_chart(fig_equity_department, use_container_width=True)
 
 # Total Tokens por Departamento
-df_tokens_department = filtered_df.groupby('Department', as_index=False)['Token'].sum()
+df_tokens_department = metrics.sum_by(filtered_df, 'Department', 'Token')
 fig_tokens_department = px.bar(df_tokens_department, x='Department', y='Token', title="🏢 Total Tokens Granted per Department", color='Department', text='Token', template="plotly_white")
 fig_tokens_department.update_traces(texttemplate='%{text:.2f}', textposition='outside')
 
@@ -234,17 +205,16 @@ st.plotly_chart(fig_tokens_department, use_container_width=True)
 # -------------------------
 st.markdown("### Employee Lists")
 
-# Lista de empleados activos (filtrando correctamente con paréntesis en la condición)
-st.write("**List of current active employees:**", 
-         df_active[(df_active['Status'].str.lower() == 'active') & 
-                   (df_active['Contract'].str.contains('Arkham Employee', na=False))])
+employee_lists = metrics.employee_lists(df_org, df_active)
+
+# Lista de empleados activos
+st.write("**List of current active employees:**")
+ui.paginated_table(employee_lists["active"], "list_active", TEAM_COLUMNS)
 
 # Lista de empleados que fueron despedidos
-st.write("**List of employees who were let go:**", 
-         df_org[df_org['Status'].str.lower() == 'inactive'])
+st.write("**List of employees who were let go:**")
+ui.paginated_table(employee_lists["inactive"], "list_inactive", TEAM_COLUMNS)
 
 # Lista de consultores con números de presupuesto asociados
-st.write("**List of consultants with associated budget numbers:**", 
-         df_active[(df_active['Status'].str.lower() == 'active') & 
-                   (df_active['Contract'].str.contains('Consultants', na=False))])
-
+st.write("**List of consultants with associated budget numbers:**")
+ui.paginated_table(employee_lists["consultants"], "list_consultants", TEAM_COLUMNS)
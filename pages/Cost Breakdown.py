@@ -1,9 +1,16 @@
 import streamlit as st
-import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import plotly.express as px
-import numpy as np 
+
+from compliance import charts, distributions, jobs, metrics, pages, search, shared, tables, ui
+from compliance.config import DATA_TTL
+from compliance.lazy import lazy_import
+from compliance.metrics import cost_snapshot
+
+px = lazy_import("plotly.express")
+
+EMPLOYEE_COLUMNS = ['Compliance Employee', 'Title', 'Department', 'Position', 'Salary', 'Equity', 'Token', 'Total Cost']
+VENDOR_COLUMNS = pages.COST_BREAKDOWN["vendor"]
+
+ui.warm_up()
 
 st.markdown(
     """
@@ -24,100 +31,59 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# 📌 Configurar credenciales de Google Sheets
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly", "https://www.googleapis.com/auth/drive.readonly"]
-SHEET_ID = "1R3EMYJt7he4CklRTRWtC6iqPzACg_eWyHdV6BaTzTms"
-
-# Función para obtener credenciales
-def get_credentials():
-    if "google_credentials" in st.secrets:
-        return Credentials.from_service_account_info(st.secrets["google_credentials"], scopes=SCOPES)
-    else:
-        return Credentials.from_service_account_file("credentials.json", scopes=SCOPES)
-
-# 📌 Cargar datos desde Google Sheets
-@st.cache_data(ttl=600)
-def load_data():
-    try:
-        creds = get_credentials()
-        client = gspread.authorize(creds)
-
-        # Cargar Compliance Org Structure & Open
-        worksheet_compliance = client.open_by_key(SHEET_ID).worksheet("Compliance Org Structure & Open")
-        df_compliance = pd.DataFrame(worksheet_compliance.get_all_records())
-        df_compliance.columns = df_compliance.columns.str.strip()
-
-        # Cargar Vendor Management
-        worksheet_vendor = client.open_by_key(SHEET_ID).worksheet("Vendor Management")
-        df_vendors = pd.DataFrame(worksheet_vendor.get_all_records())
-        df_vendors.columns = df_vendors.columns.str.strip()
-
-        return df_compliance, df_vendors
-    except Exception as e:
-        st.error(f"⚠️ Error al cargar datos desde Google Sheets: {e}")
-        return pd.DataFrame(), pd.DataFrame()
-
-# Cargar los datos
-df_org, df_vendors = load_data()
+# 📌 Cargar datos desde Google Sheets: la entidad elegida y, si hay varias, todas a la vez para el consolidado.
+# Solo se detiene la página si falla la entidad elegida; las demás que fallen quedan fuera del consolidado
+source = ui.source()
+entities = list(ui.registry().values())
+sheets, failed = ui.source_worksheets(entities, pages.COST_BREAKDOWN)
+if source.key in failed:
+    st.error(f"⚠️ Error al cargar datos desde Google Sheets: {failed[source.key]}")
+    st.stop()
+if failed:
+    st.warning("⚠️ Could not load " + "; ".join(f"{entity.label} ({failed[entity.key]})" for entity in entities if entity.key in failed)
+               + ". Left out of the consolidated totals.")
+loaded = [entity for entity in entities if entity.key in sheets]
+df_org_raw, df_vendors_raw = sheets[source.key]["org"], sheets[source.key]["vendor"]
 
-# 📊 Limpieza de Datos Numéricos
-def clean_numeric_column(df, col):
-    if col in df.columns:
-        df[col] = df[col].astype(str).str.strip()
-        df[col] = df[col].replace(r'[$,]', '', regex=True)
-        df[col] = df[col].replace(['', ' ', 'N/A', 'NULL', 'None', '-', '--'], None)
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-        df[col] = df[col].fillna(0)
 
-# Verificar si df_vendors no está vacío antes de aplicar la limpieza
-if not df_vendors.empty:
-    for col in ["Contract Monthly Price", "Contract Yearly Price"]:
-        if col in df_vendors.columns:
-            clean_numeric_column(df_vendors, col)
+# 📊 Limpieza de datos numéricos (en el pool de procesos, una vez por snapshot entre todas las réplicas)
+@st.cache_data(ttl=DATA_TTL)
+def prepare_data(entity, df_org, df_vendors):
+    return shared.derived(f"{entity}:cost_snapshot", jobs.run, cost_snapshot, df_org, df_vendors)
 
-# Aplicar limpieza a df_org (empleados)
-for col in ['Salary', 'Equity', 'Token']:
-    if col in df_org.columns:
-        clean_numeric_column(df_org, col)
 
-# Filtrar empleados activos
-df_active = df_org[df_org['Status'].str.lower() == 'active'].copy()
+# 🌐 KPIs de cada entidad, cacheados por snapshot: el consolidado se arma con estos, no con las filas
+@st.cache_data(ttl=DATA_TTL)
+def entity_kpis(entity, df_org, df_vendors):
+    return shared.derived(f"{entity}:snapshot_kpis", metrics.snapshot_kpis, df_org, df_vendors)
 
-# Calcular el costo total por empleado
-df_active["Total Cost"] = df_active["Salary"] + df_active["Equity"] + df_active["Token"]
-df_active["Total Salary per Month"] = df_active["Salary"] / 12
 
-# Llenar valores NaN con 0
-df_active.fillna(0, inplace=True)
-df_org.fillna(0, inplace=True)
+if df_org_raw.empty:
+    st.stop()
 
-df_active["Total Salary per Month"] = df_active["Salary"] / 12
-# Asegurar que las columnas numéricas sean de tipo float en df_org
-for col in ['Salary', 'Equity', 'Token']:
-    df_org[col] = df_org[col].replace(r'[$,]', '', regex=True).astype(float)
+df_org, df_vendors, df_active = prepare_data(source.key, df_org_raw, df_vendors_raw)
 
-# Calcular el costo total por empleado
-df_org["Total Cost"] = df_org["Salary"] + df_org["Equity"] + df_org["Token"]
 
-# Llenar valores NaN con 0 para evitar errores en cálculos
-df_org.fillna(0, inplace=True)
+# 📦 Rangos de Equity/Token por cuantiles del snapshot completo (estables al cambiar filtros)
+@st.cache_data(ttl=DATA_TTL)
+def range_edges(df_active):
+    return distributions.quantile_edges(df_active["Equity"]), distributions.quantile_edges(df_active["Token"])
 
-# Asegurar que Total Cost es float
-df_org["Total Cost"] = df_org["Total Cost"].astype(float)
 
+# 📊 Resúmenes para los gráficos, cacheados por snapshot y filtros
+@st.cache_data(ttl=DATA_TTL)
+def cost_distributions(df_active, departments, states, positions):
+    return shared.derived("cost_distributions", filtered_distributions, df_active, departments, states, positions)
 
-# Llenar valores NaN con 0 para evitar errores en cálculos
-df_org.fillna(0, inplace=True)
-
-
-
-# ✅ Asegurar que "Position" se mantiene correctamente en df_active
-df_active["Position"] = df_active["Position"].str.strip()
 
+def filtered_distributions(df_active, departments, states, positions):
+    df_filtered = metrics.filter_active(df_active, departments=departments, states=states, positions=positions)
+    return distributions.cost_distributions(df_filtered, *range_edges(df_active))
 
 # -------------------------
 # Filtros en el Sidebar (Panel Izquierdo)
 # -------------------------
+match = ui.search_box(source.key, {"org": df_org_raw, "vendor": df_vendors_raw}, "cost_search")
 st.sidebar.header("🛠 Filters")
 
 with st.sidebar.expander("📍 Location Filters", expanded=False):
@@ -130,166 +96,170 @@ with st.sidebar.expander("💼 Position Filters", expanded=False):
     available_positions = df_active["Position"].unique().tolist()  # Obtener todas las posiciones únicas
     selected_job_level = st.multiselect("Select Position", available_positions, default=available_positions)
 
-    
-
-df_filtered = df_active[(df_active["Department"].isin(selected_department)) & (df_active["State"].isin(selected_state)) & (df_active["Position"].isin(selected_job_level))]
+df_filtered = metrics.filter_active(df_active, departments=selected_department, states=selected_state, positions=selected_job_level)
 
 # -------------------------
 # Métricas clave
 # -------------------------
-# Asegurar que "Contract Yearly Price" es numérico
-# Convertir precios a formato numérico, asegurando que los valores vacíos sean 0
-for col in ["Contract Monthly Price", "Contract Yearly Price"]:
-    if col in df_vendors.columns:
-        df_vendors[col] = df_vendors[col].astype(str).replace(r'[$,]', '', regex=True).replace('', '0').astype(float)
-
-
-df_vendors["Contract Yearly Price"] = df_vendors["Contract Yearly Price"].replace(r'[$,]', '', regex=True)
-df_vendors["Contract Yearly Price"] = pd.to_numeric(df_vendors["Contract Yearly Price"], errors="coerce").fillna(0)
-
-# Filtrar solo empleados Full-Time (Arkham Employee) y activos
-df_full_time = df_org[(df_org["Contract"] == "Arkham Employee") & (df_org["Status"].str.lower() == "active")]
-
-# Calcular métricas clave para Full-Time
-full_time_salary_total = df_full_time["Salary"].sum()
-full_time_monthly_salary_total = full_time_salary_total / 12
-full_time_headcount = df_full_time.shape[0]
-
-# Calcular métricas clave para Consultores
-df_consultant = df_org[df_org["Contract"].str.lower() == "consultants"]
-df_consultant_salary_total = df_consultant["Salary"].sum()
-df_consultant_monthly_total = df_consultant_salary_total / 12
-df_consultant_headcount = df_consultant.shape[0]
-
-# Calcular costos de vendors activos
-df_active_vendors = df_vendors[df_vendors["Status"].str.lower() == "active"]
-total_vendor_cost_yearly = df_active_vendors["Contract Yearly Price"].sum()
-total_vendor_cost_monthly = df_active_vendors["Contract Monthly Price"].sum()
-
-# Calcular costo de operaciones de cumplimiento
-total_compliance_operation_cost_yearly = full_time_salary_total + df_consultant_salary_total + total_vendor_cost_yearly
-total_compliance_operation_cost_monthly = total_compliance_operation_cost_yearly / 12
+kpis = metrics.cost_kpis(df_org, df_vendors)
 
 st.title("Compliance Operation Cost(s)")
+if len(entities) > 1:
+    st.caption(source.label)
+ui.data_health(source.key, df_org_raw, "cost_org")
+
+# 🔎 Filas de la búsqueda del sidebar (empleado, manager, título, departamento o vendor)
+if match is not None:
+    st.subheader(f"🔎 {match['Value']}")
+    rows = search.match_rows(match, {"org": df_org, "vendor": df_vendors})
+    st.dataframe(rows[tables.project(rows, EMPLOYEE_COLUMNS + ["Contract", "Status"] if match["Sheet"] == "org" else VENDOR_COLUMNS)],
+                 hide_index=True, use_container_width=True)
+    people = search.match_people(match, df_org_raw)
+    if len(people) == 1 and st.button("🌳 Show in org chart"):
+        ui.jump("pages/Compliance Org Structure.py", "org_search", people[0])
 
 col1, col2, col3, col4 = st.columns(4)
 
 # Row 1
 with col1:
-    st.metric("Total Salary (Yearly)", f"${full_time_salary_total:,.2f}")
+    st.metric("Total Salary (Yearly)", f"${kpis['full_time_salary']:,.2f}")
 with col2:
-    st.metric("Total Equity Allocated", f"${df_full_time['Equity'].sum():,.2f}")
+    st.metric("Total Equity Allocated", f"${kpis['full_time_equity']:,.2f}")
 with col3:
-    st.metric("Total Token Allocated", f"${df_full_time['Token'].sum():,.2f}")
+    st.metric("Total Token Allocated", f"${kpis['full_time_token']:,.2f}")
 with col4:
-    st.metric("Full-Time Head Count", f"{full_time_headcount}")
+    st.metric("Full-Time Head Count", f"{kpis['full_time_headcount']}")
 
 # Row 2
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("Total Salary (Monthly)", f"${full_time_monthly_salary_total:,.2f}")
+    st.metric("Total Salary (Monthly)", f"${kpis['full_time_monthly_salary']:,.2f}")
 with col2:
-    st.metric("Average Salary", f"${df_full_time['Salary'].mean():,.2f}")
+    st.metric("Average Salary", f"${kpis['full_time_avg_salary']:,.2f}")
 with col3:
-    st.metric("Average Equity Allocation", f"${df_full_time['Equity'].mean():,.2f}")
+    st.metric("Average Equity Allocation", f"${kpis['full_time_avg_equity']:,.2f}")
 with col4:
-    st.metric("Average Token Allocation", f"${df_full_time['Token'].mean():,.2f}")
+    st.metric("Average Token Allocation", f"${kpis['full_time_avg_token']:,.2f}")
 
 # Row 3
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("Consultant Cost (Yearly)", f"${df_consultant_salary_total:,.2f}")
+    st.metric("Consultant Cost (Yearly)", f"${kpis['consultant_salary']:,.2f}")
 with col2:
-    st.metric("Total Consultant Cost (Monthly)", f"${df_consultant_monthly_total:,.2f}")
+    st.metric("Total Consultant Cost (Monthly)", f"${kpis['consultant_monthly']:,.2f}")
 with col3:
-    st.metric("Total Vendor Cost (Yearly)", f"${total_vendor_cost_yearly:,.2f}")
+    st.metric("Total Vendor Cost (Yearly)", f"${kpis['vendor_yearly']:,.2f}")
 with col4:
-    st.metric("Total Vendor Cost (Monthly)", f"${total_vendor_cost_monthly:,.2f}")
+    st.metric("Total Vendor Cost (Monthly)", f"${kpis['vendor_monthly']:,.2f}")
 
 # Row 4
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("Consultant Head Count", f"{df_consultant_headcount}")
+    st.metric("Consultant Head Count", f"{kpis['consultant_headcount']}")
 with col2:
-    st.metric("Compliance Operations Cost (Yearly)", f"${total_compliance_operation_cost_yearly:,.2f}")
+    st.metric("Compliance Operations Cost (Yearly)", f"${kpis['operation_yearly']:,.2f}")
 with col3:
-    st.metric("Compliance Operations Cost (Monthly)", f"${total_compliance_operation_cost_monthly:,.2f}")
+    st.metric("Compliance Operations Cost (Monthly)", f"${kpis['operation_monthly']:,.2f}")
 with col4:
     st.empty()
 
+# 🌐 Consolidado de las entidades que cargaron
+if len(loaded) > 1:
+    kpis_by_entity = {entity.key: entity_kpis(entity.key, sheets[entity.key]["org"], sheets[entity.key]["vendor"]) for entity in loaded}
+    consolidated = metrics.consolidate_kpis(list(kpis_by_entity.values()))
+
+    st.subheader("🌐 Consolidated (All Entities)" if len(loaded) == len(entities) else f"🌐 Consolidated ({len(loaded)} of {len(entities)} Entities)")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Salary (Yearly)", f"${consolidated['full_time_salary']:,.2f}")
+    with col2:
+        st.metric("Full-Time Head Count", f"{consolidated['full_time_headcount']}")
+    with col3:
+        st.metric("Consultant Head Count", f"{consolidated['consultant_headcount']}")
+    with col4:
+        st.metric("Compliance Operations Cost (Yearly)", f"${consolidated['operation_yearly']:,.2f}")
+
+    st.dataframe(
+        [
+            {
+                "Entity": entity.label,
+                "Full-Time Head Count": kpis_by_entity[entity.key]["full_time_headcount"],
+                "Total Salary (Yearly)": kpis_by_entity[entity.key]["full_time_salary"],
+                "Consultant Cost (Yearly)": kpis_by_entity[entity.key]["consultant_salary"],
+                "Vendor Cost (Yearly)": kpis_by_entity[entity.key]["vendor_yearly"],
+                "Operations Cost (Yearly)": kpis_by_entity[entity.key]["operation_yearly"],
+            }
+            for entity in loaded
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+
 
 # -------------------------
 # Visualizaciones
 # -------------------------
-st.plotly_chart(px.bar(df_filtered, x="Department", y="Total Cost", title="Total Cost by Department", color="Department"))
-fig_pie = px.pie(df_filtered, names="Position", values="Total Cost", title="Total Cost by Position", hole=0.3, template="plotly_white")
-fig_pie.update_traces(textinfo='percent+label', pull=[0.1 if i == max(df_filtered["Total Cost"]) else 0 for i in df_filtered["Total Cost"]])
-st.plotly_chart(fig_pie)
+if df_filtered.empty:
+    st.info("ℹ️ No employees match the selected filters. Select at least one department, state and position to see the charts.")
+else:
+    dist = cost_distributions(df_active, selected_department, selected_state, selected_job_level)
 
-# Mostrar tabla de empleados cuando se filtra por gráfico o sidebar
-if len(selected_job_level) == 1:
-    st.subheader(f"Employees in {selected_job_level[0]} Level")
-    df_filtered_by_level = df_filtered[df_filtered["Position"] == selected_job_level[0]]
-    st.dataframe(df_filtered_by_level[['Compliance Employee', 'Title', 'Department', 'Position', 'Salary', 'Equity', 'Token', 'Total Cost']])
+    st.plotly_chart(px.bar(dist["cost_by_department"], x="Department", y="Total Cost", title="Total Cost by Department", color="Department"))
+    df_cost_by_position = dist["cost_by_position"]
+    fig_pie = px.pie(df_cost_by_position, names="Position", values="Total Cost", title="Total Cost by Position", hole=0.3, template="plotly_white")
+    fig_pie.update_traces(textinfo='percent+label', pull=[0.1 if i == df_cost_by_position["Total Cost"].max() else 0 for i in df_cost_by_position["Total Cost"]])
+    st.plotly_chart(fig_pie)
 
+    # Mostrar tabla de empleados cuando se filtra por gráfico o sidebar
+    if len(selected_job_level) == 1:
+        st.subheader(f"Employees in {selected_job_level[0]} Level")
+        df_filtered_by_level = df_filtered[df_filtered["Position"] == selected_job_level[0]]
+        ui.paginated_table(df_filtered_by_level, "level_employees", EMPLOYEE_COLUMNS)
 
-# -------------------------
-# Tabla con la Información de Empleados
-# -------------------------
-st.subheader("Employee Details")
-col_details, col_chart = st.columns(2)
 
-with col_details:
-    st.dataframe(df_filtered[['Compliance Employee', 'Title', 'Department', 'Position', 'Salary', 'Equity', 'Token', 'Total Cost']])
+    # -------------------------
+    # Tabla con la Información de Empleados
+    # -------------------------
+    st.subheader("Employee Details")
+    col_details, col_chart = st.columns(2)
 
-with col_chart:
-    st.plotly_chart(px.box(df_filtered, x='Position', y='Total Cost', title="Total Cost Distribution by Position", color='Position', template="plotly_white"))
+    with col_details:
+        ui.paginated_table(df_filtered, "employee_details", EMPLOYEE_COLUMNS)
 
+    with col_chart:
+        st.plotly_chart(charts.box_figure(dist["cost_box"], dist["cost_outliers"], 'Position', 'Total Cost', "Total Cost Distribution by Position"))
 
-# -------------------------
-# Crear Rangos de Equity y Tokens
-# -------------------------
-bins = [0, 10000, 20000, 30000, 40000, 50000, np.inf]
-labels = ["0-10K", "10K-20K", "20K-30K", "30K-40K", "40K-50K", "50K+"]
 
-df_filtered['Equity Range'] = pd.cut(df_filtered['Equity'], bins=bins, labels=labels, right=False)
-df_filtered['Token Range'] = pd.cut(df_filtered['Token'], bins=bins, labels=labels, right=False)
+    # -------------------------
+    # Rangos de Equity y Tokens
+    # -------------------------
+    col5, col6 = st.columns(2)
 
-# Visualización de Rangos de Equity y Tokens
-col5, col6 = st.columns(2)
+    with col5:
+        df_equity_range = dist["equity_ranges"].rename(columns={"Range": "Equity Range"})
+        st.plotly_chart(px.bar(df_equity_range, x='Equity Range', y='Employee Count', title="📊 Employees per Equity Range", color='Equity Range', text='Employee Count', template="plotly_white"))
 
-with col5:
-    df_equity_range = df_filtered.groupby('Equity Range', as_index=False).size().rename(columns={'size': 'Employee Count'})
-    st.plotly_chart(px.bar(df_equity_range, x='Equity Range', y='Employee Count', title="📊 Employees per Equity Range", color='Equity Range', text='Employee Count', template="plotly_white"))
+    with col6:
+        df_token_range = dist["token_ranges"].rename(columns={"Range": "Token Range"})
+        st.plotly_chart(px.pie(df_token_range, names='Token Range', values='Employee Count', title="🍩 Token Distribution by Range", hole=0.3, template="plotly_white"))
 
-with col6:
-    df_token_range = df_filtered.groupby('Token Range', as_index=False).size().rename(columns={'size': 'Employee Count'})
-    st.plotly_chart(px.pie(df_token_range, names='Token Range', values='Employee Count', title="🍩 Token Distribution by Range", hole=0.3, template="plotly_white"))
+    # -------------------------
+    # Total Tokens y Equity por Departamento
+    # -------------------------
+    df_tokens_equity_department = dist["token_equity_by_department"]
+    st.plotly_chart(px.bar(df_tokens_equity_department, x='Department', y=['Token', 'Equity'], title="🏢 Total Token and Equity Granted per Department", barmode='group', text_auto=True, template="plotly_white"))
 
-# -------------------------
-# Total Tokens y Equity por Departamento
-# -------------------------
-df_tokens_equity_department = df_filtered.groupby('Department', as_index=False)[['Token', 'Equity']].sum()
-st.plotly_chart(px.bar(df_tokens_equity_department, x='Department', y=['Token', 'Equity'], title="🏢 Total Token and Equity Granted per Department", barmode='group', text_auto=True, template="plotly_white"))
 
+    # -------------------------
+    # Pay Bands Visualization
+    # -------------------------
+    st.subheader("Pay Bands by Department")
 
-# -------------------------
-# Pay Bands Visualization
-# -------------------------
-st.subheader("Pay Bands by Department")
-
-if "Department" in df_filtered.columns and "Salary" in df_filtered.columns:
-    fig_pay_bands = px.box(
-        df_filtered, 
-        x='Department', 
-        y='Salary', 
-        title="Salary Distribution by Department", 
-        color='Department', 
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_pay_bands)
-else:
-    st.write("ℹ️ No data available for Salary Distribution by Department.")
+    if not dist["salary_box"].empty:
+        fig_pay_bands = charts.box_figure(dist["salary_box"], dist["salary_outliers"], 'Department', 'Salary', "Salary Distribution by Department")
+        st.plotly_chart(fig_pay_bands)
+    else:
+        st.write("ℹ️ No data available for Salary Distribution by Department.")
 
 
 
@@ -303,39 +273,34 @@ st.subheader("📊 Compliance Open Positions")
 with st.sidebar.expander("💰 Budget Filters", expanded=False):
     budget_input = st.number_input("Enter the Estimated Annual Budget ($)", min_value=0, value=10000000, step=100000)
 
-# Calcular el salario total de posiciones abiertas si aún no está definido
-df_open_position_salary_total = df_org[df_org["Status"].str.lower() == "open position"]["Salary"].sum()
-df_active_salary_total = df_org[df_org["Status"].str.lower() == "active"]["Salary"].sum()
-df_offer_stage_salary_total = df_org[df_org["Status"].str.lower() == "offer stage"]["Salary"].sum()
-
-total_with_hires = df_active_salary_total + df_open_position_salary_total + df_offer_stage_salary_total
+scenario = metrics.budget_scenarios(df_org, df_filtered.shape[0], budget_input)
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("Open Positions #", f"{df_org[df_org['Status'].str.lower() == 'open position'].shape[0]}")
+    st.metric("Open Positions #", f"{scenario['open_count']}")
 
 with col2:
-    st.metric("Total Anticipated Employees", f"{df_filtered.shape[0] + df_org[df_org['Status'].str.lower() == 'open position'].shape[0]}")
+    st.metric("Total Anticipated Employees", f"{scenario['anticipated_employees']}")
 
 with col3:
-    st.metric("Open Position Salary (Yearly)", f"${df_open_position_salary_total:,.2f}")
+    st.metric("Open Position Salary (Yearly)", f"${scenario['open_salary']:,.2f}")
 
 col4, col5, col6 = st.columns(3)
 
 with col4:
-    st.metric("Open Position Salary (Monthly)", f"${df_open_position_salary_total / 12:,.2f}")
+    st.metric("Open Position Salary (Monthly)", f"${scenario['open_monthly']:,.2f}")
 
 with col5:
-    st.metric("Total Monthly (Actual + Open)", f"${(df_active_salary_total + df_open_position_salary_total) / 12:,.2f}")
+    st.metric("Total Monthly (Actual + Open)", f"${scenario['actual_plus_open_monthly']:,.2f}")
 
 with col6:
-    st.metric("Total Yearly (Actual + Open)", f"${df_active_salary_total + df_open_position_salary_total:,.2f}")
+    st.metric("Total Yearly (Actual + Open)", f"${scenario['actual_plus_open']:,.2f}")
 
 # Crear gráfico de barras comparando los diferentes escenarios
 fig_budget_comparison = px.bar(
     x=["Current Salary Usage", "Projected with Hires", "Budget"],
-    y=[df_active_salary_total, total_with_hires, budget_input],
+    y=[scenario['active_salary'], scenario['total_with_hires'], budget_input],
     title="Budget Scenario Comparison",
     labels={"x": "Scenario", "y": "Total Salary ($)"},
     template="plotly_white",
@@ -348,31 +313,19 @@ st.plotly_chart(fig_budget_comparison)
 # Vendor Cost Analysis
 # -------------------------
 st.subheader("Compliance Vendor Cost(s)")
+ui.data_health(source.key, df_vendors_raw, "cost_vendors", "vendor")
 
-# Convertir precios a formato numérico
-df_vendors["Contract Monthly Price"] = df_vendors["Contract Monthly Price"].replace(r'[$,]', '', regex=True).astype(float)
-df_vendors["Contract Yearly Price"] = df_vendors["Contract Yearly Price"].replace(r'[$,]', '', regex=True).astype(float)
-
-# Filtrar solo vendors activos para métricas clave
-df_active_vendors = df_vendors[df_vendors["Status"].str.lower() == "active"]
-df_vendors["Contract Yearly Price"] = df_vendors["Contract Yearly Price"].replace(r'[$,]', '', regex=True).astype(float)
-
-# Filtrar solo vendors activos
-df_active_vendors = df_vendors[df_vendors["Status"].str.lower() == "active"]
-
-# Calcular métricas clave
-total_yearly_cost = df_active_vendors["Contract Yearly Price"].sum()
-total_monthly_cost = df_active_vendors["Contract Monthly Price"].sum()
-num_vendors = df_active_vendors.shape[0]
+vendors = metrics.vendor_kpis(df_vendors)
+df_active_vendors = metrics.active_vendors(df_vendors)
 
 # Mostrar métricas clave
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.metric("Total Yearly Vendor Cost", f"${total_yearly_cost:,.2f}")
+    st.metric("Total Yearly Vendor Cost", f"${vendors['yearly']:,.2f}")
 with col2:
-    st.metric("Total Monthly Vendor Cost", f"${total_monthly_cost:,.2f}")
+    st.metric("Total Monthly Vendor Cost", f"${vendors['monthly']:,.2f}")
 with col3:
-    st.metric("Number of Active Vendors", num_vendors)
+    st.metric("Number of Active Vendors", vendors['count'])
 
 # Gráficos
 fig_vendor_cost = px.bar(df_active_vendors, x="Vendor Name", y="Contract Yearly Price", title="Yearly Cost per Vendor",
@@ -387,5 +340,4 @@ with col_chart:
 
 with col_table:
     st.subheader("📜 Vendor Details")
-    st.dataframe(df_vendors[["Status", "Vendor Name", "Vendor Contact Name", "Vendor Email", "Contract Duration", "Contract Monthly Price", "Contract Yearly Price"]])
-
+    ui.paginated_table(df_vendors, "vendor_details", VENDOR_COLUMNS)
@@ -0,0 +1,40 @@
+import streamlit as st
+
+from compliance import quality, ui
+
+ui.warm_up()
+
+# 📂 Hojas completas de la entidad elegida: se validan todas las columnas, no solo las de cada página
+source = ui.source()
+try:
+    df_org, df_vendors = ui.worksheets({source.org_worksheet: None, source.vendor_worksheet: None}, source.sheet_id)
+except Exception as e:
+    st.error(f"⚠️ Error loading sheets: {e}")
+    st.stop()
+
+st.title("🩺 Data Health")
+st.caption(f"{source.label} · rule-based checks on the current snapshot. Row numbers match Google Sheets.")
+
+# 📊 Resumen por hoja
+results = {
+    source.org_worksheet: ui.findings(source.key, df_org, "org"),
+    source.vendor_worksheet: ui.findings(source.key, df_vendors, "vendor"),
+}
+for column, (sheet_name, findings) in zip(st.columns(len(results)), results.items()):
+    counts = quality.severity_counts(findings)
+    column.metric(sheet_name, f"{counts['error']} errors", f"{counts['warning']} warnings, {counts['info']} notes", delta_color="off")
+
+# 📋 Detalle por hoja, filtrable por severidad y regla
+for sheet_name, findings in results.items():
+    st.subheader(sheet_name)
+    if findings.empty:
+        st.success("No issues found.")
+        continue
+    st.dataframe(quality.summary(findings), hide_index=True, use_container_width=True)
+    key = "health_org" if sheet_name == source.org_worksheet else "health_vendors"
+    severities = st.multiselect("Severity", quality.SEVERITIES, default=quality.SEVERITIES, key=f"{key}_severity")
+    rules = st.multiselect("Rule", sorted(findings["Rule"].unique()), key=f"{key}_rules", placeholder="All rules")
+    selected = findings[findings["Severity"].isin(severities)]
+    if rules:
+        selected = selected[selected["Rule"].isin(rules)]
+    ui.paginated_table(selected, key, quality.FINDING_COLUMNS)
@@ -0,0 +1,74 @@
+import time
+
+import streamlit as st
+
+from compliance import jobs, reports, ui
+
+ui.warm_up()
+
+# 📂 Hojas completas del snapshot vigente de la entidad elegida (no se vuelve a pedir a Google)
+source = ui.source()
+try:
+    df_org, df_vendors = ui.worksheets({source.org_worksheet: None, source.vendor_worksheet: None}, source.sheet_id)
+except Exception as e:
+    st.error(f"⚠️ Error loading sheets: {e}")
+    st.stop()
+
+st.title("📤 Reports")
+st.caption(f"{source.label} · KPIs, vendors, hiring pipeline and org rollup from the current snapshot.")
+
+# 🧾 Pedir un reporte: se genera en segundo plano y la página sigue respondiendo
+fmt = st.radio("Format", list(reports.FORMATS), format_func=lambda key: reports.FORMATS[key][0], horizontal=True)
+if st.button("Generate report", type="primary"):
+    name = f"compliance-{source.key}-{time.strftime('%Y-%m')}"
+    try:
+        job_id = ui.export_jobs().submit(fmt, df_org, df_vendors, name, f"Compliance Report · {source.label}")
+    except jobs.QueueFull:
+        st.warning("⏳ Too many reports are being generated right now. Please try again in a minute.")
+    else:
+        st.session_state.setdefault("export_jobs", []).insert(0, job_id)
+
+
+def job_statuses():
+    statuses = [ui.export_jobs().status(job_id) for job_id in st.session_state.get("export_jobs", [])]
+    return [status for status in statuses if status is not None]
+
+
+def running(statuses):
+    return any(status["state"] == "running" for status in statuses)
+
+
+def expired(label, status):
+    st.caption(f"⌛ {label} · {status['file_name']} expired. Generate it again to download it.")
+
+
+# 🔁 Estado de los reportes de esta sesión: el fragmento se refresca solo mientras alguno corre y,
+# al terminar el último, vuelve a dibujar la página para dejar de consultar
+def export_status(polling):
+    statuses = job_statuses()
+    if polling and not running(statuses):
+        st.rerun()
+    if not statuses:
+        st.caption("No reports yet.")
+        return
+    for status in statuses:
+        label = reports.FORMATS[status["format"]][0]
+        if status["state"] == "running":
+            st.info(f"⏳ {label} · {status['file_name']} · running for {status['elapsed']:.0f} s")
+        elif status["state"] == "failed":
+            st.error(f"⚠️ {label} · {status['file_name']} failed: {status['error']}")
+        elif status["state"] == "done":
+            try:
+                # El archivo pudo vencer entre status() y la lectura
+                with open(status["path"], "rb") as f:
+                    st.download_button(f"⬇️ {status['file_name']} ({status['size'] / 1024:,.0f} KB)", f, file_name=status["file_name"],
+                                       mime=status["mime"], key=f"download_{status['id']}", on_click="ignore")
+            except FileNotFoundError:
+                expired(label, status)
+        else:
+            expired(label, status)
+
+
+st.subheader("Your reports")
+polling = running(job_statuses())
+st.fragment(export_status, run_every=2 if polling else None)(polling)
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# compliance/ y los servidores falsos de benchmarks/ (fake_sheets, fake_geocoder...)
+sys.path[:0] = [str(ROOT), str(ROOT / "benchmarks")]
+
+from compliance import shared
+
+
+# ⏱️ Reloj manual: las pruebas avanzan clock.now (o duermen con clock.sleep) en vez de esperar
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+# 🧹 Store compartido vacío en memoria; al terminar la prueba se deja otro vacío para la siguiente
+@pytest.fixture
+def store():
+    shared.use(shared.MemoryBackend())
+    yield shared.store()
+    shared.use(shared.MemoryBackend())
+
+
+# Store con el reloj de la prueba y TTL de 60 s: vencer un snapshot es avanzar clock.now
+@pytest.fixture
+def timed_store(clock):
+    shared.use(shared.MemoryBackend(clock=clock), ttl=60, clock=clock)
+    yield shared.store()
+    shared.use(shared.MemoryBackend())
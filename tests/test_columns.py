@@ -0,0 +1,94 @@
+import pytest
+
+from compliance import data, pages
+from compliance.sheets import SheetsClient, column_ranges, columns_to_frame
+from compliance.singleflight import SingleFlight
+from fake_sheets import FakeSheetsServer, values_from_records
+
+RECORDS = [
+    {"Compliance Employee": "Ana", "Title": "Analyst", "Status": "Active", "Salary": "90,000"},
+    {"Compliance Employee": "Luis", "Title": "Lead", "Status": "", "Salary": "80000"},
+]
+
+
+@pytest.fixture(scope="module")
+def fake_sheets():
+    with FakeSheetsServer({}) as server:
+        yield server
+
+
+@pytest.fixture
+def server(fake_sheets, monkeypatch):
+    fake_sheets.reset()
+    fake_sheets.set_records("Org", RECORDS)
+    monkeypatch.setattr(data, "headers", {})
+    monkeypatch.setattr(data, "absent", {})
+    return fake_sheets
+
+
+@pytest.fixture
+def client(server):
+    return SheetsClient(base_url=server.base_url)
+
+
+def batch_gets(server):
+    return sum(path.endswith(":batchGet") for path in server.requests)
+
+
+def test_column_ranges_merge_contiguous_columns():
+    assert column_ranges([5, 0, 1, 2, 27, 1]) == ["A:C", "F:F", "AB:AB"]
+    assert column_ranges([]) == []
+
+
+def test_columns_to_frame_pads_trimmed_columns():
+    df = columns_to_frame([["Name", "Ana", "Luis"], ["Salary", "90,000"]])
+    assert df.to_dict("list") == {"Name": ["Ana", "Luis"], "Salary": [90000, ""]}
+    assert columns_to_frame([]).empty
+
+
+def test_column_indexes_ignore_case_and_spaces():
+    indexes, missing = data.column_indexes(["Name", "Title", "Salary"], [" salary", "NAME", "company"])
+    assert indexes == [0, 2] and missing == {"company"}
+
+
+def test_reads_only_declared_columns(server, client):
+    df = data.fetch_worksheet(client, "Org", "sheet", ["Salary", "Compliance Employee"])
+    # En el orden de la hoja, con un único batchGet después del encabezado
+    assert df.to_dict("list") == {"Compliance Employee": ["Ana", "Luis"], "Salary": [90000, 80000]}
+    assert len(server.requests) == 2 and batch_gets(server) == 1
+
+
+def test_moved_columns_refresh_the_header(server, client):
+    data.fetch_worksheet(client, "Org", "sheet", ["Title", "Salary"])
+    server.set_records("Org", [{"Salary": r["Salary"], "Compliance Employee": r["Compliance Employee"], "Title": r["Title"]} for r in RECORDS])
+    server.reset()
+    df = data.fetch_worksheet(client, "Org", "sheet", ["Title", "Salary"])
+    assert df.to_dict("list") == {"Salary": [90000, 80000], "Title": ["Analyst", "Lead"]}
+    # Lectura con el encabezado viejo, encabezado nuevo y lectura otra vez
+    assert len(server.requests) == 3 and batch_gets(server) == 2
+
+
+def test_missing_columns_are_checked_once_per_header(server, client):
+    columns = ["Compliance Employee", "Offer Status"]
+    df = data.fetch_worksheet(client, "Org", "sheet", columns)
+    assert list(df.columns) == ["Compliance Employee"]
+    assert len(server.requests) == 3
+    server.reset()
+    data.fetch_worksheet(client, "Org", "sheet", columns)
+    assert server.requests == ["/v4/spreadsheets/sheet/values:batchGet"]
+
+
+def test_change_notification_picks_up_new_columns(server, client, store, monkeypatch):
+    monkeypatch.setattr(data, "worksheet_flights", SingleFlight())
+    monkeypatch.setattr(data, "loaded", set())
+    columns = ["Compliance Employee", "Offer Status"]
+    assert "Offer Status" not in data.load_worksheet(client, "Org", "sheet", columns)
+    server.set_records("Org", [{**record, "Offer Status": "Accepted"} for record in RECORDS])
+    assert data.refresh_changed(client, "sheet") == {"Org"}
+    assert data.load_worksheet(client, "Org", "sheet", columns)["Offer Status"].tolist() == ["Accepted", "Accepted"]
+
+
+def test_page_sheets_are_warmed_once_per_column_set():
+    requests = pages.sheet_columns()
+    assert len(requests) == len(set(requests))
+    assert ("org", tuple(pages.COST_BREAKDOWN["org"])) in requests and ("vendor", None) in requests
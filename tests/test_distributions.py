@@ -0,0 +1,25 @@
+import pandas as pd
+
+from compliance import distributions
+
+
+def test_box_stats_empty_frame():
+    df = pd.DataFrame({"Department": pd.Series(dtype=str), "Salary": pd.Series(dtype=float)})
+    stats, outliers = distributions.box_stats(df, "Department", "Salary")
+    assert stats.empty and list(stats.columns) == ["Department", *distributions.BOX_COLUMNS]
+    assert outliers.empty
+
+
+def test_box_stats_fences_and_outliers():
+    df = pd.DataFrame({"Department": ["A"] * 5 + ["B"] * 2, "Salary": [10, 11, 12, 13, 100, 5, 7]})
+    stats, outliers = distributions.box_stats(df, "Department", "Salary")
+    a = stats.set_index("Department").loc["A"]
+    assert a["count"] == 5 and a["upperfence"] == 13
+    assert outliers["Salary"].tolist() == [100]
+
+
+def test_cost_distributions_with_no_rows():
+    columns = ["Department", "Position", "Salary", "Equity", "Token", "Total Cost"]
+    dist = distributions.cost_distributions(pd.DataFrame(columns=columns), *[distributions.quantile_edges(pd.Series(dtype=float))] * 2)
+    assert dist["cost_box"].empty and dist["salary_box"].empty
+    assert dist["equity_ranges"]["Employee Count"].sum() == 0
@@ -0,0 +1,41 @@
+import pytest
+
+from compliance import data, ui
+from compliance.singleflight import SingleFlight
+from compliance.sources import Source
+from fake_sheets import FakeSheetsServer, values_from_records
+
+ROLES = {"org": ["Compliance Employee", "Salary"], "vendor": None}
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    worksheets = {
+        "Org": values_from_records([{"Compliance Employee": "Ana", "Salary": "1"}]),
+        "Vendors": values_from_records([{"Vendor Name": "Acme"}]),
+        "EU Org": values_from_records([{"Compliance Employee": "Luis", "Salary": "2"}]),
+    }
+    with FakeSheetsServer(worksheets) as server:
+        client = data.get_client(base_url=server.base_url)
+        monkeypatch.setattr(data, "worksheet_flights", SingleFlight())
+        monkeypatch.setattr(ui, "get_client", lambda: client)
+        ui.load_snapshot.clear()
+        yield client
+
+
+def test_failing_entity_does_not_stop_the_others(client):
+    entities = [
+        Source("global", org_worksheet="Org", vendor_worksheet="Vendors"),
+        # Hoja de vendors mal configurada
+        Source("eu", sheet_id="<spreadsheet id>", org_worksheet="EU Org", vendor_worksheet="EU Vendors"),
+    ]
+    sheets, failed = ui.source_worksheets(entities, ROLES)
+    assert list(sheets) == ["global"] and list(failed) == ["eu"]
+    assert sheets["global"]["org"]["Compliance Employee"].tolist() == ["Ana"]
+    assert "400" in str(failed["eu"])
+
+
+def test_all_entities_loaded(client):
+    entities = [Source("a", org_worksheet="Org", vendor_worksheet="Vendors"), Source("b", org_worksheet="EU Org", vendor_worksheet="Vendors")]
+    sheets, failed = ui.source_worksheets(entities, ROLES)
+    assert failed == {} and sheets["b"]["org"]["Salary"].tolist() == [2]
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from compliance import geo, metrics
+
+PEOPLE = pd.DataFrame({
+    "Country": ["US", "US", "US", "AR", "AR", "AR"],
+    "State": ["New York", "New York", "New Jersey", "Buenos Aires", "Buenos Aires", "Cordoba"],
+    "Department": ["KYC", "AML", "KYC", "KYC", "AML", None],
+    "lat": [40.71, 40.71, 40.06, -34.60, -34.60, -31.42],
+    "lon": [-74.00, -74.00, -74.41, -58.38, -58.38, -64.18],
+    "Salary": [100.0, 120.0, 90.0, 50.0, 60.0, 40.0],
+    "Equity": [10.0, 0.0, 5.0, 0.0, 0.0, None],
+    "Token": [0.0, 1.0, 0.0, 2.0, 0.0, 0.0],
+})
+
+
+def _cells(cells):
+    return cells.sort_values(["Zoom", "Label"]).reset_index(drop=True)
+
+
+def test_filtered_parts_match_clustering_the_filtered_frame():
+    parts = geo.clusters(PEOPLE)
+    for country, state, departments in [("All", "All", None), ("US", "All", None), ("AR", "Buenos Aires", ["AML"]), ("All", "All", ["KYC"])]:
+        expected = geo.cluster_cells(geo.clusters(metrics.filter_team(PEOPLE, country, state, departments)))
+        actual = geo.cluster_cells(metrics.filter_team(parts, country, state, departments))
+        pd.testing.assert_frame_equal(_cells(actual), _cells(expected), check_dtype=False)
+
+
+def test_cells_merge_locations_at_low_zoom():
+    cells = geo.cluster_cells(geo.clusters(PEOPLE), zoom=0)
+    us = cells[cells["Label"].str.startswith("New York")].iloc[0]
+    assert us["Headcount"] == 3 and us["Locations"] == 2 and us["Label"] == "New York, US +1 more"
+    assert us["Cost"] == 326.0
+    assert cells["Headcount"].sum() == len(PEOPLE)
+
+
+def test_empty_selection():
+    parts = geo.clusters(PEOPLE)
+    assert list(geo.cluster_cells(metrics.filter_team(parts, "CL")).columns) == geo.CLUSTER_COLUMNS
+    assert geo.clusters(PEOPLE.iloc[:0]).empty
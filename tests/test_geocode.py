@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from compliance import aio, geo, shared
+from compliance.singleflight import SingleFlight
+from fake_geocoder import FakeGeocoder
+
+LOCATIONS = [("USA", "Texas"), ("USA", "Ohio"), ("Spain", "Madrid"), ("Chile", "Santiago")]
+INTERVAL = 0.2
+
+
+@pytest.fixture(scope="module")
+def nominatim():
+    with FakeGeocoder(latency=0.05) as server:
+        yield server
+
+
+# A mitad de un turno fino: la primera reserva espera 0.05 s
+@pytest.fixture
+def clock(clock):
+    clock.now += 0.05
+    return clock
+
+
+@pytest.fixture
+def lookup(nominatim, store, monkeypatch):
+    nominatim.requests.clear()
+    monkeypatch.setattr(aio, "geocode_flights", SingleFlight())
+    geolocator = geo.geocoders.Nominatim(user_agent=geo.USER_AGENT, domain=nominatim.base_url.split("://")[1], scheme="http", timeout=10)
+    return lambda country, state: geo.lookup(country, state, geolocator)
+
+
+def gaps(started):
+    started = sorted(started)
+    return [b - a for a, b in zip(started, started[1:])]
+
+
+def test_limit_holds_across_concurrent_sessions(nominatim, lookup):
+    limiter = aio.SharedRateLimiter("test", INTERVAL)
+    results = []
+
+    # Dos sesiones (cada una con su propio event loop) piden las mismas ubicaciones a la vez
+    def session():
+        results.append(aio.run(aio.geocode_many(LOCATIONS, lookup=lookup, limiter=limiter)))
+
+    threads = [threading.Thread(target=session) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Una consulta por ubicación (single flight) y nunca dos en el mismo turno
+    assert sorted(query for _, query in nominatim.requests) == sorted(f"{state}, {country}" for country, state in LOCATIONS)
+    assert min(gaps(nominatim.started_at())) >= INTERVAL - 0.02
+    assert results[0] == results[1]
+    assert all(lat is not None for lat, _ in results[0].values())
+
+
+def test_cached_locations_skip_the_service(nominatim, lookup):
+    limiter = aio.SharedRateLimiter("test", INTERVAL)
+    first = aio.run(aio.geocode_many(LOCATIONS[:2], lookup=lookup, limiter=limiter))
+    nominatim.requests.clear()
+    again = aio.run(aio.geocode_many(LOCATIONS[:2], lookup=lookup, limiter=limiter))
+    assert again == first and nominatim.requests == []
+    assert geo.cached("USA", "Texas") == first[("USA", "Texas")]
+
+
+def test_failed_lookups_are_not_cached(lookup):
+    def broken(country, state):
+        raise ConnectionError("offline")
+
+    limiter = aio.SharedRateLimiter("test", INTERVAL)
+    assert aio.run(aio.geocode_many([("USA", "Texas")], lookup=broken, limiter=limiter)) == {("USA", "Texas"): (None, None)}
+    assert geo.cached("USA", "Texas") is None
+
+
+def test_replicas_share_slots_through_the_store(tmp_path, clock):
+    backend = shared.FileBackend(tmp_path, clock=clock)
+    # Dos réplicas con su propio limitador sobre el mismo volumen
+    replicas = [aio.SharedRateLimiter("nominatim", 1.0, backend, clock) for _ in range(2)]
+    delays = [replicas[i % 2].reserve() for i in range(4)]
+    assert delays == pytest.approx([0.05, 1.05, 2.05, 3.05])
+
+    # Pasada la cola, la próxima consulta casi no espera
+    clock.now += 10
+    assert replicas[0].reserve() == pytest.approx(0.05)
+
+
+def test_reservation_keeps_distance_from_neighbours(clock):
+    backend = shared.MemoryBackend(clock=clock)
+    limiter = aio.SharedRateLimiter("nominatim", 1.0, backend, clock)
+    # Otra réplica ya tiene un turno 0.45 s más adelante: el nuestro queda un intervalo después de ese
+    backend.add("ratelimit:nominatim:10005", b"1", ttl=5)
+    assert limiter.reserve() == pytest.approx(1.45)
@@ -0,0 +1,80 @@
+import operator
+import os
+import signal
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from compliance import jobs
+
+
+@pytest.fixture
+def pool():
+    pool = jobs.Pool(1, "test-jobs")
+    yield pool
+    pool.shutdown()
+
+
+def kill_worker(pool):
+    pid = pool.run(os.getpid)
+    os.kill(pid, signal.SIGKILL)
+    return pid
+
+
+def test_run_uses_a_worker_process(pool):
+    assert pool.run(os.getpid) != os.getpid()
+    assert pool.run(operator.add, 1, 2) == 3
+
+
+def test_run_recovers_after_a_worker_dies(pool):
+    pid = kill_worker(pool)
+    assert pool.run(operator.add, 2, 3) == 5
+    assert pool.run(os.getpid) not in (pid, os.getpid())
+
+
+def test_run_falls_back_inline_when_the_pool_keeps_breaking(pool, monkeypatch):
+    def broken(executor, fn, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(pool, "_submit", broken)
+    assert pool.run(os.getpid) == os.getpid()
+
+
+def test_background_recovers_after_a_worker_dies(pool):
+    kill_worker(pool)
+    assert pool.background(operator.mul, 3, 4).result(timeout=60) == 12
+
+
+def test_background_reports_job_errors(pool):
+    with pytest.raises(ZeroDivisionError):
+        pool.background(operator.truediv, 1, 0).result(timeout=60)
+
+
+def test_disabled_pool_runs_inline_and_in_a_thread():
+    pool = jobs.Pool(0)
+    assert pool.run(os.getpid) == os.getpid()
+    assert pool.background(os.getpid).result(timeout=10) == os.getpid()
+    pool.shutdown()
+
+
+def test_background_queue_is_bounded():
+    pool = jobs.Pool(0, "test-exports", max_pending=2)
+    release = threading.Event()
+    try:
+        running = [pool.background(release.wait, 10) for _ in range(2)]
+        with pytest.raises(jobs.QueueFull):
+            pool.background(os.getpid)
+        release.set()
+        for future in running:
+            future.result(timeout=10)
+        assert pool.pending == 0
+        assert pool.background(os.getpid).result(timeout=10) == os.getpid()
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_exports_have_their_own_pool():
+    assert jobs.exports is not jobs._pool
+    assert jobs.exports.max_pending == jobs.EXPORT_QUEUE
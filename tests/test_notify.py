@@ -0,0 +1,98 @@
+import functools
+import socket
+import time
+import types
+from urllib.error import HTTPError
+
+import pytest
+
+from compliance import data, notify, ui
+from compliance.singleflight import SingleFlight
+from fake_apps_script import drive_change, edit
+from fake_sheets import FakeSheetsServer, values_from_records
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def changes():
+    changes = []
+    with notify.ChangeReceiver(lambda *change: changes.append(change), port=0, token="secret", debounce=0.05) as receiver:
+        yield receiver, changes
+
+
+def test_receiver_debounces_edits(changes):
+    receiver, changes = changes
+    for _ in range(3):
+        assert edit(receiver.url, "Org", "sheet", token="secret") == 202
+    assert wait_for(lambda: changes)
+    time.sleep(0.1)
+    assert changes == [("sheet", "Org")] and receiver.received == 3
+
+
+def test_receiver_drive_channel_and_token(changes):
+    receiver, changes = changes
+    assert drive_change(receiver.url, "sheet", token="secret", state="sync") == 202
+    assert drive_change(receiver.url, "sheet", token="secret") == 202
+    with pytest.raises(HTTPError) as error:
+        edit(receiver.url, "Org", "sheet", token="wrong")
+    assert error.value.code == 403
+    assert wait_for(lambda: changes) and changes == [("sheet", None)]
+
+
+@pytest.fixture
+def notify_port(monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setattr(ui, "NOTIFY_HOST", "127.0.0.1")
+    monkeypatch.setattr(ui, "NOTIFY_PORT", port)
+    ui.change_receiver.clear()
+    yield port
+    receiver = ui.change_receiver()
+    if receiver is not None:
+        receiver.stop()
+    ui.change_receiver.clear()
+
+
+def test_busy_port_disables_notifications(notify_port, caplog):
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", notify_port))
+        busy.listen()
+        assert ui.change_receiver() is None
+    assert "Change notifications disabled" in caplog.text
+    # El resultado queda cacheado: las páginas no vuelven a fallar en cada rerun
+    assert ui.change_receiver() is None
+
+
+def test_edit_refreshes_sheet_and_reruns_watchers(notify_port, store, monkeypatch):
+    records = [{"Compliance Employee": "Ana", "Salary": "1"}]
+    with FakeSheetsServer({"Org": values_from_records(records)}) as sheets:
+        client = data.get_client(base_url=sheets.base_url)
+        monkeypatch.setattr(data, "worksheet_flights", SingleFlight())
+        monkeypatch.setattr(data, "loaded", set())
+        monkeypatch.setattr(ui, "get_client", lambda: client)
+        monkeypatch.setattr(ui, "notify", types.SimpleNamespace(ChangeReceiver=functools.partial(notify.ChangeReceiver, debounce=0.05)))
+        monkeypatch.setattr(ui, "_watchers", {("sheet", "Org"): {"s1"}})
+        reruns = []
+        monkeypatch.setattr(ui, "rerun_sessions", lambda sessions: reruns.append(set(sessions)) or set(sessions))
+        assert data.load_worksheet(client, "Org", "sheet")["Salary"].tolist() == [1]
+        receiver = ui.change_receiver()
+        sheets.set_records("Org", [{"Compliance Employee": "Ana", "Salary": "2"}])
+        assert edit(receiver.url, "Org", "sheet") == 202
+        assert wait_for(lambda: reruns)
+        assert reruns == [{"s1"}]
+        assert data.load_worksheet(client, "Org", "sheet")["Salary"].tolist() == [2]
+
+
+def test_watch_forgets_closed_sessions(monkeypatch):
+    monkeypatch.setattr(ui, "_watchers", {("sheet", "Org"): {"closed", "open"}, ("sheet", "Vendors"): {"closed"}})
+    monkeypatch.setattr(ui, "get_script_run_ctx", lambda: types.SimpleNamespace(session_id="new"))
+    monkeypatch.setattr(ui, "active_sessions", lambda: {"open", "new"})
+    ui.watch("Org", "sheet")
+    assert ui._watchers == {("sheet", "Org"): {"open", "new"}}
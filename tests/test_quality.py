@@ -0,0 +1,70 @@
+import pandas as pd
+
+from compliance import quality
+from compliance.org import HEAD_OF_COMPLIANCE
+
+
+def org(**overrides):
+    rows = {
+        "Compliance Employee": [HEAD_OF_COMPLIANCE, "Ana", "Luis", "Marta", "Ana"],
+        "Title": ["Head of Compliance", "Analyst", "Analyst", "Lead", "Analyst"],
+        "Direct Report": ["", HEAD_OF_COMPLIANCE, "Marta", "Luis", HEAD_OF_COMPLIANCE],
+        "Status": ["Active", "Active", "Actve", "Active", "Active"],
+        "Contract": ["Arkham Employee", "Arkham Employee", "arkham employee", "Arkham Employee", "Arkham Employee"],
+        "Salary": ["200000", "90000", "$80,000", "n/a?", "90000"],
+    }
+    rows.update(overrides)
+    return pd.DataFrame(rows)
+
+
+def rules(findings):
+    return set(findings["Rule"])
+
+
+def test_validate_org_findings():
+    findings = quality.validate(org())
+    assert list(findings.columns) == quality.FINDING_COLUMNS
+    assert {"Duplicate record", "Reporting cycle", "Unknown status", "Unknown contract", "Non-numeric amount"} <= rules(findings)
+
+    # Filas como en Google Sheets (encabezado = fila 1)
+    duplicate = findings[findings["Rule"] == "Duplicate record"]
+    assert duplicate["Row"].tolist() == [3, 6]
+    cycle = findings[findings["Rule"] == "Reporting cycle"]
+    assert set(cycle["Record"]) == {"Luis", "Marta"}
+    status = findings[findings["Rule"] == "Unknown status"]
+    assert "did you mean 'Active'" in status["Message"].iloc[0]
+
+
+def test_validate_orders_by_severity():
+    findings = quality.validate(org())
+    order = findings["Severity"].map(quality.SEVERITIES.index)
+    assert order.is_monotonic_increasing
+    assert quality.severity_counts(findings)["error"] == (findings["Severity"] == "error").sum()
+
+
+def test_validate_skips_rules_without_columns():
+    findings = quality.validate(org()[["Compliance Employee", "Status"]])
+    assert rules(findings) == {"Duplicate record", "Unknown status"}
+
+
+def test_validate_clean_sheet():
+    clean = org(**{
+        "Compliance Employee": [HEAD_OF_COMPLIANCE, "Ana", "Luis", "Marta", "Pablo"],
+        "Direct Report": ["", HEAD_OF_COMPLIANCE, HEAD_OF_COMPLIANCE, "Ana", "Ana"],
+        "Status": ["Active"] * 5,
+        "Contract": ["Arkham Employee"] * 5,
+        "Salary": ["200000", "90000", "80000", "70000", "75000"],
+    })
+    findings = quality.validate(clean)
+    assert findings.empty and list(findings.columns) == quality.FINDING_COLUMNS
+
+
+def test_validate_vendors():
+    vendors = pd.DataFrame({
+        "Vendor Name": ["Acme", "acme", "Globex"],
+        "Status": ["Active", "Active", "Paused"],
+        "Contract Monthly Price": ["100", "200", "abc"],
+        "Contract Yearly Price": ["1200", "2400", "3600"],
+    })
+    findings = quality.validate(vendors, "vendor")
+    assert rules(findings) == {"Duplicate record", "Unknown status", "Non-numeric amount"}
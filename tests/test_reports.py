@@ -0,0 +1,44 @@
+import zipfile
+
+import pytest
+
+from compliance import jobs, reports
+from compliance.config import ORG_WORKSHEET, VENDOR_WORKSHEET
+from fixtures import worksheet_frame
+
+
+@pytest.fixture
+def export_jobs(tmp_path):
+    pool = jobs.Pool(0, "test-exports", max_pending=1)
+    yield reports.ExportJobs(tmp_path, retention=60, pool=pool)
+    pool.shutdown()
+
+
+def wait(export_jobs, job_id):
+    future = export_jobs.status(job_id)["future"]
+    future.result(timeout=60)
+    return export_jobs.status(job_id)
+
+
+def test_export_runs_in_the_export_pool(export_jobs):
+    job_id = export_jobs.submit("csv", worksheet_frame(ORG_WORKSHEET, 50), worksheet_frame(VENDOR_WORKSHEET))
+    status = wait(export_jobs, job_id)
+    assert status["state"] == "done" and status["size"] > 0
+    with zipfile.ZipFile(status["path"]) as archive:
+        assert {"KPIs.csv", "Vendors.csv", "Hiring Pipeline.csv", "Org Rollup.csv"} == set(archive.namelist())
+    assert export_jobs.pool.pending == 0
+
+
+def test_deleted_file_shows_as_expired(export_jobs):
+    job_id = export_jobs.submit("csv", worksheet_frame(ORG_WORKSHEET, 20), worksheet_frame(VENDOR_WORKSHEET))
+    status = wait(export_jobs, job_id)
+    status["path"].unlink()
+    assert export_jobs.status(job_id)["state"] == "expired"
+
+
+def test_full_queue_rejects_exports(export_jobs):
+    df_org, df_vendors = worksheet_frame(ORG_WORKSHEET, 2000), worksheet_frame(VENDOR_WORKSHEET)
+    first = export_jobs.submit("pdf", df_org, df_vendors)
+    with pytest.raises(jobs.QueueFull):
+        export_jobs.submit("csv", df_org, df_vendors)
+    wait(export_jobs, first)
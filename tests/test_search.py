@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from compliance import search
+
+
+@pytest.fixture
+def frames():
+    org = pd.DataFrame({
+        "Compliance Employee": ["José Pérez", "Ana Gómez", "Luis Ortega", ""],
+        "Title": ["Head of Compliance", "KYC Analyst", "KYC Analyst", "AML Lead"],
+        "Direct Report": ["", "José Pérez", "José Pérez", "Ana Gómez"],
+        "Department": ["Compliance", "KYC", "KYC", "AML"],
+    })
+    vendors = pd.DataFrame({"Vendor Name": ["Chainalysis", "Sumsub"]})
+    return {"org": org, "vendor": vendors}
+
+
+def test_build_index_documents(frames):
+    index = search.build_index(frames)
+    documents = index.documents
+    # Un documento por valor distinto de cada campo; los managers que son empleados no se repiten
+    assert len(documents[documents["Field"] == "Direct Report"]) == 0
+    analyst = documents[documents["Value"] == "KYC Analyst"].iloc[0]
+    assert analyst["Rows"] == (1, 2)
+    assert set(documents["Sheet"]) == {"org", "vendor"}
+    assert "" not in set(documents["Value"])
+
+
+def test_search_is_fuzzy_and_accent_insensitive(frames):
+    index = search.build_index(frames)
+    best = index.search("jose perz").iloc[0]
+    assert (best["Value"], best["Field"]) == ("José Pérez", "Compliance Employee")
+    assert index.search("chainalisys").iloc[0]["Value"] == "Chainalysis"
+    assert index.search("kyc")["Value"].tolist()[:2] == ["KYC", "KYC Analyst"]
+
+
+def test_search_limits_and_empty_queries(frames):
+    index = search.build_index(frames)
+    assert list(index.search("").columns) == search.MATCH_COLUMNS
+    assert index.search("zzzz").empty
+    assert len(index.search("a", limit=2, min_score=0)) <= 2
+    scores = index.search("analyst")["Score"]
+    assert scores.is_monotonic_decreasing and scores.le(1).all()
+
+
+def test_match_people_and_rows(frames):
+    index = search.build_index(frames)
+    title = index.search("kyc analyst").iloc[0]
+    assert search.match_people(title, frames["org"]) == ["Ana Gómez", "Luis Ortega"]
+    assert search.match_rows(title, frames)["Compliance Employee"].tolist() == ["Ana Gómez", "Luis Ortega"]
+    vendor = index.search("sumsub").iloc[0]
+    assert search.match_people(vendor, frames["org"]) == []
+
+
+def test_managers_outside_the_sheet_are_indexed(frames):
+    org = frames["org"].assign(**{"Direct Report": ["María Ruiz", "José Pérez", "José Pérez", "Ana Gómez"]})
+    index = search.build_index({**frames, "org": org})
+    manager = index.search("maria ruiz").iloc[0]
+    assert (manager["Value"], manager["Field"]) == ("María Ruiz", "Direct Report")
+    assert search.match_people(manager, org) == ["María Ruiz"]
+    assert search.match_rows(manager, {"org": org})["Compliance Employee"].tolist() == ["José Pérez"]
@@ -0,0 +1,96 @@
+import os
+
+import pandas as pd
+import pytest
+
+from compliance import data, shared
+from compliance.singleflight import SingleFlight
+
+
+def test_memory_backend_sweeps_keys_nobody_reads(clock):
+    backend = shared.MemoryBackend(clock=clock, sweep_every=60)
+    for i in range(500):
+        backend.set(f"derived:{i}", b"x", ttl=10)
+    backend.set("current:a", b"pointer")
+    clock.now += 61
+    backend.set("other", b"y")
+    assert len(backend) == 2
+
+
+def test_memory_backend_evicts_least_recently_used(clock):
+    backend = shared.MemoryBackend(clock=clock, max_entries=3)
+    for key in "abc":
+        backend.set(key, key.encode())
+    assert backend.get("a") == b"a"
+    backend.set("d", b"d")
+    assert backend.get("b") is None
+    assert [backend.get(key) for key in "acd"] == [b"a", b"c", b"d"]
+
+
+def test_file_backend_removes_expired_and_orphaned_files(tmp_path, clock):
+    backend = shared.FileBackend(tmp_path, clock=clock, sweep_every=60)
+    backend.set("old", b"x", ttl=10)
+    backend.set("keep", b"y")
+    orphan = tmp_path / "abc.123.tmp"
+    orphan.write_bytes(b"partial")
+    os.utime(orphan, (clock.now - 600, clock.now - 600))
+    recent = tmp_path / "def.456.tmp"
+    recent.write_bytes(b"being written")
+    os.utime(recent, (clock.now, clock.now))
+
+    clock.now += 61
+    backend.set("new", b"z")
+    names = {path.name for path in tmp_path.iterdir()}
+    assert backend._path("old").name not in names and orphan.name not in names
+    assert {backend._path("keep").name, backend._path("new").name, recent.name} <= names
+
+
+def test_file_backend_expire(tmp_path, clock):
+    backend = shared.FileBackend(tmp_path, clock=clock)
+    backend.set("key", b"value")
+    backend.expire("key", 5)
+    assert backend.get("key") == b"value"
+    clock.now += 5
+    assert backend.get("key") is None
+    backend.expire("missing", 5)
+
+
+@pytest.mark.parametrize("make_backend", [
+    lambda tmp_path, clock: shared.MemoryBackend(clock=clock),
+    lambda tmp_path, clock: shared.FileBackend(tmp_path, clock=clock),
+], ids=["memory", "file"])
+def test_old_versions_and_derived_do_not_pile_up(tmp_path, clock, make_backend):
+    backend = make_backend(tmp_path, clock)
+    store = shared.SnapshotStore(backend, ttl=600, derived_ttl=3600, clock=clock)
+    # Cada 10 minutos la hoja cambia y cada página calcula sus agregados
+    for i in range(200):
+        clock.now += 601
+        meta = store.refresh("sheet", lambda: pd.DataFrame({"value": [i]}))
+        store.derived("totals", lambda df: df.sum(), store.load("sheet", meta["version"]))
+    live = sum(1 for path in tmp_path.iterdir()) if isinstance(backend, shared.FileBackend) else len(backend)
+    # Puntero + versión vigente + la anterior + los derivados de la última hora (más lo que el barrido aún no vio)
+    assert live <= 12
+    assert store.load("sheet", meta["version"])["value"].tolist() == [199]
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_records(self, sheet_id, sheet_name):
+        self.calls += 1
+        return pd.DataFrame({"Compliance Employee": ["Ana"], "Salary": [self.calls]})
+
+
+def test_evicted_current_version_is_refetched(timed_store, monkeypatch):
+    monkeypatch.setattr(data, "worksheet_flights", SingleFlight())
+    client = CountingClient()
+    data.load_worksheet(client, "Org", "sheet")
+    version = timed_store.current(data.snapshot_key("Org", "sheet"))["version"]
+    # Redis desalojó la copia pero el puntero sigue fresco
+    timed_store.backend.delete(f"snapshot:{data.snapshot_key('Org', 'sheet')}:{version}")
+    with pytest.raises(KeyError):
+        data.load_snapshot("Org", version, "sheet")
+    df = data.load_worksheet(client, "Org", "sheet")
+    assert client.calls == 2 and df["Salary"].tolist() == [2]
+    assert data.last_good_snapshot("Org", "sheet")[0].equals(df)
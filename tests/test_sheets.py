@@ -0,0 +1,164 @@
+import pandas as pd
+import pytest
+
+from compliance import data
+from compliance.sheets import CircuitBreaker, CircuitOpenError, ReadQuota, SheetsClient, SheetsError
+from compliance.singleflight import SingleFlight
+from fake_sheets import FakeSheetsServer, values_from_records
+
+RECORDS = [{"Compliance Employee": "Ana", "Salary": "90,000"}, {"Compliance Employee": "Luis", "Salary": "80000"}]
+
+
+@pytest.fixture(scope="module")
+def fake_sheets():
+    with FakeSheetsServer({"Org": values_from_records(RECORDS)}) as server:
+        yield server
+
+
+@pytest.fixture
+def server(fake_sheets):
+    fake_sheets.reset()
+    return fake_sheets
+
+
+# Las esperas de estas pruebas se miden desde 0
+@pytest.fixture
+def clock(clock):
+    clock.now = 0.0
+    return clock
+
+
+def client_for(server, clock, **kwargs):
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock))
+    kwargs.setdefault("quota", ReadQuota(per_minute=100, clock=clock, sleep=clock.sleep))
+    return SheetsClient(base_url=server.base_url, sleep=clock.sleep, **kwargs)
+
+
+def test_reads_records(server, clock):
+    df = client_for(server, clock).get_records("sheet", "Org")
+    assert df.to_dict("records") == [{"Compliance Employee": "Ana", "Salary": 90000}, {"Compliance Employee": "Luis", "Salary": 80000}]
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retries_with_backoff(server, clock, status):
+    server.fail(3, status)
+    client = client_for(server, clock, backoff=1, max_backoff=8)
+    assert len(client.get_records("sheet", "Org")) == 2
+    assert len(server.requests) == 4
+    # Full jitter: como mucho 1 + 2 + 4 s entre los cuatro intentos
+    assert 0 <= clock.now <= 7
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_honours_retry_after(server, clock):
+    server.fail(1, 429, retry_after=5)
+    client_for(server, clock).get_records("sheet", "Org")
+    assert clock.now == 5
+
+
+def test_gives_up_after_max_retries(server, clock):
+    server.fail(10, 503)
+    client = client_for(server, clock, max_retries=2)
+    with pytest.raises(SheetsError, match="503"):
+        client.get_records("sheet", "Org")
+    assert len(server.requests) == 3
+    assert client.breaker.failures == 1
+
+
+def test_client_errors_are_not_retried(server, clock):
+    with pytest.raises(SheetsError, match="400"):
+        client_for(server, clock).get_records("sheet", "Missing")
+    assert len(server.requests) == 1
+
+
+def test_truncated_body_is_a_failure(server, clock):
+    server.fail(1, 200, body=b'{"range": "Org", "values": [[')
+    client = client_for(server, clock, max_retries=0)
+    with pytest.raises(SheetsError, match="invalid response"):
+        client.get_records("sheet", "Org")
+    assert client.breaker.failures == 1
+    # El siguiente intento completo sí cuenta como éxito
+    assert len(client.get_records("sheet", "Org")) == 2
+    assert client.breaker.failures == 0
+
+
+def test_read_quota_waits_instead_of_429(server, clock):
+    quota = ReadQuota(per_minute=3, clock=clock, sleep=clock.sleep)
+    client = client_for(server, clock, quota=quota)
+    for _ in range(3):
+        client.get_header("sheet", "Org")
+    assert clock.now == 0 and quota.used() == 3
+    client.get_header("sheet", "Org")
+    assert clock.now == 60
+    assert len(server.requests) == 4
+
+
+def test_circuit_breaker_open_half_open_close(server, clock):
+    client = client_for(server, clock, max_retries=0)
+    server.fail(2, 503)
+    for _ in range(2):
+        with pytest.raises(SheetsError):
+            client.get_records("sheet", "Org")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # Abierto: no se llama al servidor
+    with pytest.raises(CircuitOpenError):
+        client.get_records("sheet", "Org")
+    assert len(server.requests) == 2
+
+    # Medio abierto: una sola llamada de prueba; si falla vuelve a abrirse
+    clock.now += 30
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+    server.fail(1, 503)
+    with pytest.raises(SheetsError):
+        client.get_records("sheet", "Org")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # Si la prueba sale bien, se cierra
+    clock.now += 30
+    assert len(client.get_records("sheet", "Org")) == 2
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert len(server.requests) == 4
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow() and not breaker.allow()
+
+
+def test_degraded_mode_serves_last_good_snapshot(server, clock, timed_store, monkeypatch):
+    monkeypatch.setattr(data, "worksheet_flights", SingleFlight())
+    client = client_for(server, clock, max_retries=1)
+    first = data.load_worksheet(client, "Org", "sheet")
+    clock.now += 120
+    server.fail(10, 503)
+    with pytest.raises(SheetsError):
+        data.load_worksheet(client, "Org", "sheet")
+    df, fetched_at = data.last_good_snapshot("Org", "sheet")
+    pd.testing.assert_frame_equal(df, first)
+    assert fetched_at == 0
+
+
+def test_client_errors_do_not_open_the_breaker(server, clock):
+    client = client_for(server, clock)
+    for _ in range(5):
+        with pytest.raises(SheetsError, match="400"):
+            client.get_records("sheet-b", "Missing")
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    # Las demás entidades comparten el cliente y siguen leyendo
+    assert len(client.get_records("sheet-a", "Org")) == 2
+
+
+def test_client_error_on_the_trial_call_closes_the_breaker(server, clock):
+    client = client_for(server, clock, max_retries=0)
+    server.fail(2, 503)
+    for _ in range(2):
+        with pytest.raises(SheetsError, match="503"):
+            client.get_records("sheet", "Org")
+    assert client.breaker.state == CircuitBreaker.OPEN
+    clock.now += 30
+    with pytest.raises(SheetsError, match="400"):
+        client.get_records("sheet", "Missing")
+    assert client.breaker.state == CircuitBreaker.CLOSED
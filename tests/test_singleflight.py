@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from compliance import data
+from compliance.singleflight import SingleFlight
+
+
+# Cliente de Sheets falso: cuenta las descargas y tarda lo suficiente para que se solapen
+class CountingClient:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_records(self, sheet_id, sheet_name):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return pd.DataFrame({"Compliance Employee": ["Ana", "Luis"], "Salary": [1, 2]})
+
+
+@pytest.fixture
+def flights(monkeypatch):
+    monkeypatch.setattr(data, "worksheet_flights", SingleFlight())
+
+
+def concurrent_loads(client, sessions=20):
+    barrier = threading.Barrier(sessions)
+    frames = []
+
+    def session():
+        barrier.wait()
+        frames.append(data.load_worksheet(client, "Org", "sheet"))
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return frames
+
+
+def test_one_api_call_per_expiry(clock, timed_store, flights):
+    client = CountingClient()
+    frames = concurrent_loads(client)
+    assert client.calls == 1
+    assert len(frames) == 20 and all(frame.equals(frames[0]) for frame in frames)
+
+    # Dentro del TTL nadie vuelve a llamar a la API
+    concurrent_loads(client)
+    assert client.calls == 1
+
+    # Al vencer, otra vez una sola llamada para todas las sesiones
+    clock.now += 61
+    concurrent_loads(client)
+    assert client.calls == 2
+
+
+def test_do_shares_result_and_error():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "value"
+
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("k", slow))) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    # Los seguidores se suman a la llamada en curso antes de que termine
+    time.sleep(0.2)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+    assert results == ["value"] * 6 and flights.executions == 1
+    assert not flights.in_flight("k")
+
+    with pytest.raises(ZeroDivisionError):
+        flights.do("k", lambda: 1 / 0)
+    assert flights.do("k", lambda: "again") == "again"
+
+
+def test_do_async_coalesces():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("k", fetch) for _ in range(10)))
+
+    assert asyncio.run(main()) == [1] * 10
+    assert len(calls) == 1
+
+
+def test_cancelled_async_follower_does_not_cancel_the_call():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    results, errors = [], []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "value"
+
+    def run(target):
+        try:
+            results.append(target())
+        except BaseException as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=run, args=(lambda: flights.do("k", slow),))
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=run, args=(lambda: flights.do("k", slow),))
+    waiter.start()
+
+    async def impatient():
+        return await asyncio.wait_for(flights.do_async("k", slow), timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(impatient())
+    release.set()
+    for thread in [leader, waiter]:
+        thread.join()
+    assert errors == [] and results == ["value", "value"]
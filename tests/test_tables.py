@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from compliance import tables
+
+
+def frame(n=60):
+    return pd.DataFrame({"Name": [f"E{i:02d}" for i in range(n)], "Salary": np.arange(n, 0, -1), "Extra": 0})
+
+
+def test_page_of_slices_and_counts():
+    page = tables.page_of(frame(), ["Name", "Salary", "Missing"], page=2, page_size=25)
+    assert list(page["rows"].columns) == ["Name", "Salary"]
+    assert page["rows"]["Name"].tolist() == [f"E{i:02d}" for i in range(25, 50)]
+    assert (page["page"], page["total_pages"], page["total_rows"], page["first_row"], page["last_row"]) == (2, 3, 60, 26, 50)
+
+
+def test_page_of_clamps_page_number():
+    assert tables.page_of(frame(), page=99, page_size=25)["page"] == 3
+    assert tables.page_of(frame(), page=0, page_size=25)["page"] == 1
+    empty = tables.page_of(frame(0))
+    assert (empty["page"], empty["total_pages"], empty["first_row"], empty["last_row"]) == (1, 1, 0, 0)
+
+
+def test_page_of_sorts_whole_frame_before_slicing():
+    page = tables.page_of(frame(), sort_by="Salary", page=1, page_size=5)
+    assert page["rows"]["Salary"].tolist() == [1, 2, 3, 4, 5]
+    page = tables.page_of(frame(), sort_by="Salary", ascending=False, page=2, page_size=5)
+    assert page["rows"]["Salary"].tolist() == [55, 54, 53, 52, 51]
+
+
+def test_sort_order_blanks_last_and_mixed_types():
+    df = pd.DataFrame({"Value": [3.0, None, 1.0, 2.0]})
+    assert tables.page_of(df, sort_by="Value")["rows"]["Value"].tolist()[:3] == [1.0, 2.0, 3.0]
+    assert tables.page_of(df, sort_by="Value", ascending=False)["rows"]["Value"].isna().tolist()[-1]
+    mixed = pd.DataFrame({"Value": ["b", 10, "a", 2]})
+    assert tables.page_of(mixed, sort_by="Value")["rows"]["Value"].tolist() == [10, 2, "a", "b"]